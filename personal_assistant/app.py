@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import logging
@@ -8,9 +9,8 @@ from dotenv import load_dotenv
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from groq import Groq
 
 # Import Google Calendar integration
 from src.agents.calendar.google_calendar import GoogleCalendarManager
@@ -19,6 +19,16 @@ from src.utils.auth import create_oauth_flow, credentials_to_dict
 from src.utils.email_sender import EmailSender
 # Import feedback analyzer
 from src.agents.feedback.feedback_agent import FeedbackAnalyzer
+# Import the shared async LLM client and its transport
+from src.llm.client import groq_client, LLMError
+from src.llm import transport
+from src.utils.sse import stream_chat_events
+from src.utils import metrics
+from src.utils.file_watcher import FileWatcher
+# Import the shared knowledge agent (answer caches, retrieval, profile hot-reload)
+from src.agents.knowledge.agent import KnowledgeAgent as SharedKnowledgeAgent
+from src.agents.intent import CALENDAR, FEEDBACK, intent_router
+from src.config import PROFILE_RELOAD_INTERVAL
 
 # Load environment variables from .env file if present
 load_dotenv()
@@ -36,10 +46,13 @@ class AgentType(str, Enum):
 class ChatMessage(BaseModel):
     content: str
     role: str = "user"
+    # Client-chosen conversation id; messages sharing one get multi-turn context
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     content: str
     agent: AgentType
+    session_id: Optional[str] = None
 
 class FeedbackRequest(BaseModel):
     message: str
@@ -110,95 +123,6 @@ if all(email_config.values()):
 else:
     logger.warning("Email configuration is incomplete. Feedback notifications will not be sent.")
 
-# Monkey-patch the Groq client to handle the proxies parameter properly
-def _patch_groq():
-    import groq
-    from groq._client import Groq as OriginalGroq
-    
-    logger.info("Monkey-patching Groq client to fix initialization issues")
-    
-    # Create a wrapper that strips out problematic parameters
-    class PatchedGroq(OriginalGroq):
-        def __init__(self, **kwargs):
-            # Only pass the api_key parameter
-            if 'api_key' in kwargs:
-                super().__init__(api_key=kwargs['api_key'])
-            else:
-                super().__init__()
-    
-    # Replace the original class
-    groq.Groq = PatchedGroq
-    return True
-
-# Apply the patch
-_patch_groq()
-
-# LLM Client
-class GroqClient:
-    def __init__(self, api_key=None, model=None):
-        self.api_key = api_key or GROQ_API_KEY
-        self.model = model or GROQ_MODEL
-        self.client = None
-        
-        # Only initialize at creation if API key exists
-        if self.api_key:
-            self._initialize_client()
-    
-    def _initialize_client(self):
-        """Initialize the Groq client if API key is available"""
-        try:
-            import groq
-            import sys
-            logger.info(f"Python version: {sys.version}")
-            logger.info(f"Groq package version: {groq.__version__}")
-            logger.info(f"API key available: {bool(self.api_key)}")
-            
-            # CRITICAL: Create client with ONLY the API key
-            if self.api_key:
-                try:
-                    # Directly use api_key parameter only
-                    self.client = groq.Groq(api_key=self.api_key)
-                    logger.info("Groq client initialized successfully")
-                    return True
-                except Exception as e:
-                    logger.error(f"Failed to initialize Groq client: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Error in _initialize_client: {e}")
-            return False
-    
-    async def generate_response(self, messages, system_prompt=None):
-        """Generate a response from the Groq API"""
-        # Ensure client is initialized
-        if not self.client:
-            success = self._initialize_client()
-            if not success:
-                raise HTTPException(status_code=500, detail="GROQ_API_KEY is not configured or invalid")
-        
-        formatted_messages = []
-        
-        # Add system prompt if provided
-        if system_prompt:
-            formatted_messages.append({"role": "system", "content": system_prompt})
-        
-        # Add user messages
-        for message in messages:
-            formatted_messages.append({
-                "role": message.get("role", "user"),
-                "content": message.get("content", "")
-            })
-        
-        # Call Groq API
-        try:
-            completion = self.client.chat.completions.create(
-                messages=formatted_messages,
-                model=self.model,
-            )
-            return completion.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Error calling Groq API: {e}")
-            raise HTTPException(status_code=500, detail=f"API error: {str(e)}")
-
 # Base Agent
 class BaseAgent(ABC):
     """Base class for all agents"""
@@ -212,18 +136,18 @@ class BaseAgent(ABC):
         """Process input data and return a response"""
         pass
     
-    async def generate_llm_response(self, messages, system_prompt=None):
+    async def generate_llm_response(self, messages, system_prompt=None, **kwargs):
         """Generate a response using the LLM"""
-        return await groq_client.generate_response(messages, system_prompt)
+        return await groq_client.generate_response(messages, system_prompt, agent=self.name, **kwargs)
+    
+    def stream_llm_response(self, messages, system_prompt=None):
+        """Stream a response from the LLM as an async iterator of text chunks"""
+        return groq_client.stream_response(messages, system_prompt, agent=self.name)
 
-# Knowledge Agent
-class KnowledgeAgent(BaseAgent):
+# Knowledge Agent: the shared agent, with this app's profile fallbacks and tone
+class KnowledgeAgent(SharedKnowledgeAgent):
     def __init__(self):
-        super().__init__(
-            name="KnowledgeAgent",
-            description="Answers questions about Mohammed Noushir from profile data"
-        )
-        self.profile_data = self._load_profile()
+        super().__init__()
         logger.info(f"KnowledgeAgent initialized with profile data: {self.profile_data.get('name', 'No name found')}")
     
     def _load_profile(self):
@@ -234,9 +158,9 @@ class KnowledgeAgent(BaseAgent):
             logger.info(f"Attempting to load profile from: {profile_path}")
             
             if os.path.exists(profile_path):
-                with open(profile_path, 'r', encoding='utf-8') as file:
-                    logger.info(f"Profile file found at {profile_path}")
-                    return json.load(file)
+                logger.info(f"Profile file found at {profile_path}")
+                self.profile_watcher = FileWatcher(profile_path, PROFILE_RELOAD_INTERVAL)
+                return self.profile_watcher.load()
             
             # If that fails, try to find the file in the current directory
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -244,12 +168,13 @@ class KnowledgeAgent(BaseAgent):
             logger.info(f"Trying alternate profile path: {profile_path}")
             
             if os.path.exists(profile_path):
-                with open(profile_path, 'r', encoding='utf-8') as file:
-                    logger.info(f"Profile file found at {profile_path}")
-                    return json.load(file)
+                logger.info(f"Profile file found at {profile_path}")
+                self.profile_watcher = FileWatcher(profile_path, PROFILE_RELOAD_INTERVAL)
+                return self.profile_watcher.load()
             
             # If both fail, log the issue and return the hardcoded profile
             logger.warning(f"Profile file not found at {profile_path}, using hardcoded data")
+            self.profile_watcher = None
             
             # Fallback to hardcoded profile data if file doesn't exist
             return {
@@ -272,22 +197,15 @@ class KnowledgeAgent(BaseAgent):
             logger.error(f"Error loading profile: {e}")
             return {}
     
-    async def process(self, query):
-        """Process a knowledge query"""
-        # Create system prompt with profile data
-        system_prompt = f"""You are a helpful assistant representing Mohammed Noushir.
+    def _render_system_prompt(self, profile_data):
+        """Create system prompt with profile data"""
+        return f"""You are a helpful assistant representing Mohammed Noushir.
         Keep it short and concise but informative with a touch of humor sometimes. Keep a conversation tone like a real person
         Answer questions based on this profile information only,:
-        {json.dumps(self.profile_data, indent=2)}
+        {json.dumps(profile_data, separators=(",", ":"), ensure_ascii=False)}
         
         If you don't know the answer, say so politely. 
         """
-        
-        # Generate response
-        messages = [{"role": "user", "content": query}]
-        response = await self.generate_llm_response(messages, system_prompt)
-        
-        return response
 
 # Feedback Agent
 class FeedbackAgent(BaseAgent):
@@ -491,8 +409,7 @@ class CalendarAgent(BaseAgent):
             logger.error(f"Error booking appointment: {str(e)}")
             raise Exception(f"Could not book appointment: {str(e)}")
 
-# Initialize agents
-groq_client = GroqClient()
+# Initialize agents (all share the process-wide groq_client)
 knowledge_agent = KnowledgeAgent()
 feedback_agent = FeedbackAgent()
 calendar_agent = CalendarAgent()
@@ -504,6 +421,39 @@ app = FastAPI(
     version="0.1.0"
 )
 
+@app.on_event("startup")
+async def warm_up_llm_transport():
+    """Open provider connections before the server starts accepting requests"""
+    await groq_client.warm_up()
+
+@app.on_event("shutdown")
+async def close_llm_transport():
+    await transport.close()
+
+@app.on_event("startup")
+async def start_answer_pregeneration():
+    """Answer the frequent questions in the background once the server is up"""
+    knowledge_agent.pregenerator.schedule()
+
+@app.on_event("shutdown")
+async def stop_answer_pregeneration():
+    await knowledge_agent.pregenerator.stop()
+
+@app.on_event("startup")
+async def start_feedback_notifications():
+    """Start delivering feedback emails, including any left queued by the last run"""
+    feedback_agent.feedback_analyzer.notifications.start()
+    if feedback_agent.feedback_analyzer.digest is not None:
+        feedback_agent.feedback_analyzer.digest.start()
+
+@app.on_event("shutdown")
+async def stop_feedback_notifications():
+    if feedback_agent.feedback_analyzer.digest is not None:
+        await feedback_agent.feedback_analyzer.digest.stop()
+    await feedback_agent.feedback_analyzer.notifications.stop()
+    # Log out of the pooled SMTP sessions once nothing is sending on them
+    await asyncio.to_thread(feedback_agent.feedback_analyzer.email_sender.close)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -513,17 +463,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Knowledge Agent routes
+async def _answer_once(answer):
+    """Stream an agent's complete answer as a single chunk"""
+    yield await answer
+
+async def _feedback_reply(content):
+    _, response_message = await feedback_agent.process(feedback_message=content)
+    return response_message
+
+# Chat routes
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(message: ChatMessage):
-    """Process chat messages and route to knowledge agent"""
+    """Process chat messages and route them to the knowledge, calendar or feedback agent"""
     try:
         logger.info(f"Received chat message: {message.content}")
         
+        # Pick the agent locally; the LLM is only asked when the message is ambiguous
+        intent = await intent_router.route(message.content, knowledge_agent.can_answer_locally)
+        logger.info(f"Routing chat message to {intent} agent")
+        
         # Try to generate a response
-        response = await knowledge_agent.process(message.content)
+        if intent == CALENDAR:
+            response = await calendar_agent.process(message.content)
+        elif intent == FEEDBACK:
+            response = await _feedback_reply(message.content)
+        else:
+            response = await knowledge_agent.process(message.content, message.session_id)
         logger.info(f"Generated response")
-        return ChatResponse(content=response, agent=AgentType.KNOWLEDGE)
+        return ChatResponse(content=response, agent=AgentType(intent), session_id=message.session_id)
     except ValueError as e:
         # Special handling for configuration errors
         logger.error(f"Configuration error: {str(e)}")
@@ -538,6 +505,13 @@ async def chat(message: ChatMessage):
             status_code=e.status_code,
             content={"content": f"API error: {str(e.detail)}", "agent": AgentType.KNOWLEDGE}
         )
+    except LLMError as e:
+        # Upstream LLM failures keep their status codes
+        logger.error(f"LLM error: {str(e)}")
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"content": str(e), "agent": AgentType.KNOWLEDGE}
+        )
     except Exception as e:
         logger.error(f"Error processing chat request: {str(e)}")
         return JSONResponse(
@@ -545,6 +519,23 @@ async def chat(message: ChatMessage):
             content={"content": f"Sorry, I encountered an error: {str(e)}", "agent": AgentType.KNOWLEDGE}
         )
 
+@app.post("/api/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """Stream the routed agent's answer as Server-Sent Events"""
+    logger.info(f"Received streaming chat message: {message.content}")
+    intent = await intent_router.route(message.content, knowledge_agent.can_answer_locally)
+    if intent == CALENDAR:
+        tokens = _answer_once(calendar_agent.process(message.content))
+    elif intent == FEEDBACK:
+        tokens = _answer_once(_feedback_reply(message.content))
+    else:
+        tokens = knowledge_agent.process_stream(message.content, message.session_id)
+    return StreamingResponse(
+        stream_chat_events(tokens, AgentType(intent)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Feedback Agent routes
 @app.post("/api/feedback", response_model=FeedbackResponse)
 async def submit_feedback(request: FeedbackRequest):
@@ -668,6 +659,11 @@ async def oauth_callback(code: str, state: str = None):
             content={"success": False, "message": f"Authentication failed: {str(e)}"}
         )
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for caches and LLM calls"""
+    return metrics.snapshot()
+
 @app.get("/")
 async def root():
     """Root endpoint with basic system information"""
@@ -681,12 +677,15 @@ async def root():
         "status": "running",
         "api_key_status": api_key_status,
         "model": GROQ_MODEL,
+        "llm_providers": [p.name for p in groq_client.providers.providers],
         "env_vars": list(os.environ.keys()),  # Show available environment variables (names only for security)
         "endpoints": [
-            {"path": "/api/chat", "method": "POST", "description": "Chat with the knowledge agent"},
+            {"path": "/api/chat", "method": "POST", "description": "Chat with the knowledge, calendar or feedback agent, chosen per message"},
+            {"path": "/api/chat/stream", "method": "POST", "description": "Stream a chat answer as Server-Sent Events"},
             {"path": "/api/feedback", "method": "POST", "description": "Submit feedback"},
             {"path": "/api/calendar/availability", "method": "GET", "description": "Get calendar availability"},
             {"path": "/api/calendar/book", "method": "POST", "description": "Book a calendar slot"},
+            {"path": "/api/metrics", "method": "GET", "description": "Runtime metrics for caches and LLM calls"},
             {"path": "/", "method": "GET", "description": "This information"}
         ]
     }
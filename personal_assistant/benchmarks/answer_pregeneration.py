@@ -0,0 +1,80 @@
+"""
+First-visitor latency for frequent questions, with and without pre-generation.
+
+Plays each configured frequent question once, as a first visitor would,
+through KnowledgeAgent with a stubbed LLM that takes --llm-ms per call:
+  - cold:        empty caches, every non-fast-path question waits for the LLM
+  - pregenerated: AnswerPregenerator ran first (unpaced), so answers are ready
+
+Also reports the pre-generation coverage and how long the paced background
+run would take at the configured rate.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.answer_pregeneration [--llm-ms 800]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from src.agents.knowledge.agent import KnowledgeAgent
+from src.config import ANSWER_PREGEN_RATE_PER_MINUTE
+
+def _stub_llm(delay):
+    async def fake_llm(messages, system_prompt=None, **kwargs):
+        await asyncio.sleep(delay)
+        return f"Answer to: {messages[-1]['content']}"
+    return fake_llm
+
+async def _first_visits(agent, questions):
+    latencies = []
+    for question in questions:
+        start = time.perf_counter()
+        await agent.process(question)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+async def _run(delay):
+    cold = KnowledgeAgent()
+    cold.generate_llm_response = _stub_llm(delay)
+    questions = cold.pregenerator.questions()
+    cold_ms = await _first_visits(cold, questions)
+
+    warm = KnowledgeAgent()
+    warm.generate_llm_response = _stub_llm(delay)
+    # Unpaced, so the benchmark does not wait out the rate limit
+    warm.pregenerator.rate_per_minute = float("inf")
+    start = time.perf_counter()
+    warm.pregenerator.schedule()
+    await warm.pregenerator._task
+    pregen_seconds = time.perf_counter() - start
+    stats = warm.pregenerator.stats()
+    warm_ms = await _first_visits(warm, questions)
+    return questions, cold_ms, warm_ms, stats, pregen_seconds
+
+def _summary(latencies):
+    ordered = sorted(latencies)
+    return ordered[len(ordered) // 2], ordered[int(len(ordered) * 0.95)], sum(ordered) / len(ordered)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-ms", type=float, default=800, help="Simulated LLM latency per call")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    questions, cold_ms, warm_ms, stats, pregen_seconds = asyncio.run(_run(args.llm_ms / 1000))
+    if not questions:
+        raise SystemExit("No frequent questions configured; check ANSWER_PREGEN_QUESTIONS_PATH")
+
+    print(f"{len(questions)} frequent questions: {stats['by_fast_path']} fast path, "
+          f"{stats['pregenerated']} pre-generated, coverage {stats['coverage']:.0%}")
+    print(f"{'':>14}{'p50 (ms)':>10}{'p95 (ms)':>10}{'mean (ms)':>11}")
+    for name, latencies in (("cold", cold_ms), ("pregenerated", warm_ms)):
+        p50, p95, mean = _summary(latencies)
+        print(f"{name:>14}{p50:>10.2f}{p95:>10.2f}{mean:>11.2f}")
+    paced = stats["pregenerated"] * 60 / ANSWER_PREGEN_RATE_PER_MINUTE if ANSWER_PREGEN_RATE_PER_MINUTE > 0 else 0
+    print(f"pre-generation took {pregen_seconds:.1f}s unpaced, ~{paced:.0f}s at "
+          f"{ANSWER_PREGEN_RATE_PER_MINUTE:g} calls/min")
+
+if __name__ == "__main__":
+    main()
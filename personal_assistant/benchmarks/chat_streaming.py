@@ -0,0 +1,112 @@
+"""
+Time-to-first-token benchmark for the streaming chat endpoint.
+
+Replaces the Groq SDK with a stub that emits tokens at a fixed rate after an
+initial delay, serves main.app with uvicorn on a local port, and compares
+when the visitor first sees text:
+  - json:   POST /api/chat returns once the full answer is generated
+  - stream: POST /api/chat/stream emits the first SSE token event
+
+Run from the personal_assistant directory:
+    python -m benchmarks.chat_streaming [--tokens 120] [--token-interval 0.01]
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import uvicorn
+
+from main import app
+from src.agents.knowledge.service import knowledge_agent
+from src.llm.client import groq_client
+
+class _StubStream:
+    def __init__(self, tokens, first_token_delay, token_interval):
+        self.tokens = tokens
+        self.first_token_delay = first_token_delay
+        self.token_interval = token_interval
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.first_token_delay)
+        for i in range(self.tokens):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            delta = SimpleNamespace(content=f"tok{i} ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+class _StubCompletions:
+    def __init__(self, tokens, first_token_delay, token_interval):
+        self.args = (tokens, first_token_delay, token_interval)
+
+    async def create(self, messages, model, stream=False):
+        stub = _StubStream(*self.args)
+        if stream:
+            return stub
+        parts = [chunk.choices[0].delta.content async for chunk in stub]
+        message = SimpleNamespace(content="".join(parts))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+async def _measure(client, path):
+    """Return (time to first byte of content, total time) for one request"""
+    payload = {"content": "Tell me about his research"}
+    # Measure the LLM path, not a repeat answered from the caches
+    knowledge_agent.answer_cache.clear()
+    knowledge_agent.semantic_cache.clear()
+    start = time.perf_counter()
+    first = None
+    async with client.stream("POST", path, json=payload) as response:
+        async for line in response.aiter_lines():
+            if first is None and (line.startswith("event: token") or line.startswith("{")):
+                first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+def _start_server():
+    """Serve the app on a free local port in a background thread"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+async def _run(base_url, runs):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        results = {}
+        for name, path in (("json", "/api/chat"), ("stream", "/api/chat/stream")):
+            samples = [await _measure(client, path) for _ in range(runs)]
+            results[name] = (
+                statistics.median(s[0] for s in samples),
+                statistics.median(s[1] for s in samples),
+            )
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=120, help="Tokens per stub answer")
+    parser.add_argument("--first-token-delay", type=float, default=0.15, help="Stub delay before the first token")
+    parser.add_argument("--token-interval", type=float, default=0.01, help="Stub delay between tokens")
+    parser.add_argument("--runs", type=int, default=5, help="Requests per endpoint")
+    args = parser.parse_args()
+
+    groq_client.client = SimpleNamespace(chat=SimpleNamespace(
+        completions=_StubCompletions(args.tokens, args.first_token_delay, args.token_interval)
+    ))
+
+    server, base_url = _start_server()
+    try:
+        results = asyncio.run(_run(base_url, args.runs))
+    finally:
+        server.should_exit = True
+    print(f"{'endpoint':<10}{'first token (ms)':>18}{'complete (ms)':>16}")
+    for name, (first, total) in results.items():
+        print(f"{name:<10}{first * 1000:>18.1f}{total * 1000:>16.1f}")
+
+if __name__ == "__main__":
+    main()
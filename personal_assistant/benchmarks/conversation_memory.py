@@ -0,0 +1,82 @@
+"""
+Prompt size per turn in a long multi-turn chat session.
+
+Plays a scripted conversation of follow-up questions through KnowledgeAgent
+with a stubbed LLM, and reports the estimated prompt tokens (system prompt
+plus history) sent at each turn for:
+  - naive:     every earlier turn sent verbatim
+  - compacted: ConversationStore with compaction (the default settings)
+
+Run from the personal_assistant directory:
+    python -m benchmarks.conversation_memory [--turns 40]
+"""
+import argparse
+import asyncio
+import logging
+
+from src.agents.knowledge.conversation import ConversationStore
+from src.agents.knowledge.agent import KnowledgeAgent
+from src.llm.tokens import estimate_message_tokens, estimate_tokens
+
+QUESTIONS = [
+    "Tell me about his time at Scintilink",
+    "What else did he do there?",
+    "And what about his research?",
+    "Which conference was that presented at?",
+    "What tools did he use for it?",
+]
+
+ANSWER = (
+    "He led AI research there, building modular agentic frameworks and multimodal pipelines. "
+    "The work focused on helping researchers link insights across academic fields, with an "
+    "emphasis on explainability and safe system behaviour. It also involved mentoring a small team."
+)
+
+async def _play(agent, turns):
+    sizes = []
+
+    async def fake_llm(messages, system_prompt=None, **kwargs):
+        if kwargs.get("priority") == "background":
+            # Compaction summary request
+            return "The visitor asked about his startup work, research and tools; answers covered each."
+        sizes.append(estimate_tokens(system_prompt or "") + estimate_message_tokens(messages))
+        return ANSWER
+
+    agent.generate_llm_response = fake_llm
+    for turn in range(turns):
+        # Measure the LLM path, not a repeat answered from the caches
+        agent.answer_cache.clear()
+        agent.semantic_cache.clear()
+        await agent.process(QUESTIONS[turn % len(QUESTIONS)], session_id="benchmark")
+        # Let background compaction finish, as it would between a visitor's messages
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    return sizes
+
+async def _run(turns):
+    results = {}
+    for name, store in (
+        ("naive", ConversationStore(max_turns=10 ** 6, compact_threshold=10 ** 9)),
+        ("compacted", None),
+    ):
+        agent = KnowledgeAgent()
+        agent.fast_path_enabled = False
+        if store is not None:
+            agent.conversations = store
+        results[name] = await _play(agent, turns)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40, help="Questions in the session")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = asyncio.run(_run(args.turns))
+    print(f"{'turn':>6}{'naive':>10}{'compacted':>12}")
+    for turn in range(0, args.turns, max(args.turns // 10, 1)):
+        print(f"{turn + 1:>6}{results['naive'][turn]:>10}{results['compacted'][turn]:>12}")
+    print(f"{'max':>6}{max(results['naive']):>10}{max(results['compacted']):>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+CV ingestion and index loading benchmark.
+
+Builds the CV retrieval index from synthetic CV documents of increasing size
+(the bundled CV text repeated with numbered variations), then measures:
+  - full:        indexing every chunk from scratch
+  - incremental: rebuilding after one document changed (unchanged chunks reused)
+  - open:        mapping the index at startup, versus json.load of the same data
+  - search:      one top-3 query
+
+Run from the personal_assistant directory (PDF sources need `pip install pypdf`):
+    python -m benchmarks.cv_index [--copies 1 10 100]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from src.agents.knowledge.cv_index import CVIndex, build_index, expand_sources, extract_text
+from src.config import CV_SOURCES
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100], help="Synthetic CV documents")
+    args = parser.parse_args()
+
+    text = "\n".join(extract_text(path) for path in expand_sources(CV_SOURCES))
+    if not text.strip():
+        raise SystemExit("No CV text found; check CV_SOURCES")
+
+    print(f"{'docs':>6}{'chunks':>8}{'full (ms)':>11}{'incr (ms)':>11}{'reindexed':>11}"
+          f"{'open (ms)':>11}{'json (ms)':>11}{'search (ms)':>13}")
+    for copies in args.copies:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(copies):
+                with open(os.path.join(directory, f"cv_{i:04d}.txt"), "w", encoding="utf-8") as file:
+                    file.write(text.replace("Experience", f"Experience {i}"))
+            index_path = os.path.join(directory, "cv_index.bin")
+            report, full_ms = _timed(build_index, [directory], index_path)
+
+            with open(os.path.join(directory, "cv_0000.txt"), "a", encoding="utf-8") as file:
+                file.write("\nPublications\n• A newly added paper on retrieval latency.\n")
+            incremental, incremental_ms = _timed(build_index, [directory], index_path)
+
+            index, open_ms = _timed(CVIndex, index_path)
+            # The same chunks and term frequencies as a JSON document, for comparison
+            json_path = os.path.join(directory, "cv_index.json")
+            with open(json_path, "w", encoding="utf-8") as file:
+                json.dump([[index.text(i), index.forward_terms(i)] for i in range(len(index))], file)
+            _, json_ms = _timed(lambda: json.load(open(json_path, encoding="utf-8")))
+            _, search_ms = _timed(index.search, "What did he do at Perplexity?", 3)
+
+        print(f"{copies:>6}{report['chunks']:>8}{full_ms:>11.1f}{incremental_ms:>11.1f}"
+              f"{incremental['indexed']:>11}{open_ms:>11.2f}{json_ms:>11.2f}{search_ms:>13.2f}")
+
+if __name__ == "__main__":
+    main()
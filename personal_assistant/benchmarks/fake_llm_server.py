@@ -0,0 +1,297 @@
+"""
+Local stand-in for the Groq/OpenAI chat completions API.
+
+Serves POST /openai/v1/chat/completions (the path the Groq SDK calls) and
+POST /v1/chat/completions (plain OpenAI-compatible clients), streaming or
+not, with configurable behaviour:
+  - latency:      time to first token drawn from a fixed, uniform,
+                  exponential or lognormal distribution
+  - token rate:   tokens per second once the answer starts
+  - errors:       fraction of requests failing with 500/502/503
+  - rate limits:  requests and tokens per minute, answered with 429 and
+                  Retry-After / x-ratelimit-* headers like the real API
+
+Point the app at it with GROQ_BASE_URL (any API key is accepted):
+    python -m benchmarks.fake_llm_server --port 8300 --latency-ms 400 --error-rate 0.02
+    GROQ_BASE_URL=http://127.0.0.1:8300 GROQ_API_KEY=fake uvicorn main:app
+
+GET /_fake/stats returns request, error and rate-limit counters.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.llm.tokens import estimate_message_tokens
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+_FILLER = (
+    "This is a simulated answer from the local fake LLM server, generated so "
+    "throughput and latency can be measured without calling the real provider."
+).split()
+
+# Returned when the caller asks for JSON, e.g. feedback analysis
+_JSON_ANSWER = '{"sentiment": "positive", "priority": 3, "category": "other"}'
+
+class FakeLLMBehavior:
+    """Latency, streaming, error and rate-limit settings for the fake server"""
+
+    def __init__(
+        self,
+        latency="lognormal",
+        latency_ms=300.0,
+        latency_sigma=0.5,
+        tokens_per_second=200.0,
+        answer_tokens=60,
+        error_rate=0.0,
+        rate_limit_rpm=0,
+        rate_limit_tpm=0,
+        seed=None,
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rpm = rate_limit_rpm
+        self.rate_limit_tpm = rate_limit_tpm
+        self.rng = random.Random(seed)
+
+    def first_token_delay(self):
+        """Sample the delay before the first token, in seconds"""
+        mean = self.latency_ms / 1000
+        if self.latency == "fixed":
+            return mean
+        if self.latency == "uniform":
+            return self.rng.uniform(0, 2 * mean)
+        if self.latency == "exponential":
+            return self.rng.expovariate(1 / mean) if mean > 0 else 0.0
+        # lognormal: latency_ms is the median, sigma sets the tail
+        return self.rng.lognormvariate(0, self.latency_sigma) * mean
+
+    def token_interval(self):
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+class _RateLimiter:
+    """Sliding one-minute window of requests and tokens"""
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._events = deque()
+        self._tokens = 0
+
+    def _expire(self, now):
+        while self._events and now - self._events[0][0] >= 60:
+            _, tokens = self._events.popleft()
+            self._tokens -= tokens
+
+    def acquire(self, tokens):
+        """Record a request, or return seconds until it would be allowed"""
+        now = time.monotonic()
+        self._expire(now)
+        over_requests = self.rpm and len(self._events) >= self.rpm
+        over_tokens = self.tpm and self._tokens + tokens > self.tpm
+        if over_requests or over_tokens:
+            return max(60 - (now - self._events[0][0]), 0.001) if self._events else 1.0
+        self._events.append((now, tokens))
+        self._tokens += tokens
+        return 0.0
+
+    def headers(self, retry_after=0.0):
+        """Rate-limit headers in the provider's format"""
+        now = time.monotonic()
+        self._expire(now)
+        reset = f"{max(60 - (now - self._events[0][0]), 0):.2f}s" if self._events else "0s"
+        headers = {}
+        if self.rpm:
+            headers["x-ratelimit-limit-requests"] = str(self.rpm)
+            headers["x-ratelimit-remaining-requests"] = str(max(self.rpm - len(self._events), 0))
+            headers["x-ratelimit-reset-requests"] = reset
+        if self.tpm:
+            headers["x-ratelimit-limit-tokens"] = str(self.tpm)
+            headers["x-ratelimit-remaining-tokens"] = str(max(self.tpm - self._tokens, 0))
+            headers["x-ratelimit-reset-tokens"] = reset
+        if retry_after:
+            headers["retry-after"] = f"{retry_after:.3f}"
+        return headers
+
+def _answer_words(messages, count):
+    """Build the simulated answer as a list of token strings"""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if "JSON array" in system:
+        # Batched classification: one object per item in the user's JSON list
+        try:
+            items = json.loads(messages[-1].get("content", "[]"))
+        except ValueError:
+            items = []
+        analysis = json.loads(_JSON_ANSWER)
+        return [json.dumps([dict(analysis, id=item.get("id", i)) for i, item in enumerate(items)])]
+    if "as JSON" in system:
+        return [_JSON_ANSWER]
+    return [_FILLER[i % len(_FILLER)] + " " for i in range(count)]
+
+def _error_body(message, error_type):
+    return {"error": {"message": message, "type": error_type}}
+
+def create_app(behavior=None):
+    """Build the fake provider as a FastAPI app"""
+    behavior = behavior or FakeLLMBehavior()
+    limiter = _RateLimiter(behavior.rate_limit_rpm, behavior.rate_limit_tpm)
+    counters = {"requests": 0, "completed": 0, "streamed": 0, "errors": 0, "rate_limited": 0, "in_flight": 0}
+    app = FastAPI(title="Fake LLM Server")
+
+    @app.get("/openai/v1/models")
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "fake-model", "object": "model"}]}
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return counters
+
+    @app.post("/openai/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        model = body.get("model", "fake-model")
+        counters["requests"] += 1
+
+        prompt_tokens = estimate_message_tokens(messages)
+        words = _answer_words(messages, behavior.answer_tokens)
+        wait = limiter.acquire(prompt_tokens + len(words))
+        if wait:
+            counters["rate_limited"] += 1
+            return JSONResponse(
+                _error_body("Rate limit reached, please retry later", "rate_limit_exceeded"),
+                status_code=429,
+                headers=limiter.headers(retry_after=wait),
+            )
+        if behavior.rng.random() < behavior.error_rate:
+            counters["errors"] += 1
+            await asyncio.sleep(behavior.first_token_delay() / 2)
+            return JSONResponse(
+                _error_body("Simulated upstream failure", "server_error"),
+                status_code=behavior.rng.choice((500, 502, 503)),
+            )
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(words),
+            "total_tokens": prompt_tokens + len(words),
+        }
+        headers = limiter.headers()
+
+        if body.get("stream"):
+            async def events():
+                counters["in_flight"] += 1
+                try:
+                    await asyncio.sleep(behavior.first_token_delay())
+                    for i, word in enumerate(words):
+                        if i:
+                            await asyncio.sleep(behavior.token_interval())
+                        delta = {"role": "assistant", "content": word} if i == 0 else {"content": word}
+                        chunk = {
+                            "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                        }
+                        yield f"data: {json.dumps(chunk)}\n\n"
+                    final = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                        "x_groq": {"usage": usage},
+                    }
+                    yield f"data: {json.dumps(final)}\n\n"
+                    yield "data: [DONE]\n\n"
+                    counters["streamed"] += 1
+                finally:
+                    counters["in_flight"] -= 1
+
+            return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+        counters["in_flight"] += 1
+        try:
+            await asyncio.sleep(behavior.first_token_delay() + behavior.token_interval() * (len(words) - 1))
+        finally:
+            counters["in_flight"] -= 1
+        counters["completed"] += 1
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(words).strip()},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": usage,
+        }, headers=headers)
+
+    return app
+
+def serve_in_thread(app, host="127.0.0.1", port=0):
+    """Serve an app on a local port in a background thread
+
+    Returns:
+        Tuple of (uvicorn server, base URL); set `server.should_exit` to stop it
+    """
+    if not port:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://{host}:{port}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8300)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal",
+                        help="Distribution of the delay before the first token")
+    parser.add_argument("--latency-ms", type=float, default=300.0,
+                        help="Mean delay (median for lognormal) before the first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape; larger means a longer tail")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Streaming rate after the first token")
+    parser.add_argument("--answer-tokens", type=int, default=60, help="Tokens per generated answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 5xx")
+    parser.add_argument("--rate-limit-rpm", type=int, default=0, help="Requests per minute before 429 (0 disables)")
+    parser.add_argument("--rate-limit-tpm", type=int, default=0, help="Tokens per minute before 429 (0 disables)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latency and errors")
+    args = parser.parse_args()
+
+    behavior = FakeLLMBehavior(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        answer_tokens=args.answer_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rpm=args.rate_limit_rpm,
+        rate_limit_tpm=args.rate_limit_tpm,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(behavior), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Fast-path answer engine benchmark.
+
+Runs a mix of typical visitor questions through FastPathResponder and
+reports which ones it answers without the LLM, the share of traffic it
+takes, and the time per answer. Questions it does not answer would fall
+through to KnowledgeAgent's LLM path.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.fast_path [--repeat 10000]
+"""
+import argparse
+import statistics
+import time
+
+from src.agents.knowledge.fast_path import FastPathResponder
+from src.agents.knowledge.agent import KnowledgeAgent
+
+QUESTIONS = [
+    "What's his email?",
+    "How can I contact him?",
+    "What is his LinkedIn?",
+    "Can I get his phone number?",
+    "What are his skills?",
+    "Which programming languages does he know?",
+    "Does he know PyTorch?",
+    "Is he familiar with Docker and Kubernetes?",
+    "Where did he study?",
+    "What degree does he have?",
+    "What roles has he held?",
+    "Tell me about his research",
+    "Which companies has he worked at?",
+    "Why did he start Scintilink?",
+    "What did he study at Queen Mary?",
+    "Does he know Rust?",
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10000, help="Timed matches per question")
+    args = parser.parse_args()
+
+    responder = FastPathResponder(KnowledgeAgent().profile_data)
+    print(f"{'question':<46}{'intent':<11}{'time (us)':>10}")
+    answered = []
+    for question in QUESTIONS:
+        matched = responder.match(question)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            responder.match(question)
+        elapsed = (time.perf_counter() - start) / args.repeat * 1e6
+        intent = matched[0] if matched else "-> LLM"
+        if matched:
+            answered.append(elapsed)
+        print(f"{question:<46}{intent:<11}{elapsed:>10.1f}")
+
+    print(f"\nAnswered locally: {len(answered)}/{len(QUESTIONS)} ({len(answered) / len(QUESTIONS):.0%}), "
+          f"median {statistics.median(answered):.1f} us per answer")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Feedback classification micro-batching benchmark.
+
+Sends bursts of feedback messages through FeedbackBatcher against the local
+fake LLM server and compares:
+  - unbatched: one LLM call per message (the previous behaviour)
+  - batched:   messages in the same window share one LLM call
+
+Reports upstream calls and per-item latency for each mode.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.feedback_batching [--burst 100] [--window-ms 200] [--max-items 16]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.fake_llm_server import FakeLLMBehavior, create_app, serve_in_thread
+from src.agents.feedback.batcher import FeedbackBatcher
+from src.llm.client import GroqClient
+
+async def _burst(batcher, burst, spread):
+    """Submit `burst` messages spread over `spread` seconds; return per-item latencies"""
+    async def submit(i):
+        await asyncio.sleep(spread * i / burst)
+        start = time.perf_counter()
+        await batcher.classify(f"Feedback #{i}: the site looks great but the calendar page is slow")
+        return time.perf_counter() - start
+
+    return await asyncio.gather(*(submit(i) for i in range(burst)))
+
+async def _run(base_url, args):
+    """Run both modes in one event loop, which owns the shared HTTP pool"""
+    results = {}
+    for name, window in (("unbatched", 0), ("batched", args.window_ms / 1000)):
+        # A fresh client per mode keeps the coalescing and latency stats separate
+        client = GroqClient(api_key="fake", base_url=base_url)
+        batcher = FeedbackBatcher(client, window_seconds=window, max_items=args.max_items)
+        latencies = sorted(await _burst(batcher, args.burst, args.spread))
+        results[name] = (batcher.upstream_calls, latencies)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--burst", type=int, default=100, help="Feedback messages per burst")
+    parser.add_argument("--spread", type=float, default=1.0, help="Seconds over which the burst arrives")
+    parser.add_argument("--window-ms", type=float, default=200.0, help="Batching window")
+    parser.add_argument("--max-items", type=int, default=16, help="Maximum messages per batch")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake provider median latency")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    server, base_url = serve_in_thread(create_app(FakeLLMBehavior(latency_ms=args.latency_ms, seed=7)))
+    try:
+        results = asyncio.run(_run(base_url, args))
+    finally:
+        server.should_exit = True
+
+    print(f"{'mode':<11}{'llm calls':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}")
+    for name, (calls, latencies) in results.items():
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        print(f"{name:<11}{calls:>10}{statistics.median(latencies) * 1000:>10.0f}"
+              f"{p95 * 1000:>10.0f}{latencies[-1] * 1000:>10.0f}")
+
+if __name__ == "__main__":
+    main()
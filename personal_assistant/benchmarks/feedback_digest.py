@@ -0,0 +1,116 @@
+"""
+Notification emails for a feedback burst, one email per item versus digest mode.
+
+Submits --burst feedback items with a typical mix of sentiment and priority
+through the durable notification queue. Deliveries are limited to
+--per-second emails, standing in for a mail provider's send limit.
+  - per item: every item is queued as its own email (the previous behaviour)
+  - digest:   negative and priority 4-5 items are queued as they arrive; the
+              rest go through FeedbackDigest (--digest-items per email, or
+              after --interval seconds)
+
+For each mode it reports emails sent, the time until every item was
+delivered, and how long urgent items waited (p50/max).
+
+Run from the personal_assistant directory:
+    python -m benchmarks.feedback_digest [--burst 300] [--per-second 50] [--digest-items 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from src.agents.feedback.digest import FeedbackDigest, is_urgent
+from src.utils.durable_queue import DurableQueue
+
+SENTIMENTS = (["positive"] * 45) + (["neutral"] * 35) + (["negative"] * 20)
+PRIORITIES = [1] * 25 + [2] * 35 + [3] * 25 + [4] * 10 + [5] * 5
+CATEGORIES = ["bug", "feature request", "complaint", "praise", "question", "other"]
+
+class RateLimitedMailer:
+    """Counts emails and spaces them at most `per_second` apart"""
+
+    def __init__(self, per_second):
+        self.spacing = 1 / per_second
+        self.emails = 0
+        self.items = 0
+        self.urgent_waits = []
+        self.last_delivery = 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def deliver(self, payload):
+        async with self._lock:
+            now = time.perf_counter()
+            if now < self._next_slot:
+                await asyncio.sleep(self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.spacing
+        delivered = time.perf_counter()
+        items = payload["digest"] if "digest" in payload else [payload]
+        self.emails += 1
+        self.items += len(items)
+        self.urgent_waits.extend(delivered - item["submitted"] for item in items if item["urgent"])
+        self.last_delivery = delivered
+        return True
+
+def _feedback(count, seed=5):
+    rng = random.Random(seed)
+    items = []
+    for number in range(count):
+        item = {
+            "sentiment": rng.choice(SENTIMENTS),
+            "priority": rng.choice(PRIORITIES),
+            "category": rng.choice(CATEGORIES),
+            "message": f"Feedback number {number}",
+        }
+        item["urgent"] = is_urgent(item)
+        items.append(item)
+    return items
+
+async def _run(mode, items, args, path):
+    mailer = RateLimitedMailer(args.per_second)
+    queue = DurableQueue(path, mailer.deliver, workers=2, max_size=len(items) + 1)
+    digest = FeedbackDigest(path, queue.put, interval=args.interval, max_items=args.digest_items)
+    queue.start()
+    start = time.perf_counter()
+    for item in items:
+        item = dict(item, submitted=time.perf_counter())
+        if mode == "digest" and not item["urgent"]:
+            await digest.add(item)
+        else:
+            await queue.put(item)
+    while mailer.items < len(items):
+        await asyncio.sleep(0.01)
+    drained = mailer.last_delivery - start
+    await digest.stop()
+    await queue.stop()
+    return mailer, drained
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=300, help="Feedback items submitted at once")
+    parser.add_argument("--per-second", type=float, default=50, help="Emails the provider accepts per second")
+    parser.add_argument("--digest-items", type=int, default=20, help="Items per digest email")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds before a partial digest is sent")
+    args = parser.parse_args()
+
+    items = _feedback(args.burst)
+    urgent = sum(item["urgent"] for item in items)
+    print(f"{args.burst} feedback items ({urgent} urgent), {args.per_second:g} emails/s allowed")
+    print(f"{'':>10}{'emails':>8}{'drained (s)':>13}{'urgent p50 (s)':>16}{'urgent max (s)':>16}")
+    for mode in ("per item", "digest"):
+        with tempfile.TemporaryDirectory() as directory:
+            mailer, drained = asyncio.run(_run(mode, items, args, os.path.join(directory, "queue.db")))
+        print(
+            f"{mode:>10}{mailer.emails:>8}{drained:>13.2f}"
+            f"{_percentile(mailer.urgent_waits, 0.5):>16.2f}{max(mailer.urgent_waits, default=0.0):>16.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Feedback notification delivery under a burst, fire-and-forget versus the durable queue.
+
+Submits a burst of feedback notifications whose delivery (a stand-in for an
+SMTP send) takes --send-ms, then "restarts" the process while sends are
+in flight. For each approach it reports:
+  - intake:    time to hand one notification off (p50/p99)
+  - peak:      the most deliveries running at once
+  - lost:      notifications never delivered because of the restart
+  - drained:   time for the restarted process to deliver what survived
+
+  - create_task: the previous `asyncio.create_task(send(...))` per feedback
+  - queue:       DurableQueue (SQLite WAL) with --workers workers
+
+Run from the personal_assistant directory:
+    python -m benchmarks.feedback_queue [--burst 500] [--send-ms 50] [--workers 4]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from src.utils.durable_queue import DurableQueue
+
+class Sink:
+    """Counts deliveries and how many run concurrently"""
+
+    def __init__(self, send_seconds):
+        self.send_seconds = send_seconds
+        self.delivered = set()
+        self.running = 0
+        self.peak = 0
+
+    async def send(self, payload):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.send_seconds)
+            self.delivered.add(payload["id"])
+            return True
+        finally:
+            self.running -= 1
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+async def _fire_and_forget(burst, sink, restart_after):
+    intake = []
+    tasks = []
+    for i in range(burst):
+        start = time.perf_counter()
+        tasks.append(asyncio.create_task(sink.send({"id": i})))
+        intake.append(time.perf_counter() - start)
+    await asyncio.sleep(restart_after)
+    # The process exits: every task still running is gone, nothing is left to redeliver
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return intake, 0.0
+
+async def _durable(burst, sink, restart_after, path, workers):
+    intake = []
+    queue = DurableQueue(path, sink.send, workers=workers, max_size=burst)
+    for i in range(burst):
+        start = time.perf_counter()
+        await queue.put({"id": i})
+        intake.append(time.perf_counter() - start)
+    await asyncio.sleep(restart_after)
+    # Simulate a crash: workers die without releasing their leases
+    for task in queue._tasks:
+        task.cancel()
+    await asyncio.gather(*queue._tasks, return_exceptions=True)
+    queue._db.close()
+
+    start = time.perf_counter()
+    restarted = DurableQueue(path, sink.send, workers=workers, max_size=burst)
+    restarted.start()
+    while restarted.depth():
+        await asyncio.sleep(0.01)
+    drained = time.perf_counter() - start
+    await restarted.stop()
+    return intake, drained
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=500, help="Notifications submitted at once")
+    parser.add_argument("--send-ms", type=float, default=50, help="Simulated delivery time per notification")
+    parser.add_argument("--workers", type=int, default=4, help="Queue workers")
+    args = parser.parse_args()
+
+    send_seconds = args.send_ms / 1000
+    # Restart halfway through the first sends
+    restart_after = send_seconds / 2
+
+    print(f"{args.burst} notifications, {args.send_ms:g} ms per send, restart after {restart_after * 1000:g} ms")
+    print(f"{'':>12}{'intake p50 (us)':>17}{'intake p99 (us)':>17}{'peak':>7}{'lost':>7}{'drained (s)':>13}")
+    for name in ("create_task", "queue"):
+        sink = Sink(send_seconds)
+        with tempfile.TemporaryDirectory() as directory:
+            if name == "create_task":
+                intake, drained = asyncio.run(_fire_and_forget(args.burst, sink, restart_after))
+            else:
+                path = os.path.join(directory, "queue.db")
+                intake, drained = asyncio.run(_durable(args.burst, sink, restart_after, path, args.workers))
+        lost = args.burst - len(sink.delivered)
+        print(f"{name:>12}{_percentile(intake, 0.5) * 1e6:>17.1f}{_percentile(intake, 0.99) * 1e6:>17.1f}"
+              f"{sink.peak:>7}{lost:>7}{drained:>13.2f}")
+
+if __name__ == "__main__":
+    main()
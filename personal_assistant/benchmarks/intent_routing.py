@@ -0,0 +1,189 @@
+"""
+Chat intent routing accuracy and latency on labeled messages.
+
+Classifies held-out chat messages (none of them are in the training set)
+and reports, against their labels:
+  - knowledge only: the previous behaviour, every message to the knowledge agent
+  - local:          the local classifier's best guess for every message
+  - routed:         local above the confidence threshold, LLM fallback below it
+                    (the fallback is stubbed with a perfect answer after --llm-ms,
+                    so this is an upper bound on what the fallback adds)
+  - routed, warm:   as routed, with every knowledge question already in the
+                    knowledge agent's answer caches (repeat questions), which
+                    are checked before the fallback
+
+plus local classification latency and how many messages needed the fallback.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.intent_routing [--threshold 0.7] [--llm-ms 300]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from src.agents.intent import CALENDAR, FEEDBACK, INTENTS, KNOWLEDGE, IntentRouter
+from src.config import INTENT_CONFIDENCE_THRESHOLD
+
+SAMPLES = [
+    (KNOWLEDGE, "Who is Mohammed Noushir?"),
+    (KNOWLEDGE, "What does Noushir do for a living?"),
+    (KNOWLEDGE, "Tell me about his time at Scintilink"),
+    (KNOWLEDGE, "What is his experience with hackathons?"),
+    (KNOWLEDGE, "Which universities did he attend?"),
+    (KNOWLEDGE, "Does he know TensorFlow?"),
+    (KNOWLEDGE, "What languages does he code in?"),
+    (KNOWLEDGE, "What is his phone number?"),
+    (KNOWLEDGE, "Has he published any papers?"),
+    (KNOWLEDGE, "What are his main research interests?"),
+    (KNOWLEDGE, "Is his code available on GitHub?"),
+    (KNOWLEDGE, "Has he worked on calendar or booking apps?"),
+    (KNOWLEDGE, "What did he study at Queen Mary?"),
+    (KNOWLEDGE, "What was his biggest achievement?"),
+    (KNOWLEDGE, "Does he have leadership experience?"),
+    (KNOWLEDGE, "What roles has he held?"),
+    (KNOWLEDGE, "Can he build multimodal pipelines?"),
+    (KNOWLEDGE, "Is he looking for a job?"),
+    (KNOWLEDGE, "What's his LinkedIn?"),
+    (KNOWLEDGE, "How experienced is he with LangChain?"),
+    (KNOWLEDGE, "Why should we hire him?"),
+    (KNOWLEDGE, "What kind of projects does he enjoy?"),
+    (KNOWLEDGE, "Tell me something interesting about him"),
+    (KNOWLEDGE, "Has he worked with knowledge graphs?"),
+    (KNOWLEDGE, "Where does he live?"),
+    (KNOWLEDGE, "What did he work on at Perplexity?"),
+    (KNOWLEDGE, "Does he have a PhD?"),
+    (KNOWLEDGE, "Compare his research and industry experience"),
+    (KNOWLEDGE, "hello"),
+    (KNOWLEDGE, "What's his availability for full-time roles?"),
+    (KNOWLEDGE, "Does he have experience with Docker?"),
+    (KNOWLEDGE, "What technologies is he best at?"),
+    (KNOWLEDGE, "How did he get into machine learning?"),
+    (KNOWLEDGE, "Has he mentored anyone?"),
+    (KNOWLEDGE, "What conferences has he presented at?"),
+    (CALENDAR, "can I book a meeting Tuesday?"),
+    (CALENDAR, "I'd love to set up a call with him next week"),
+    (CALENDAR, "Is he free on Wednesday at 2pm?"),
+    (CALENDAR, "When can we meet?"),
+    (CALENDAR, "Schedule an interview for Thursday"),
+    (CALENDAR, "What slots does he have open?"),
+    (CALENDAR, "Can I book 1 hour with Noushir?"),
+    (CALENDAR, "Is he available tomorrow morning?"),
+    (CALENDAR, "I want to schedule a chat about a role"),
+    (CALENDAR, "Please book me in for Monday 11am"),
+    (CALENDAR, "Can we arrange a meeting?"),
+    (CALENDAR, "Is next Friday at 4 ok for a call?"),
+    (CALENDAR, "Show available times"),
+    (CALENDAR, "Could I get a meeting on his calendar?"),
+    (CALENDAR, "How can I schedule time with him?"),
+    (CALENDAR, "Are you available for a quick call today?"),
+    (CALENDAR, "Set up a 30 minute meeting"),
+    (CALENDAR, "I need to reschedule our call"),
+    (CALENDAR, "Book a slot for a coffee chat"),
+    (CALENDAR, "Any free time this week?"),
+    (CALENDAR, "Let's meet on Tuesday afternoon"),
+    (CALENDAR, "When is he available to talk?"),
+    (CALENDAR, "Can I reserve a meeting for next Monday?"),
+    (CALENDAR, "I'd like an appointment with him"),
+    (CALENDAR, "Please cancel my meeting on Friday"),
+    (FEEDBACK, "The site is broken on Safari"),
+    (FEEDBACK, "Your answers are wrong"),
+    (FEEDBACK, "Really like the website design"),
+    (FEEDBACK, "This chatbot is awesome"),
+    (FEEDBACK, "The page takes ages to load"),
+    (FEEDBACK, "Suggestion: add a blog section"),
+    (FEEDBACK, "I noticed a typo on the homepage"),
+    (FEEDBACK, "The assistant misunderstood me"),
+    (FEEDBACK, "Great portfolio, very impressive work!"),
+    (FEEDBACK, "The contact button doesn't work"),
+    (FEEDBACK, "You should make the text bigger"),
+    (FEEDBACK, "Thanks, that was helpful"),
+    (FEEDBACK, "The chat answers are too slow"),
+    (FEEDBACK, "I'd like to give some feedback"),
+    (FEEDBACK, "Nice site!"),
+    (FEEDBACK, "The mobile version looks weird"),
+    (FEEDBACK, "Your bot keeps repeating itself"),
+    (FEEDBACK, "Maybe add a download CV button"),
+    (FEEDBACK, "The images on the projects page are broken"),
+    (FEEDBACK, "Love this assistant"),
+    (FEEDBACK, "Not very helpful responses"),
+    (FEEDBACK, "The booking form is confusing"),
+    (FEEDBACK, "Cool site, well done"),
+    (FEEDBACK, "The dark theme is hard to read"),
+    (FEEDBACK, "I think the chat could be friendlier"),
+]
+
+async def _route_all(router):
+    return [await router.route(text) for _, text in SAMPLES]
+
+def _accuracy(predictions):
+    correct = sum(1 for (label, _), predicted in zip(SAMPLES, predictions) if label == predicted)
+    return correct / len(SAMPLES)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE_THRESHOLD, help="Confidence threshold")
+    parser.add_argument("--llm-ms", type=float, default=300, help="Simulated LLM fallback latency")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the samples for latency")
+    args = parser.parse_args()
+
+    labels = dict((text, label) for label, text in SAMPLES)
+
+    async def perfect_llm(text):
+        await asyncio.sleep(args.llm_ms / 1000)
+        return labels[text]
+
+    local_router = IntentRouter(threshold=args.threshold)
+    local = [local_router.classify(text)[0] for _, text in SAMPLES]
+    confidences = [local_router.classify(text)[1] for _, text in SAMPLES]
+
+    router = IntentRouter(threshold=args.threshold, classify_with_llm=perfect_llm)
+    start = time.perf_counter()
+    routed = asyncio.run(_route_all(router))
+    routed_ms = (time.perf_counter() - start) * 1000 / len(SAMPLES)
+    fallbacks = router.stats()["sources"].get("llm", 0)
+
+    cached = {text for text, label in labels.items() if label == KNOWLEDGE}
+    warm_router = IntentRouter(threshold=args.threshold, classify_with_llm=perfect_llm)
+
+    async def route_warm():
+        return [await warm_router.route(text, cached.__contains__) for _, text in SAMPLES]
+
+    start = time.perf_counter()
+    warm = asyncio.run(route_warm())
+    warm_ms = (time.perf_counter() - start) * 1000 / len(SAMPLES)
+    warm_fallbacks = warm_router.stats()["sources"].get("llm", 0)
+
+    latencies = []
+    for _ in range(args.repeat):
+        for _, text in SAMPLES:
+            start = time.perf_counter()
+            local_router.classify(text)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    latencies.sort()
+
+    print(f"{len(SAMPLES)} labeled messages, threshold {args.threshold}")
+    print(f"{'':>16}{'accuracy':>10}")
+    print(f"{'knowledge only':>16}{_accuracy([KNOWLEDGE] * len(SAMPLES)):>10.1%}")
+    print(f"{'local':>16}{_accuracy(local):>10.1%}")
+    print(f"{'routed':>16}{_accuracy(routed):>10.1%}")
+    print(f"{'routed, warm':>16}{_accuracy(warm):>10.1%}")
+    print(f"LLM fallback for {fallbacks}/{len(SAMPLES)} messages ({warm_fallbacks} warm); mean routing time "
+          f"{routed_ms:.1f} ms ({warm_ms:.1f} ms warm) with a {args.llm_ms:g} ms fallback")
+    print(f"local classify: p50 {latencies[len(latencies) // 2]:.1f} us, "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} us, p99 {latencies[int(len(latencies) * 0.99)]:.1f} us")
+
+    confusion = Counter((label, predicted) for (label, _), predicted in zip(SAMPLES, local))
+    print(f"\nlocal confusion (rows: label){''.join(f'{intent:>11}' for intent in INTENTS)}")
+    for label in INTENTS:
+        print(f"{label:>29}{''.join(f'{confusion[(label, predicted)]:>11}' for predicted in INTENTS)}")
+    misses = [(text, predicted, confidence) for (label, text), predicted, confidence
+              in zip(SAMPLES, local, confidences) if label != predicted]
+    if misses:
+        print("\nlocal misses:")
+        for text, predicted, confidence in misses:
+            marker = "" if confidence >= args.threshold else " (sent to LLM)"
+            print(f"  {text!r} -> {predicted} ({confidence:.2f}){marker}")
+
+if __name__ == "__main__":
+    main()
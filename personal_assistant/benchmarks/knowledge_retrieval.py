@@ -0,0 +1,73 @@
+"""
+Knowledge prompt size with BM25 profile retrieval.
+
+For a set of typical visitor questions, compares the system prompt tokens
+sent with the whole profile against the prompt built from the top-k
+retrieved chunks, and times the retrieval itself. Repeats the comparison
+on the profile grown by duplicating its list sections, to show that the
+retrieved prompt stays roughly flat as the profile grows.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.knowledge_retrieval [--top-k 6] [--growth 1 4 16]
+"""
+import argparse
+import statistics
+import time
+
+from src.agents.knowledge.retrieval import ProfileRetriever
+from src.agents.knowledge.agent import KnowledgeAgent
+from src.llm.tokens import estimate_tokens
+
+QUESTIONS = [
+    "What is his email address?",
+    "Where did he study?",
+    "Which programming languages does he know?",
+    "Has he published any research papers?",
+    "Which companies has he worked at?",
+    "Does he know PyTorch?",
+    "What did he do at Scintilink?",
+    "Has he won any hackathons?",
+    "What projects has he built?",
+    "What is his current role?",
+]
+
+def _grow(profile_data, factor):
+    """Repeat every list section `factor` times to simulate a larger profile"""
+    return {key: value * factor if isinstance(value, list) else value for key, value in profile_data.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=6, help="Chunks retrieved per question")
+    parser.add_argument("--growth", type=int, nargs="+", default=[1, 4, 16], help="Profile size multipliers")
+    parser.add_argument("--repeat", type=int, default=200, help="Retrievals timed per question")
+    args = parser.parse_args()
+
+    agent = KnowledgeAgent()
+    render = agent._render_system_prompt
+    print(f"{'profile':>8}{'chunks':>8}{'full':>8}{'retrieved p50':>15}{'max':>7}{'saved':>8}{'search (us)':>13}")
+    for factor in args.growth:
+        profile_data = _grow(agent.profile_data, factor)
+        retriever = ProfileRetriever(profile_data, args.top_k)
+        full = estimate_tokens(render(profile_data))
+        sent, timings = [], []
+        for question in QUESTIONS:
+            subset = retriever.retrieve(question)
+            sent.append(estimate_tokens(render(subset if subset is not None else profile_data)))
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                retriever.retrieve(question)
+            timings.append((time.perf_counter() - start) / args.repeat)
+        p50 = statistics.median(sent)
+        print(f"{f'x{factor}':>8}{len(retriever.chunks):>8}{full:>8}{p50:>15.0f}{max(sent):>7}"
+              f"{1 - p50 / full:>8.0%}{statistics.median(timings) * 1e6:>13.1f}")
+
+    retriever = ProfileRetriever(agent.profile_data, args.top_k)
+    print(f"\n{'question':<44}{'tokens':>8}  sections")
+    for question in QUESTIONS:
+        subset = retriever.retrieve(question)
+        sections = [key for key in (subset or agent.profile_data) if key not in retriever.pinned]
+        tokens = estimate_tokens(render(subset if subset is not None else agent.profile_data))
+        print(f"{question:<44}{tokens:>8}  {', '.join(sections)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput benchmark for the LLM client under overlapping requests.
+
+Replaces the Groq SDK with a stub that takes a fixed latency per completion
+and compares:
+  - blocking: the old behaviour, a synchronous call inside a coroutine
+  - async:    GroqClient awaiting the call under its concurrency cap
+
+Run from the personal_assistant directory:
+    python -m benchmarks.llm_concurrency [--latency 0.2] [--requests 64]
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.llm.client import GroqClient
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+class _AsyncCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def create(self, messages, model):
+        await asyncio.sleep(self.latency)
+        return _completion("ok")
+
+class _BlockingCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def create(self, messages, model):
+        # Mirrors calling the sync SDK from async code: the loop is frozen
+        time.sleep(self.latency)
+        return _completion("ok")
+
+def _stub_client(completions, max_concurrency):
+    client = GroqClient(api_key="benchmark", max_concurrency=max_concurrency)
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    # Every request is identical, so coalescing would hide the difference
+    client.coalesce_requests = False
+    return client
+
+async def _run(client, total, concurrency):
+    """Issue `total` requests with at most `concurrency` outstanding"""
+    gate = asyncio.Semaphore(concurrency)
+    messages = [{"role": "user", "content": "What are his skills?"}]
+
+    async def one():
+        async with gate:
+            await client.generate_response(messages)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub completion latency in seconds")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per measurement")
+    parser.add_argument("--cap", type=int, default=32, help="GroqClient max concurrency")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency}s requests={args.requests} cap={args.cap}")
+    print(f"{'mode':<10}{'concurrency':>12}{'seconds':>10}{'req/s':>10}")
+    for concurrency in (1, 4, 16, 64):
+        for mode, completions in (
+            ("blocking", _BlockingCompletions(args.latency)),
+            ("async", _AsyncCompletions(args.latency)),
+        ):
+            client = _stub_client(completions, args.cap)
+            elapsed = asyncio.run(_run(client, args.requests, concurrency))
+            print(f"{mode:<10}{concurrency:>12}{elapsed:>10.2f}{args.requests / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Multi-provider routing and failover benchmark.
+
+Starts two fake OpenAI-compatible providers ("primary" fast, "secondary"
+slower), sends a steady stream of chat completions, and half-way through
+degrades the primary (slow and failing). Compares:
+  - single:  only the primary provider configured (the previous behaviour)
+  - routed:  both providers behind ProviderRouter
+
+Reports success rate and latency before and during the incident, plus how
+the routed traffic was split between providers.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.llm_failover [--requests 200] [--rate 40]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.fake_llm_server import FakeLLMBehavior, create_app, serve_in_thread
+from src.llm.client import GroqClient, LLMError
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else None
+
+async def _scenario(client, primary, args):
+    """Send requests at a fixed rate; degrade the primary after half of them"""
+    results = []
+
+    async def one(i):
+        start = time.perf_counter()
+        try:
+            await client.generate_response([{"role": "user", "content": f"question {i}"}])
+            ok = True
+        except LLMError:
+            ok = False
+        results.append((i >= args.requests // 2, ok, time.perf_counter() - start))
+
+    tasks = []
+    for i in range(args.requests):
+        if i == args.requests // 2:
+            primary.latency_ms = args.incident_latency_ms
+            primary.error_rate = args.incident_error_rate
+        tasks.append(asyncio.create_task(one(i)))
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.gather(*tasks)
+    return results
+
+async def _run(urls, behaviors, args):
+    reports = {}
+    for name, providers in (
+        ("single", [{"name": "primary", "base_url": urls[0]}]),
+        ("routed", [{"name": "primary", "base_url": urls[0]}, {"name": "secondary", "base_url": urls[1]}]),
+    ):
+        behaviors[0].latency_ms, behaviors[0].error_rate = args.primary_latency_ms, 0.0
+        client = GroqClient(providers=providers)
+        client.coalesce_requests = False
+        client.breaker.failure_threshold = 10 ** 6
+        client.resilience.deadline = args.deadline
+        results = await _scenario(client, behaviors[0], args)
+        split = {n: s["requests"] for n, s in client.providers.stats()["providers"].items()}
+        reports[name] = (results, split)
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    parser.add_argument("--rate", type=float, default=40.0, help="Requests per second")
+    parser.add_argument("--primary-latency-ms", type=float, default=80.0)
+    parser.add_argument("--secondary-latency-ms", type=float, default=150.0)
+    parser.add_argument("--incident-latency-ms", type=float, default=1500.0, help="Primary latency during the incident")
+    parser.add_argument("--incident-error-rate", type=float, default=0.5, help="Primary error rate during the incident")
+    parser.add_argument("--deadline", type=float, default=5.0, help="Per-request deadline in seconds")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    behaviors = [
+        FakeLLMBehavior(latency_ms=args.primary_latency_ms, latency_sigma=0.3, seed=1),
+        FakeLLMBehavior(latency_ms=args.secondary_latency_ms, latency_sigma=0.3, seed=2),
+    ]
+    servers = [serve_in_thread(create_app(b)) for b in behaviors]
+    try:
+        reports = asyncio.run(_run([f"{url}/v1" for _, url in servers], behaviors, args))
+    finally:
+        for server, _ in servers:
+            server.should_exit = True
+
+    print(f"{'mode':<8}{'phase':<10}{'ok':>6}{'p50 (ms)':>10}{'p95 (ms)':>10}  provider split")
+    for name, (results, split) in reports.items():
+        for phase, incident in (("normal", False), ("incident", True)):
+            rows = [r for r in results if r[0] == incident]
+            ok = [latency for _, success, latency in rows if success]
+            p50, p95 = _percentile(ok, 0.5), _percentile(ok, 0.95)
+            print(f"{name:<8}{phase:<10}{len(ok) / len(rows):>6.0%}"
+                  f"{p50 * 1000 if p50 else float('nan'):>10.0f}{p95 * 1000 if p95 else float('nan'):>10.0f}"
+                  f"  {split if incident else ''}")
+
+if __name__ == "__main__":
+    main()
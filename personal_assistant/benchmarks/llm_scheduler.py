@@ -0,0 +1,91 @@
+"""
+Priority scheduling benchmark under a provider rate limit.
+
+Runs the fake LLM server with a requests-per-minute quota, fires a burst of
+background feedback classifications, then sends interactive chat questions
+while the burst is still queued. Compares:
+  - fifo:      no local limit; calls go out in arrival order (the previous behaviour)
+  - scheduled: LLMScheduler with the quota configured; interactive first
+
+Reports, per class, how many calls succeeded, how many hit 429s or the
+deadline, and the latency of the successful ones.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.llm_scheduler [--rpm 60] [--background 60] [--interactive 10]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.fake_llm_server import FakeLLMBehavior, create_app, serve_in_thread
+from src.llm.client import GroqClient, LLMError
+from src.llm.scheduler import BACKGROUND, INTERACTIVE, LLMScheduler
+
+async def _call(client, priority, content):
+    start = time.perf_counter()
+    try:
+        await client.generate_response([{"role": "user", "content": content}], agent=priority, priority=priority)
+        return priority, True, time.perf_counter() - start
+    except LLMError:
+        return priority, False, time.perf_counter() - start
+
+async def _scenario(client, args):
+    calls = [_call(client, BACKGROUND, f"feedback {i}") for i in range(args.background)]
+
+    async def interactive(i):
+        # Visitors keep chatting while the burst drains
+        await asyncio.sleep(0.5 + i * args.interactive_interval)
+        return await _call(client, INTERACTIVE, f"question {i}")
+
+    calls += [interactive(i) for i in range(args.interactive)]
+    return await asyncio.gather(*calls)
+
+async def _run(base_url, args):
+    results = {}
+    for name, scheduler in (
+        ("fifo", LLMScheduler()),
+        ("scheduled", LLMScheduler(requests_per_minute=args.rpm)),
+    ):
+        client = GroqClient(api_key="fake", base_url=base_url)
+        client.scheduler = scheduler
+        client.coalesce_requests = False
+        client.resilience.deadline = args.deadline
+        client.breaker.failure_threshold = 10 ** 6
+        results[name] = await _scenario(client, args)
+        # Let the fake provider's one-minute window empty before the next mode
+        if name == "fifo":
+            await asyncio.sleep(args.cooldown)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rpm", type=int, default=60, help="Fake provider requests per minute")
+    parser.add_argument("--background", type=int, default=60, help="Background calls in the burst")
+    parser.add_argument("--interactive", type=int, default=10, help="Interactive calls during the burst")
+    parser.add_argument("--interactive-interval", type=float, default=1.0, help="Seconds between interactive calls")
+    parser.add_argument("--deadline", type=float, default=15.0, help="Per-call deadline in seconds")
+    parser.add_argument("--cooldown", type=float, default=61.0, help="Pause between modes for the quota to reset")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fake provider median latency")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    behavior = FakeLLMBehavior(latency_ms=args.latency_ms, rate_limit_rpm=args.rpm, seed=3)
+    server, base_url = serve_in_thread(create_app(behavior))
+    try:
+        results = asyncio.run(_run(base_url, args))
+    finally:
+        server.should_exit = True
+
+    print(f"{'mode':<11}{'class':<13}{'ok':>5}{'failed':>8}{'p50 (ms)':>10}{'max (ms)':>10}")
+    for name, outcomes in results.items():
+        for priority in (INTERACTIVE, BACKGROUND):
+            rows = [o for o in outcomes if o[0] == priority]
+            ok = sorted(latency for _, success, latency in rows if success)
+            p50 = f"{statistics.median(ok) * 1000:.0f}" if ok else "-"
+            worst = f"{ok[-1] * 1000:.0f}" if ok else "-"
+            print(f"{name:<11}{priority:<13}{len(ok):>5}{len(rows) - len(ok):>8}{p50:>10}{worst:>10}")
+
+if __name__ == "__main__":
+    main()
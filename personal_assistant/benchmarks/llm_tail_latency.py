@@ -0,0 +1,103 @@
+"""
+Tail latency benchmark for deadline-aware retries and hedged requests.
+
+Replaces the Groq SDK with a fake endpoint that injects a long-tailed latency
+distribution and transient 503 errors, then compares GroqClient with:
+  - single:  one attempt, no retries (the previous behaviour)
+  - retry:   exponential backoff with jitter inside the deadline
+  - hedged:  retries plus a second attempt once the p95 latency has passed
+
+Run from the personal_assistant directory:
+    python -m benchmarks.llm_tail_latency [--requests 400] [--error-rate 0.03]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from types import SimpleNamespace
+
+from src.llm.client import GroqClient, LLMError
+from src.llm.resilience import ResilientCaller
+
+class _FakeStatusError(Exception):
+    """Shaped like the SDK's APIStatusError so the real classifier sees it"""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(headers=headers)
+
+class _FakeCompletions:
+    def __init__(self, rng, error_rate):
+        self.rng = rng
+        self.error_rate = error_rate
+        self.upstream_calls = 0
+
+    def _latency(self):
+        roll = self.rng.random()
+        if roll < 0.02:
+            return self.rng.uniform(1.0, 2.0)
+        if roll < 0.10:
+            return self.rng.uniform(0.2, 0.4)
+        return self.rng.uniform(0.03, 0.07)
+
+    async def create(self, messages, model, **kwargs):
+        self.upstream_calls += 1
+        await asyncio.sleep(self._latency())
+        if self.rng.random() < self.error_rate:
+            raise _FakeStatusError(503)
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+async def _run(client, total, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        async with gate:
+            start = time.perf_counter()
+            try:
+                # Distinct prompts so request coalescing does not interfere
+                await client.generate_response([{"content": f"question {i}"}])
+                latencies.append(time.perf_counter() - start)
+            except LLMError:
+                errors += 1
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return sorted(latencies), errors
+
+def _pct(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * 1000 if ordered else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--error-rate", type=float, default=0.03)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.disable(logging.ERROR)
+
+    modes = {
+        "single": dict(max_retries=0, hedge=False),
+        "retry": dict(max_retries=2, base_delay=0.05, max_delay=0.5, hedge=False),
+        "hedged": dict(max_retries=2, base_delay=0.05, max_delay=0.5, hedge=True, max_hedge_ratio=0.15),
+    }
+    print(f"{'mode':<8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'upstream':>10}")
+    for name, options in modes.items():
+        completions = _FakeCompletions(random.Random(args.seed), args.error_rate)
+        client = GroqClient(api_key="benchmark")
+        client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        client.resilience = ResilientCaller(deadline=5.0, **options)
+        latencies, errors = asyncio.run(_run(client, args.requests, args.concurrency))
+        print(
+            f"{name:<8}{_pct(latencies, 0.5):>9.1f}{_pct(latencies, 0.95):>9.1f}"
+            f"{_pct(latencies, 0.99):>9.1f}{errors:>8}{completions.upstream_calls:>10}"
+        )
+
+if __name__ == "__main__":
+    main()
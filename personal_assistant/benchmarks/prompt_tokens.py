@@ -0,0 +1,48 @@
+"""
+Prompt size report for the knowledge agent.
+
+Estimates the tokens sent with every knowledge question: the full system
+prompt as built today (and what the old indented JSON rendering cost), each
+profile section's share of it, and the prompt after trimming to a range of
+budgets (which sections get dropped).
+
+Run from the personal_assistant directory:
+    python -m benchmarks.prompt_tokens [--budgets 2500 2000 1500 1000]
+"""
+import argparse
+import json
+
+from src.agents.knowledge.agent import KnowledgeAgent
+from src.llm.tokens import estimate_tokens, fit_profile_to_budget
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[2500, 2000, 1500, 1000])
+    args = parser.parse_args()
+
+    agent = KnowledgeAgent()
+    render = agent._render_system_prompt
+    full_prompt = render(agent.profile_data)
+    full_tokens = estimate_tokens(full_prompt)
+
+    indented_tokens = estimate_tokens(json.dumps(agent.profile_data, indent=2))
+    compact_tokens = estimate_tokens(json.dumps(agent.profile_data, separators=(",", ":"), ensure_ascii=False))
+    print(f"Full system prompt: {full_tokens} tokens, {len(full_prompt)} chars")
+    print(f"Profile JSON:       {compact_tokens} tokens compact vs {indented_tokens} indented "
+          f"({1 - compact_tokens / indented_tokens:.0%} saved)")
+    print(f"Configured budget:  {agent.prompt_token_budget} tokens "
+          f"-> {estimate_tokens(agent._build_system_prompt())} tokens sent\n")
+
+    sections = {key: estimate_tokens(json.dumps({key: value}, separators=(",", ":"), ensure_ascii=False)) for key, value in agent.profile_data.items()}
+    print(f"{'section':<16}{'tokens':>8}{'share':>8}")
+    for key, tokens in sorted(sections.items(), key=lambda item: -item[1]):
+        print(f"{key:<16}{tokens:>8}{tokens / full_tokens:>8.0%}")
+
+    print(f"\n{'budget':>8}{'tokens':>8}{'saved':>8}  dropped sections")
+    for budget in args.budgets:
+        prompt, dropped = fit_profile_to_budget(agent.profile_data, budget, render)
+        tokens = estimate_tokens(prompt)
+        print(f"{budget:>8}{tokens:>8}{1 - tokens / full_tokens:>8.0%}  {', '.join(dropped) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Notification email throughput, one SMTP session per email versus the session pool.
+
+Runs a local SMTP sink that speaks enough ESMTP for smtplib (EHLO, STARTTLS
+with a throwaway self-signed certificate when `openssl` is available, AUTH,
+MAIL/RCPT/DATA) and delays every reply by --rtt-ms to stand in for the
+network round trip to a real provider. Sends --emails notification-sized
+messages with:
+  - per email: the previous EmailSender path, connect + STARTTLS + login +
+               send + QUIT for every email, called from a coroutine
+  - pool xN:   SMTPPool with N logged-in sessions, via send_async
+
+and reports emails/s, sessions opened and the longest event-loop stall
+while sending. The per-email tasks of a burst run back to back without
+yielding, so the loop is blocked for the whole burst. A last run lets the
+sink drop idle sessions between two batches to check that the pool
+reconnects instead of failing.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.smtp_delivery [--emails 100] [--rtt-ms 10] [--pool 2]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import smtplib
+import socket
+import socketserver
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from src.utils.smtp_pool import SMTPPool
+
+USERNAME = "assistant@example.com"
+PASSWORD = "secret"
+RECIPIENT = "owner@example.com"
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, *lines):
+        time.sleep(self.server.rtt)
+        self.wfile.write("".join(line + "\r\n" for line in lines).encode())
+        self.wfile.flush()
+
+    def handle(self):
+        self.connection.settimeout(self.server.idle_timeout)
+        tls = False
+        self.reply("220 sink ESMTP")
+        while True:
+            try:
+                line = self.rfile.readline()
+            except socket.timeout:
+                self.reply("421 4.4.2 sink: idle timeout, closing connection")
+                return
+            except OSError:
+                return
+            if not line:
+                return
+            verb = line.decode(errors="replace").strip().split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                extensions = ["STARTTLS"] if self.server.tls_context and not tls else []
+                extensions.append("AUTH PLAIN LOGIN")
+                self.reply("250-sink", *[f"250-{e}" for e in extensions[:-1]], f"250 {extensions[-1]}")
+            elif verb == "STARTTLS":
+                self.reply("220 2.0.0 Ready to start TLS")
+                # One more round trip for the TLS handshake
+                time.sleep(self.server.rtt)
+                self.request = self.server.tls_context.wrap_socket(self.request, server_side=True)
+                self.connection = self.request
+                self.rfile = self.request.makefile("rb")
+                self.wfile = self.request.makefile("wb")
+                tls = True
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.delivered += 1
+                self.reply("250 2.0.0 Ok: queued")
+            elif verb == "QUIT":
+                self.reply("221 2.0.0 Bye")
+                return
+            else:
+                self.reply("250 2.0.0 Ok")
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Local SMTP server that accepts and discards mail"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rtt, idle_timeout, tls_context=None):
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+        self.rtt = rtt
+        self.idle_timeout = idle_timeout
+        self.tls_context = tls_context
+        self.lock = threading.Lock()
+        self.delivered = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+def _tls_context(directory):
+    """Server context with a self-signed certificate, or None without openssl"""
+    if not shutil.which("openssl"):
+        return None
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=localhost"],
+        check=True, capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+def _message(number):
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = f"Portfolio Feedback: ui [negative] #{number}"
+    msg["From"] = USERNAME
+    msg["To"] = RECIPIENT
+    text = "The contact page was slow to load on my phone and the form lost what I typed. " * 8
+    msg.attach(MIMEText(text, "plain"))
+    msg.attach(MIMEText(f"<html><body><div class='message-box'>{text}</div></body></html>", "html"))
+    return msg.as_string()
+
+class _StallMonitor:
+    """Longest gap between event-loop ticks while running"""
+
+    def __init__(self, tick=0.005):
+        self.tick = tick
+        self.worst = 0.0
+        self._last = None
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            now = time.perf_counter()
+            self.worst = max(self.worst, now - self._last - self.tick)
+            self._last = now
+
+    async def __aenter__(self):
+        self._last = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+        # Let the first tick be scheduled before the work starts
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        # A loop blocked until now never got to record its last gap
+        self.worst = max(self.worst, time.perf_counter() - self._last - self.tick)
+        self._task.cancel()
+
+async def _send_per_email(port, tls, message):
+    """What EmailSender.send_email did before the pool, blocking inside the coroutine"""
+    with smtplib.SMTP("127.0.0.1", port) as server:
+        if tls:
+            server.starttls()
+        server.login(USERNAME, PASSWORD)
+        server.sendmail(USERNAME, [RECIPIENT], message)
+
+async def _per_email(port, tls, messages):
+    # One task per notification, as analyze_feedback used to create them
+    await asyncio.gather(*(_send_per_email(port, tls, message) for message in messages))
+
+async def _pooled(pool, messages):
+    await asyncio.gather(*(pool.send_async(USERNAME, [RECIPIENT], message) for message in messages))
+
+async def _run(args, sink, tls):
+    messages = [_message(i) for i in range(args.emails)]
+    print(f"{args.emails} emails, {args.rtt_ms:g} ms per round trip, STARTTLS: {'yes' if tls else 'no (openssl not found)'}")
+    print(f"{'':>12}{'emails/s':>10}{'sessions':>10}{'loop stall (ms)':>17}")
+
+    async with _StallMonitor() as monitor:
+        start = time.perf_counter()
+        await _per_email(sink.port, tls, messages)
+        elapsed = time.perf_counter() - start
+    print(f"{'per email':>12}{args.emails / elapsed:>10.1f}{args.emails:>10}{monitor.worst * 1000:>17.1f}")
+
+    for size in sorted({1, args.pool}):
+        pool = SMTPPool("127.0.0.1", sink.port, USERNAME, PASSWORD, use_tls=tls, size=size)
+        async with _StallMonitor() as monitor:
+            start = time.perf_counter()
+            await _pooled(pool, messages)
+            elapsed = time.perf_counter() - start
+        stats = pool.stats()
+        pool.close()
+        print(f"{f'pool x{size}':>12}{args.emails / elapsed:>10.1f}{stats['sessions_opened']:>10}{monitor.worst * 1000:>17.1f}")
+
+    # The sink drops sessions idle longer than its timeout; the pool's own timeout is longer
+    pool = SMTPPool("127.0.0.1", sink.port, USERNAME, PASSWORD, use_tls=tls, size=args.pool, idle_timeout=60)
+    batch = messages[:args.pool * 5]
+    await _pooled(pool, batch)
+    await asyncio.sleep(sink.idle_timeout * 1.5)
+    await _pooled(pool, batch)
+    stats = pool.stats()
+    pool.close()
+    print(
+        f"\nAfter the sink dropped idle sessions: {stats['sent']}/{len(batch) * 2} sent, "
+        f"{stats['failed']} failed, {stats['reconnects']} reconnects"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=100, help="Emails sent per approach")
+    parser.add_argument("--rtt-ms", type=float, default=10, help="Simulated round trip per SMTP reply")
+    parser.add_argument("--pool", type=int, default=2, help="Sessions in the larger pool")
+    parser.add_argument("--server-idle", type=float, default=1.0, help="Seconds before the sink drops an idle session")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        tls_context = _tls_context(directory)
+        sink = SMTPSink(args.rtt_ms / 1000, args.server_idle, tls_context)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        try:
+            asyncio.run(_run(args, sink, tls_context is not None))
+        finally:
+            sink.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Spam pattern matching throughput with a large blocklist.
+
+Matches feedback-sized messages against --patterns synthetic patterns (plus
+the bundled spam_patterns.txt) with:
+  - substring: the previous `any(keyword in message.lower() ...)` scan, which
+               also matches inside words ("hack" in "hackathon")
+  - regex loop: one precompiled word-boundary regex per pattern (skipped above 2000 chars)
+  - one regex: all patterns in a single compiled `\\b(?:...)\\b` alternation
+  - trie:      PatternSet, the word-level trie used by SpamFilter
+
+and reports compile time, per-message match time for each message size,
+and false positives on words that merely contain a pattern.
+
+Run from the personal_assistant directory:
+    python -m benchmarks.spam_filter [--patterns 10000] [--sizes 200 2000 20000]
+"""
+import argparse
+import random
+import re
+import time
+
+from src.agents.feedback.spam_filter import PatternSet, parse_patterns, tokenize
+
+# Clean feedback, so no matcher can stop at an early match
+FEEDBACK_WORDS = (
+    "the site looks great and the chatbot answered my questions about his research quickly "
+    "I loved the demo project and the knowledge graph work but the contact page was slow "
+    "on my phone maybe add a dark mode and more screenshots of the multimodal pipeline thanks"
+).split()
+
+# Feedback that contains blocklisted words only as parts of longer words
+INNOCENT = [
+    "I loved the hackathon project",
+    "Great work on the antivirus research",
+    "The spammy popups are gone now, nice",
+    "Is the lotteryresults dataset public?",
+]
+
+def _synthetic_patterns(count, seed=7):
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    patterns = set()
+    while len(patterns) < count:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        patterns.add(" ".join(words))
+    return [(phrase, 1.0) for phrase in sorted(patterns)]
+
+def _message(size, rng):
+    words = []
+    while sum(len(word) + 1 for word in words) < size:
+        words.append(rng.choice(FEEDBACK_WORDS))
+    return " ".join(words)
+
+def _per_message_us(function, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            function(message)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(messages))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patterns", type=int, default=10000, help="Synthetic patterns in the blocklist")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 20000], help="Message sizes in characters")
+    parser.add_argument("--messages", type=int, default=20, help="Messages per size")
+    args = parser.parse_args()
+
+    with open("spam_patterns.txt", "rb") as file:
+        bundled = [(phrase, weight) for phrase, weight in parse_patterns(file.read()) if not phrase.endswith("*")]
+    patterns = bundled + _synthetic_patterns(args.patterns)
+    phrases = [phrase for phrase, _ in patterns]
+
+    compile_ms = {}
+    start = time.perf_counter()
+    regexes = [re.compile(r"\b" + re.escape(phrase) + r"\b") for phrase in phrases]
+    compile_ms["regex loop"] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    combined = re.compile(r"\b(?:" + "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True)) + r")\b")
+    compile_ms["one regex"] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    trie = PatternSet(patterns)
+    compile_ms["trie"] = (time.perf_counter() - start) * 1000
+    compile_ms["substring"] = 0.0
+
+    matchers = {
+        "substring": lambda text: any(phrase in text.lower() for phrase in phrases),
+        "regex loop": lambda text: [regex for regex in regexes if regex.search(text.lower())],
+        "one regex": lambda text: set(combined.findall(text.lower())),
+        "trie": lambda text: trie.find(tokenize(text)),
+    }
+
+    rng = random.Random(11)
+    print(f"{len(patterns)} patterns")
+    header = "".join(f"{f'{size} ch (us)':>15}" for size in args.sizes)
+    print(f"{'':>12}{'compile (ms)':>14}{header}{'false pos':>11}")
+    for name, matcher in matchers.items():
+        row = f"{name:>12}{compile_ms[name]:>14.1f}"
+        for size in args.sizes:
+            messages = [_message(size, rng) for _ in range(args.messages)]
+            if name == "regex loop" and size > 2000:
+                # Minutes per size at this point; the trend is clear from the smaller sizes
+                row += f"{'-':>15}"
+                continue
+            row += f"{_per_message_us(matcher, messages, max(1, 2000 // size)):>15.1f}"
+        false_positives = sum(1 for text in INNOCENT if matcher(text))
+        print(f"{row}{false_positives:>8}/{len(INNOCENT)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Ingest the CV documents into the knowledge agent's retrieval index.
+
+Extracts text from the configured CV sources (CV_SOURCES: files or
+directories of .pdf/.txt/.md), chunks it and writes the memory-mapped index
+to CV_INDEX_PATH beside profile.json. Unchanged documents are skipped and
+only chunks whose content hash changed are re-indexed; a running app picks up the new index without a restart.
+
+Usage:
+    python ingest_cv.py [--source PATH ...] [--output PATH] [--chunk-tokens 120]
+"""
+import argparse
+import logging
+
+from src.agents.knowledge.cv_index import build_index
+from src.config import CV_INDEX_PATH, CV_SOURCES
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", action="append", help="CV file or directory (repeatable; default CV_SOURCES)")
+    parser.add_argument("--output", default=CV_INDEX_PATH, help="Index file to write")
+    parser.add_argument("--chunk-tokens", type=int, default=120, help="Approximate tokens per chunk")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    report = build_index(args.source or CV_SOURCES, args.output, args.chunk_tokens)
+    print(f"Sources: {', '.join(report['sources']) or 'none'}")
+    print(f"Documents unchanged: {report['unchanged_documents']}/{len(report['sources'])}")
+    print(f"Chunks: {report['chunks']} ({report['indexed']} indexed, {report['reused']} unchanged, "
+          f"{report['removed']} removed)")
+    print(f"Index {'written to' if report['written'] else 'already up to date at'} {args.output} "
+          f"(version {report['version']})")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ load_dotenv()
 from src.agents.knowledge.router import router as knowledge_router
 from src.agents.feedback.router import router as feedback_router
 from src.agents.calendar.router import router as calendar_router
+from src.agents.knowledge.service import knowledge_agent
+from src.utils import metrics
+from src.llm.client import groq_client
+from src.llm import transport
 
 # Create FastAPI app
 app = FastAPI(
@@ -18,6 +22,24 @@ app = FastAPI(
     version="0.1.0"
 )
 
+@app.on_event("startup")
+async def warm_up_llm_transport():
+    """Open provider connections before the server starts accepting requests"""
+    await groq_client.warm_up()
+
+@app.on_event("shutdown")
+async def close_llm_transport():
+    await transport.close()
+
+@app.on_event("startup")
+async def start_answer_pregeneration():
+    """Answer the frequent questions in the background once the server is up"""
+    knowledge_agent.pregenerator.schedule()
+
+@app.on_event("shutdown")
+async def stop_answer_pregeneration():
+    await knowledge_agent.pregenerator.stop()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,6 +54,11 @@ app.include_router(knowledge_router, prefix="/api", tags=["knowledge"])
 app.include_router(feedback_router, prefix="/api", tags=["feedback"])
 app.include_router(calendar_router, prefix="/api/calendar", tags=["calendar"])
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """Runtime metrics for caches and LLM calls"""
+    return metrics.snapshot()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Agentic AI Assistant API"}
@@ -15,6 +15,10 @@ class BaseAgent(ABC):
         """Process input data and return a response"""
         pass
     
-    async def generate_llm_response(self, messages, system_prompt=None):
+    async def generate_llm_response(self, messages, system_prompt=None, **kwargs):
         """Generate a response using the LLM"""
-        return await groq_client.generate_response(messages, system_prompt) 
\ No newline at end of file
+        return await groq_client.generate_response(messages, system_prompt, agent=self.name, **kwargs) 
+    
+    def stream_llm_response(self, messages, system_prompt=None):
+        """Stream a response from the LLM as an async iterator of text chunks"""
+        return groq_client.stream_response(messages, system_prompt, agent=self.name)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+import re
+from src.llm.scheduler import BACKGROUND
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ANALYSIS_PROMPT = """Analyze the following feedback message.
+            Determine:
+            1. The sentiment (positive, negative, neutral)
+            2. A priority level (1-5, where 5 is highest)
+            3. A category (bug, feature request, complaint, praise, question, other)
+
+            Format your response as JSON with fields: sentiment, priority, category
+            """
+
+BATCH_ANALYSIS_PROMPT = """Analyze each feedback message in the JSON list below.
+            For every item determine:
+            1. The sentiment (positive, negative, neutral)
+            2. A priority level (1-5, where 5 is highest)
+            3. A category (bug, feature request, complaint, praise, question, other)
+
+            Format your response as a JSON array with one object per item, in the same order,
+            with fields: id, sentiment, priority, category
+            """
+
+DEFAULT_ANALYSIS = {"sentiment": "neutral", "priority": 1, "category": "other"}
+
+def parse_analysis(llm_analysis):
+    """Parse the JSON object in an LLM analysis, or return None if there is none"""
+    # Small models often wrap the object in prose or a code fence
+    match = re.search(r"\{.*\}", llm_analysis or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        analysis = json.loads(match.group())
+    except ValueError:
+        return None
+    return analysis if isinstance(analysis, dict) else None
+
+def parse_batch_analysis(llm_analysis):
+    """Parse a multi-item analysis into {id: analysis} for every item that parsed"""
+    match = re.search(r"\[.*\]", llm_analysis or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        items = json.loads(match.group())
+    except ValueError:
+        return {}
+    results = {}
+    for position, item in enumerate(items if isinstance(items, list) else []):
+        if not isinstance(item, dict):
+            continue
+        try:
+            results[int(item.get("id", position))] = item
+        except (TypeError, ValueError):
+            results[position] = item
+    return results
+
+def _fields(analysis):
+    """Keep only the classification fields, filling gaps with defaults"""
+    return {key: analysis.get(key, default) for key, default in DEFAULT_ANALYSIS.items()}
+
+class FeedbackBatcher:
+    """Classifies feedback messages in micro-batches
+
+    Messages arriving within `window_seconds` of the first pending one, up to
+    `max_items`, are classified by a single LLM request that returns one JSON
+    object per message. Each caller waits at most one window before its batch
+    is sent. Items missing from the batched answer are classified on their
+    own, so one malformed entry never fails the whole batch.
+    """
+
+    def __init__(self, llm_client, window_seconds=0.2, max_items=16, agent="FeedbackAgent"):
+        self.llm_client = llm_client
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.agent = agent
+        self._pending = []
+        self._timer = None
+        # Running batches, referenced until done so the event loop cannot drop them
+        self._batches = set()
+        self.batches = 0
+        self.items = 0
+        self.upstream_calls = 0
+        self.fallbacks = 0
+
+    async def classify(self, feedback_message):
+        """Return sentiment, priority and category for one feedback message"""
+        self.items += 1
+        if self.window_seconds <= 0 or self.max_items <= 1:
+            return await self._classify_one(feedback_message)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((feedback_message, future))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        """Send everything pending as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        self.batches += 1
+        try:
+            if len(batch) == 1:
+                results = [await self._classify_one(batch[0][0])]
+            else:
+                results = await self._classify_many([message for message, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _classify_one(self, feedback_message):
+        self.upstream_calls += 1
+        messages = [{"role": "user", "content": feedback_message}]
+        # Unparseable JSON escalates to a larger model when a cascade is configured
+        llm_analysis = await self.llm_client.generate_response(
+            messages, ANALYSIS_PROMPT, agent=self.agent, priority=BACKGROUND,
+            validate=lambda text: parse_analysis(text) is not None
+        )
+        analysis = parse_analysis(llm_analysis)
+        return _fields(analysis) if analysis is not None else dict(DEFAULT_ANALYSIS)
+
+    async def _classify_many(self, feedback_messages):
+        self.upstream_calls += 1
+        count = len(feedback_messages)
+        items = [{"id": i, "message": message} for i, message in enumerate(feedback_messages)]
+        messages = [{"role": "user", "content": json.dumps(items, ensure_ascii=False)}]
+        expected = set(range(count))
+        llm_analysis = await self.llm_client.generate_response(
+            messages, BATCH_ANALYSIS_PROMPT, agent=self.agent, priority=BACKGROUND,
+            validate=lambda text: expected <= parse_batch_analysis(text).keys()
+        )
+
+        # Keep the items that parsed; the rest are classified individually
+        parsed = parse_batch_analysis(llm_analysis)
+        missing = sorted(expected - parsed.keys())
+        if missing:
+            self.fallbacks += len(missing)
+            logger.warning(f"Batched feedback analysis missing {len(missing)}/{count} items, classifying them individually")
+            singles = await asyncio.gather(*(self._classify_one(feedback_messages[i]) for i in missing))
+            parsed.update(zip(missing, singles))
+        return [_fields(parsed[i]) for i in range(count)]
+
+    def stats(self):
+        """Return batch counts and the upstream calls saved"""
+        return {
+            "window_seconds": self.window_seconds,
+            "max_items": self.max_items,
+            "items": self.items,
+            "batches": self.batches,
+            "upstream_calls": self.upstream_calls,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+            "individual_fallbacks": self.fallbacks,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digest_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    received_at REAL NOT NULL
+);
+"""
+
+def is_urgent(feedback, min_priority=4):
+    """High-priority or negative feedback, which is never held back for a digest"""
+    if str(feedback.get("sentiment", "")).lower() == "negative":
+        return True
+    try:
+        return int(feedback.get("priority", 1)) >= min_priority
+    except (TypeError, ValueError):
+        # An unreadable priority is not a reason to delay the email
+        return True
+
+class FeedbackDigest:
+    """Holds routine feedback back and hands it on as one digest job
+
+    Items are stored in SQLite (beside the notification queue) so a restart
+    does not lose them. Once `max_items` are waiting, or the oldest has
+    waited `interval` seconds, up to `max_items` of them are passed to
+    `enqueue` as a single {"digest": [...]} payload and deleted only after
+    that succeeds. If `enqueue` fails (for example because the queue is
+    full) the items stay and the digest is retried `retry_delay` seconds later.
+    """
+
+    # Longest the scheduler sleeps before checking the table again
+    IDLE_POLL_SECONDS = 60.0
+
+    def __init__(self, path, enqueue, interval=3600.0, max_items=20, retry_delay=30.0):
+        self.path = path
+        self.enqueue = enqueue
+        self.interval = interval
+        self.max_items = max_items
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        self._task = None
+        self._wake = None
+        self.added = 0
+        self.digests = 0
+        self.digested = 0
+        self.errors = 0
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        return db
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _peek(self):
+        """Return (waiting items, received_at of the oldest)"""
+        return self._execute("SELECT COUNT(*), MIN(received_at) FROM digest_items")[0]
+
+    def start(self):
+        """Start the digest scheduler on the running event loop"""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the scheduler; waiting items are kept for the next run"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def add(self, feedback):
+        """Store one feedback item for the next digest"""
+        if self._task is None:
+            self.start()
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO digest_items (payload, received_at) VALUES (?, ?)",
+            (json.dumps(feedback), time.time()),
+        )
+        self.added += 1
+        self._wake.set()
+
+    async def flush(self):
+        """Enqueue the oldest waiting items (up to max_items) as one digest; returns how many"""
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT id, payload, received_at FROM digest_items ORDER BY id LIMIT ?", (self.max_items,)
+        )
+        if not rows:
+            return 0
+        items = [dict(json.loads(payload), received_at=received_at) for _, payload, received_at in rows]
+        await self.enqueue({"digest": items})
+        ids = [row[0] for row in rows]
+        await asyncio.to_thread(
+            self._execute, f"DELETE FROM digest_items WHERE id IN ({','.join('?' * len(ids))})", ids
+        )
+        self.digests += 1
+        self.digested += len(items)
+        logger.info(f"Queued a feedback digest of {len(items)} items")
+        return len(items)
+
+    async def _run(self):
+        while True:
+            # Cleared before looking, so an item added while we look still wakes us
+            self._wake.clear()
+            count, oldest = await asyncio.to_thread(self._peek)
+            now = time.time()
+            if count and (count >= self.max_items or now - oldest >= self.interval):
+                try:
+                    await self.flush()
+                    continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"Could not queue the feedback digest, retrying in {self.retry_delay:g}s: {e}")
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+            wait = self.IDLE_POLL_SECONDS if not count else min(oldest + self.interval - now, self.IDLE_POLL_SECONDS)
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(wait, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self):
+        """Return waiting items, digests queued and the emails they replaced"""
+        count, oldest = self._peek()
+        return {
+            "interval_seconds": self.interval,
+            "max_items": self.max_items,
+            "waiting": count,
+            "oldest_waiting_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "added": self.added,
+            "digests": self.digests,
+            "digested": self.digested,
+            "emails_saved": self.digested - self.digests,
+            "errors": self.errors,
+        }
@@ -1,7 +1,16 @@
-import json
 import logging
-import asyncio
+from src.agents.feedback.batcher import FeedbackBatcher
+from src.agents.feedback.digest import FeedbackDigest, is_urgent
+from src.agents.feedback.spam_filter import SpamFilter
+from src.config import (
+    FEEDBACK_BATCH_WINDOW_MS, FEEDBACK_BATCH_MAX_ITEMS, SPAM_PATTERNS_PATH, SPAM_SCORE_THRESHOLD,
+    PROFILE_RELOAD_INTERVAL, FEEDBACK_QUEUE_PATH, FEEDBACK_QUEUE_WORKERS, FEEDBACK_QUEUE_MAX_SIZE,
+    FEEDBACK_QUEUE_MAX_ATTEMPTS, FEEDBACK_QUEUE_RETRY_BASE_DELAY, FEEDBACK_QUEUE_RETRY_MAX_DELAY,
+    FEEDBACK_DIGEST, FEEDBACK_DIGEST_MIN_URGENT_PRIORITY, FEEDBACK_DIGEST_INTERVAL, FEEDBACK_DIGEST_MAX_ITEMS
+)
+from src.utils.durable_queue import DurableQueue, QueueFullError
 from src.utils.email_sender import EmailSender
+from src.utils import metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,10 +20,47 @@ class FeedbackAnalyzer:
     """Analyzes and processes user feedback"""
     
     def __init__(self):
-        # Keywords for simple filtering
-        self.spam_keywords = ["spam", "virus", "hack", "free money", "lottery"]
+        # Weighted spam patterns from spam_patterns.txt, matched on whole words
+        self.spam_filter = SpamFilter(SPAM_PATTERNS_PATH, SPAM_SCORE_THRESHOLD, PROFILE_RELOAD_INTERVAL)
+        metrics.register("spam_filter", self.spam_filter.stats)
         # Initialize email sender
         self.email_sender = EmailSender()
+        metrics.register("smtp_pool", self.email_sender.pool.stats)
+        # Notification emails are persisted and delivered by a fixed pool of workers
+        self.notifications = DurableQueue(
+            FEEDBACK_QUEUE_PATH,
+            self.deliver_notification,
+            name="feedback_notifications",
+            workers=FEEDBACK_QUEUE_WORKERS,
+            max_size=FEEDBACK_QUEUE_MAX_SIZE,
+            max_attempts=FEEDBACK_QUEUE_MAX_ATTEMPTS,
+            base_delay=FEEDBACK_QUEUE_RETRY_BASE_DELAY,
+            max_delay=FEEDBACK_QUEUE_RETRY_MAX_DELAY,
+        )
+        metrics.register("feedback_queue", self.notifications.stats)
+        # Routine feedback is held back and emailed as one digest (stored beside the queue)
+        self.digest = None
+        if FEEDBACK_DIGEST:
+            self.digest = FeedbackDigest(
+                FEEDBACK_QUEUE_PATH,
+                self.notifications.put,
+                interval=FEEDBACK_DIGEST_INTERVAL,
+                max_items=FEEDBACK_DIGEST_MAX_ITEMS,
+            )
+            metrics.register("feedback_digest", self.digest.stats)
+        # Created on first use, bound to the caller's LLM client
+        self.batcher = None
+    
+    def _get_batcher(self, llm_client):
+        """Return the classification batcher for this LLM client"""
+        if self.batcher is None or self.batcher.llm_client is not llm_client:
+            self.batcher = FeedbackBatcher(
+                llm_client,
+                window_seconds=FEEDBACK_BATCH_WINDOW_MS / 1000,
+                max_items=FEEDBACK_BATCH_MAX_ITEMS
+            )
+            metrics.register("feedback_batching", self.batcher.stats)
+        return self.batcher
         
     async def analyze_feedback(self, feedback_message, llm_client, rating=None, category=None):
         """Analyze feedback message and send email notification if not spam
@@ -29,41 +75,25 @@ class FeedbackAnalyzer:
             Tuple of (analysis_dict, response_message)
         """
         try:
-            # Simple keyword-based spam detection
-            is_spam = any(keyword in feedback_message.lower() for keyword in self.spam_keywords)
+            # Pattern-based spam scoring
+            spam_score, spam_matches = self.spam_filter.score(feedback_message)
             
-            if is_spam:
-                logger.info("Feedback flagged as potential spam")
+            if spam_score >= self.spam_filter.threshold:
+                logger.info(f"Feedback flagged as potential spam (score {spam_score:g}: {', '.join(spam_matches)})")
                 return {
                     "is_spam": True,
                     "sentiment": "neutral",
                     "priority": 1,
-                    "category": "spam"
+                    "category": "spam",
+                    "spam_score": spam_score
                 }, "Your message has been flagged as potential spam."
             
-            # Use LLM for sentiment analysis and categorization
-            system_prompt = """Analyze the following feedback message. 
-            Determine:
-            1. The sentiment (positive, negative, neutral)
-            2. A priority level (1-5, where 5 is highest)
-            3. A category (bug, feature request, complaint, praise, question, other)
-            
-            Format your response as JSON with fields: sentiment, priority, category
-            """
-            
-            messages = [{"role": "user", "content": feedback_message}]
-            llm_analysis = await llm_client.generate_response(messages, system_prompt)
-            
-            # Parse LLM response
-            try:
-                analysis_dict = json.loads(llm_analysis)
-                sentiment = analysis_dict.get("sentiment", "neutral")
-                priority = analysis_dict.get("priority", 1)
-                llm_category = analysis_dict.get("category", "other")
-            except:
-                sentiment = "neutral"
-                priority = 1
-                llm_category = "other"
+            # Use LLM for sentiment analysis and categorization, batched with
+            # other feedback arriving in the same window
+            analysis = await self._get_batcher(llm_client).classify(feedback_message)
+            sentiment = analysis["sentiment"]
+            priority = analysis["priority"]
+            llm_category = analysis["category"]
             
             # Create complete feedback data
             feedback_data = {
@@ -72,11 +102,20 @@ class FeedbackAnalyzer:
                 "priority": priority,
                 "category": category or llm_category,
                 "message": feedback_message,
-                "rating": rating
+                "rating": rating,
+                "spam_score": spam_score
             }
             
-            # Send email notification asynchronously (don't wait for it to complete)
-            asyncio.create_task(self.send_email_notification(feedback_data))
+            # Queue the email notification; it is sent in the background and survives restarts.
+            # Routine feedback waits for the next digest instead of getting its own email.
+            try:
+                if self.digest is not None and not is_urgent(feedback_data, FEEDBACK_DIGEST_MIN_URGENT_PRIORITY):
+                    await self.digest.add(feedback_data)
+                else:
+                    await self.notifications.put(feedback_data)
+            except QueueFullError as e:
+                logger.warning(f"Feedback notification not queued: {str(e)}")
+                return feedback_data, "Thank you! We're receiving a lot of feedback right now, please try again in a few minutes."
             
             # Return immediately with success message
             response_message = "Thank you for your feedback! I've sent it to Mohammed."
@@ -92,6 +131,32 @@ class FeedbackAnalyzer:
                 "category": "error"
             }, f"Error processing feedback: {str(e)}"
     
+    async def deliver_notification(self, payload):
+        """Send a queued notification: a single feedback item or a {"digest": [...]} batch"""
+        if "digest" in payload:
+            return await self.send_digest_notification(payload["digest"])
+        return await self.send_email_notification(payload)
+    
+    async def send_digest_notification(self, items):
+        """Send one digest email for several feedback items
+        
+        Args:
+            items: List of feedback dictionaries
+            
+        Returns:
+            Boolean indicating success or failure
+        """
+        try:
+            result = await self.email_sender.send_feedback_digest_async(items)
+            if result:
+                logger.info(f"Digest email sent successfully for {len(items)} feedback items")
+            else:
+                logger.warning(f"Failed to send digest email for {len(items)} feedback items")
+            return result
+        except Exception as e:
+            logger.error(f"Error sending digest email: {str(e)}")
+            return False
+    
     async def send_email_notification(self, feedback_data):
         """Send feedback notification email
         
@@ -102,7 +167,7 @@ class FeedbackAnalyzer:
             Boolean indicating success or failure
         """
         try:
-            result = self.email_sender.send_feedback_notification(feedback_data)
+            result = await self.email_sender.send_feedback_notification_async(feedback_data)
             if result:
                 logger.info(f"Email notification sent successfully for feedback: {feedback_data.get('category')}")
             else:
@@ -1,4 +1,12 @@
 from src.agents.base import BaseAgent
+from src.agents.feedback.batcher import FeedbackBatcher
+from src.agents.feedback.spam_filter import SpamFilter
+from src.config import (
+    FEEDBACK_BATCH_WINDOW_MS, FEEDBACK_BATCH_MAX_ITEMS, SPAM_PATTERNS_PATH, SPAM_SCORE_THRESHOLD,
+    PROFILE_RELOAD_INTERVAL
+)
+from src.llm.client import groq_client
+from src.utils import metrics
 from pydantic import BaseModel
 from typing import Optional
 
@@ -14,38 +22,28 @@ class FeedbackAgent(BaseAgent):
             name="FeedbackAgent",
             description="Processes and filters user feedback"
         )
-        # Keywords for simple filtering
-        self.spam_keywords = ["spam", "virus", "hack", "free money", "lottery"]
+        # Weighted spam patterns from spam_patterns.txt, matched on whole words
+        self.spam_filter = SpamFilter(SPAM_PATTERNS_PATH, SPAM_SCORE_THRESHOLD, PROFILE_RELOAD_INTERVAL)
+        metrics.register("spam_filter", self.spam_filter.stats)
+        # Feedback arriving together is classified in one LLM request
+        self.batcher = FeedbackBatcher(
+            groq_client,
+            window_seconds=FEEDBACK_BATCH_WINDOW_MS / 1000,
+            max_items=FEEDBACK_BATCH_MAX_ITEMS,
+            agent=self.name
+        )
+        metrics.register("feedback_batching", self.batcher.stats)
         
     async def process(self, feedback_message):
         """Process feedback and determine if it's genuine"""
-        # Simple keyword-based spam detection
-        is_spam = any(keyword in feedback_message.lower() for keyword in self.spam_keywords)
+        # Pattern-based spam scoring
+        is_spam = self.spam_filter.is_spam(feedback_message)
         
         # Use LLM for sentiment analysis and categorization
-        system_prompt = """Analyze the following feedback message. 
-        Determine:
-        1. The sentiment (positive, negative, neutral)
-        2. A priority level (1-5, where 5 is highest)
-        3. A category (bug, feature request, complaint, praise, question, other)
-        
-        Format your response as JSON with fields: sentiment, priority, category
-        """
-        
-        messages = [{"role": "user", "content": feedback_message}]
-        llm_analysis = await self.generate_llm_response(messages, system_prompt)
-        
-        # Parse LLM response
-        try:
-            import json
-            analysis_dict = json.loads(llm_analysis)
-            sentiment = analysis_dict.get("sentiment", "neutral")
-            priority = analysis_dict.get("priority", 1)
-            category = analysis_dict.get("category", "other")
-        except:
-            sentiment = "neutral"
-            priority = 1
-            category = "other"
+        analysis_dict = await self.batcher.classify(feedback_message)
+        sentiment = analysis_dict["sentiment"]
+        priority = analysis_dict["priority"]
+        category = analysis_dict["category"]
         
         # Create analysis result
         analysis = FeedbackAnalysis(
@@ -0,0 +1,169 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from src.utils.file_watcher import FileWatcher
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Used when the patterns file is missing: the original keyword list, one point each
+DEFAULT_SPAM_PATTERNS = [("spam", 1.0), ("virus", 1.0), ("hack", 1.0), ("free money", 1.0), ("lottery", 1.0)]
+
+# Trie keys that cannot collide with a word token
+_END = None
+_PREFIX = ""
+
+def tokenize(text):
+    """Lowercased words; punctuation and whitespace only separate them"""
+    return re.findall(r"[^\W_]+", text.lower())
+
+def parse_patterns(raw):
+    """Parse a patterns file: one `phrase` or `phrase: weight` per line, # for comments
+
+    A trailing `*` also matches longer words (`crypto*` matches "cryptocurrency").
+    A line is only split at its last colon when a number follows it, so
+    phrases such as "http://bit.ly" or "re: winner" keep the default weight 1.
+    """
+    patterns = []
+    for line in raw.decode("utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        phrase, separator, weight = line.rpartition(":")
+        try:
+            weight = float(weight) if separator else None
+        except ValueError:
+            weight = None
+        if weight is None or not math.isfinite(weight):
+            phrase, weight = line, 1.0
+        patterns.append((phrase.strip(), weight))
+    return patterns
+
+class PatternSet:
+    """Compiled multi-pattern matcher over word tokens
+
+    Patterns are tokenized like the messages they are matched against and
+    stored in a trie keyed by whole words, so a pattern only matches at word
+    boundaries ("hack" never matches inside "hackathon") and matching costs
+    a dictionary lookup per word, however many patterns there are. Patterns
+    ending in `*` match any word that starts with their last word.
+    """
+
+    def __init__(self, patterns):
+        self._root = {}
+        self.size = 0
+        for phrase, weight in patterns:
+            prefix = phrase.endswith("*")
+            words = tokenize(phrase.rstrip("*"))
+            if not words:
+                continue
+            node = self._root
+            for word in words[:-1]:
+                node = node.setdefault(word, {})
+            if prefix:
+                table, _ = node.get(_PREFIX, ({}, ()))
+                table[words[-1]] = (phrase, weight)
+                node[_PREFIX] = (table, tuple(sorted({len(key) for key in table})))
+            else:
+                node.setdefault(words[-1], {})[_END] = (phrase, weight)
+            self.size += 1
+
+    def find(self, tokens):
+        """Return {phrase: weight} for every pattern occurring in the token list"""
+        found = {}
+        count = len(tokens)
+        root = self._root
+        for start in range(count):
+            node = root
+            position = start
+            while position < count:
+                token = tokens[position]
+                prefixes = node.get(_PREFIX)
+                if prefixes is not None:
+                    table, lengths = prefixes
+                    for length in lengths:
+                        if length > len(token):
+                            break
+                        hit = table.get(token[:length])
+                        if hit is not None:
+                            found[hit[0]] = hit[1]
+                node = node.get(token)
+                if node is None:
+                    break
+                hit = node.get(_END)
+                if hit is not None:
+                    found[hit[0]] = hit[1]
+                position += 1
+        return found
+
+class SpamFilter:
+    """Weighted spam scoring against a hot-reloadable pattern list
+
+    A message's score is the sum of the weights of the distinct patterns it
+    contains; it counts as spam once the score reaches `threshold`. The
+    patterns file is checked for edits at most every `check_interval`
+    seconds and recompiled only when its content changes; an invalid edit
+    is ignored and the last good patterns stay in use.
+    """
+
+    def __init__(self, path=None, threshold=1.0, check_interval=2.0):
+        self.threshold = threshold
+        self.watcher = FileWatcher(path, check_interval, parse=parse_patterns) if path else None
+        self.patterns = PatternSet(self._load())
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.flagged = 0
+        self._latencies = deque(maxlen=1000)
+
+    def _load(self):
+        if self.watcher is None:
+            return DEFAULT_SPAM_PATTERNS
+        try:
+            return self.watcher.load()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Using default spam patterns, could not load {self.watcher.path}: {e}")
+            return DEFAULT_SPAM_PATTERNS
+
+    def refresh(self):
+        """Recompile the patterns if the file changed on disk"""
+        if self.watcher is None:
+            return False
+        patterns = self.watcher.poll()
+        if patterns is None:
+            return False
+        self.patterns = PatternSet(patterns)
+        logger.info(f"Spam filter reloaded with {self.patterns.size} patterns")
+        return True
+
+    def score(self, text):
+        """Return (score, {matched phrase: weight}) for a message"""
+        self.refresh()
+        start = time.perf_counter()
+        matches = self.patterns.find(tokenize(text))
+        score = sum(matches.values(), 0.0)
+        with self._lock:
+            self.checked += 1
+            self.flagged += score >= self.threshold
+            self._latencies.append(time.perf_counter() - start)
+        return score, matches
+
+    def is_spam(self, text):
+        score, _ = self.score(text)
+        return score >= self.threshold
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "patterns": self.patterns.size,
+                "threshold": self.threshold,
+                "checked": self.checked,
+                "flagged": self.flagged,
+                "match_p50_us": round(latencies[len(latencies) // 2] * 1e6, 1) if latencies else 0.0,
+                "match_p95_us": round(latencies[int(len(latencies) * 0.95)] * 1e6, 1) if latencies else 0.0,
+                "reloads": self.watcher.reloads if self.watcher else 0,
+                "reload_errors": self.watcher.errors if self.watcher else 0,
+            }
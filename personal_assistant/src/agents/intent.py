@@ -0,0 +1,301 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from src.config import INTENT_ROUTING, INTENT_CONFIDENCE_THRESHOLD, INTENT_LLM_FALLBACK
+from src.llm.client import groq_client
+from src.utils import metrics
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE = "knowledge"
+CALENDAR = "calendar"
+FEEDBACK = "feedback"
+INTENTS = (KNOWLEDGE, CALENDAR, FEEDBACK)
+
+# Labeled chat messages the classifier is trained on at startup
+TRAINING_EXAMPLES = {
+    KNOWLEDGE: [
+        "Who is Noushir?",
+        "What does he do?",
+        "Tell me about his experience",
+        "What is his current role?",
+        "What projects has he worked on?",
+        "What is his research about?",
+        "Where did he study?",
+        "What are his skills?",
+        "Does he know PyTorch?",
+        "What programming languages does he use?",
+        "What did he do at Scintilink?",
+        "Has he worked with large language models?",
+        "What are his achievements?",
+        "What's his email address?",
+        "How can I contact him?",
+        "Is he open to new opportunities?",
+        "What is his background in AI?",
+        "Tell me about his publications",
+        "Which companies has he worked for?",
+        "What degree does he have?",
+        "How many years of experience does he have?",
+        "What is he working on now?",
+        "Has he built any agentic systems?",
+        "What awards has he won?",
+        "Does he have experience with AWS?",
+        "Why did he move into AI research?",
+        "What makes him a good fit for an AI engineering role?",
+        "Has he led a team before?",
+        "What frameworks does he use for agents?",
+        "Where is he based?",
+        "Has he worked on scheduling or planning systems?",
+        "What feedback has he received from his managers?",
+        "Has he given talks at conferences?",
+        "What was his role at Perplexity?",
+        "Is he a good programmer?",
+        "hi",
+        "hello, who are you?",
+        "What can you tell me about him?",
+        "Are his papers available online?",
+        "Is his thesis available to read?",
+        "How does he manage his time across projects?",
+    ],
+    CALENDAR: [
+        "Can I book a meeting with him?",
+        "I'd like to schedule a call",
+        "Is he available next Tuesday?",
+        "When is he free for a chat?",
+        "Can we set up a meeting this week?",
+        "Book me a slot on Friday afternoon",
+        "What times are available tomorrow?",
+        "Show me his availability",
+        "I want to arrange an interview with him",
+        "Can I get 30 minutes on his calendar?",
+        "Is Monday at 3pm free?",
+        "Schedule a meeting for next week",
+        "Can we meet on Thursday morning?",
+        "I would like to book an appointment",
+        "Are there any open slots this week?",
+        "Reschedule my meeting to Wednesday",
+        "Cancel my booking please",
+        "Can I have a quick call with him tomorrow?",
+        "Is he free at 10am on Monday?",
+        "Let's set up a video call",
+        "How do I book time with him?",
+        "Find a time for us to talk",
+        "Could we schedule an intro call?",
+        "Book a meeting",
+        "What is his availability next week?",
+        "Can I reserve an hour on Wednesday?",
+        "I'd like to chat with him, when works?",
+        "Is there a slot available on the 12th?",
+        "Put me down for a meeting on Friday",
+        "Can you check his calendar for Tuesday?",
+    ],
+    FEEDBACK: [
+        "Great website, I love the design!",
+        "Your portfolio looks amazing",
+        "The chatbot gave me a wrong answer",
+        "I found a bug on the projects page",
+        "The site is really slow to load",
+        "I have a suggestion for your website",
+        "Here is some feedback: the contact form is broken",
+        "This assistant is really helpful, thanks!",
+        "The answers are too long",
+        "You should add a dark mode",
+        "There's a typo in the about section",
+        "The page doesn't work on my phone",
+        "Nice work on this site",
+        "I don't like the colour scheme",
+        "Feedback: the chat keeps timing out",
+        "The links in the footer are broken",
+        "I'd suggest adding more project screenshots",
+        "This is a cool idea for a portfolio",
+        "The bot didn't understand my question",
+        "Thanks, this was very useful",
+        "Awesome job on the chatbot",
+        "The font is hard to read",
+        "Please improve the mobile layout",
+        "Your assistant is impressive",
+        "The calendar widget is confusing",
+        "I want to leave some feedback",
+        "Love the interactive chat!",
+        "The response was unhelpful",
+        "Images are not loading on the site",
+        "Consider adding a search feature",
+    ],
+}
+
+# Phrasings that decide the intent on their own; each match adds its weight to the log score
+INTENT_RULES = [
+    (CALENDAR, r"\b(book|booking|schedule|reschedule|arrange|set up|setup|reserve|cancel)\b.{0,40}"
+               r"\b(meeting|call|chat|slot|appointment|interview|time|session|hour|minutes)\b", 4.0),
+    (CALENDAR, r"\b(is|are) (he|you|there)\b.{0,20}\b(free|available)\b.{0,30}"
+               r"\b(on|at|this|next|tomorrow|today|monday|tuesday|wednesday|thursday|friday|\d)", 4.0),
+    (CALENDAR, r"\b(when is he|when are you|when can (i|we))\b.{0,20}\b(free|available|meet|talk)\b", 4.0),
+    (CALENDAR, r"\b(his|your) (availability|calendar|schedule)\b", 3.0),
+    (CALENDAR, r"\b(open|free|available) (slots?|times?)\b|\bslots?\b", 3.0),
+    (FEEDBACK, r"^\s*(feedback|suggestion)\b", 4.0),
+    (FEEDBACK, r"\b(leave|give|have|send) (some |my )?(feedback|suggestions?)\b", 4.0),
+    (FEEDBACK, r"\b(your|this|the) (site|website|portfolio|page|chatbot|bot|assistant|chat|app)\b.{0,40}"
+               r"\b(great|amazing|awesome|cool|nice|love|broken|slow|buggy|confusing|wrong|impressive|helpful|"
+               r"unhelpful|down|crash|crashes|not working|doesn't work)\b", 4.0),
+    (FEEDBACK, r"\b(bug|typo|broken link|doesn't load|not loading)\b", 3.0),
+]
+_COMPILED_RULES = [(intent, re.compile(pattern), weight) for intent, pattern, weight in INTENT_RULES]
+
+INTENT_PROMPT = """Classify the visitor's message to a portfolio assistant for Mohammed Noushir. \
+Reply with exactly one word:
+knowledge - a question about Noushir, his work, skills, background or contact details
+calendar - booking, scheduling or availability for a meeting or call with him
+feedback - comments, praise, complaints or suggestions about the site or the assistant"""
+
+def intent_features(text):
+    """Lowercased words and adjacent word pairs of a message"""
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def parse_intent(answer):
+    """Read an intent name from an LLM reply, or None"""
+    match = re.search(r"\b(knowledge|calendar|feedback)\b", (answer or "").lower())
+    return match.group(1) if match else None
+
+class IntentClassifier:
+    """Multinomial naive Bayes over words and word pairs, plus keyword rules
+
+    Trained once from labeled examples; classifying a message is a handful
+    of dictionary lookups. Naive Bayes grows overconfident as evidence piles
+    up, so log scores are divided by the square root of the number of known
+    features before rule weights are added and the scores are normalized
+    into probabilities; a message with little evidence gets a low confidence.
+    """
+
+    def __init__(self, examples=None, alpha=0.5, rules=None):
+        examples = TRAINING_EXAMPLES if examples is None else examples
+        self.intents = [intent for intent in INTENTS if examples.get(intent)]
+        self.rules = _COMPILED_RULES if rules is None else rules
+        total = sum(len(examples[intent]) for intent in self.intents)
+        counts = {intent: Counter() for intent in self.intents}
+        for intent in self.intents:
+            for text in examples[intent]:
+                counts[intent].update(intent_features(text))
+        vocabulary = set().union(*counts.values()) if counts else set()
+
+        self._prior = {}
+        self._log_prob = {}
+        self._unseen = {}
+        for intent in self.intents:
+            denominator = sum(counts[intent].values()) + alpha * (len(vocabulary) + 1)
+            self._prior[intent] = math.log(len(examples[intent]) / total)
+            self._unseen[intent] = math.log(alpha / denominator)
+            for feature, count in counts[intent].items():
+                self._log_prob.setdefault(feature, {})[intent] = math.log((count + alpha) / denominator)
+
+    def predict(self, text):
+        """Return ({intent: probability}, whether a rule matched)"""
+        scores = dict(self._prior)
+        known = 0
+        for feature in intent_features(text):
+            probabilities = self._log_prob.get(feature)
+            if probabilities is None:
+                # Words never seen in training carry no evidence either way
+                continue
+            known += 1
+            for intent in self.intents:
+                scores[intent] += probabilities.get(intent, self._unseen[intent])
+        temperature = max(math.sqrt(known), 1.0)
+        scores = {intent: score / temperature for intent, score in scores.items()}
+        matched = False
+        lowered = text.lower()
+        for intent, pattern, weight in self.rules:
+            if intent in scores and pattern.search(lowered):
+                scores[intent] += weight
+                matched = True
+        top = max(scores.values())
+        exp = {intent: math.exp(score - top) for intent, score in scores.items()}
+        total = sum(exp.values())
+        return {intent: value / total for intent, value in exp.items()}, matched
+
+class IntentRouter:
+    """Chooses the agent for each chat message
+
+    The local classifier decides when its confidence reaches `threshold`.
+    Below that, a message the knowledge agent can answer without the LLM
+    (`answered_locally(text)`, from its fast path or answer caches) goes to
+    it directly; otherwise `classify_with_llm(text)` is asked (if given),
+    and when it fails or returns nothing usable, the local guess is kept.
+    """
+
+    def __init__(self, threshold=0.7, classify_with_llm=None, enabled=True, classifier=None):
+        self.threshold = threshold
+        self.classify_with_llm = classify_with_llm
+        self.enabled = enabled
+        self.classifier = classifier or IntentClassifier()
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._sources = Counter()
+        self._latencies = deque(maxlen=1000)
+
+    def classify(self, text):
+        """Return (intent, confidence) from the local classifier alone"""
+        start = time.perf_counter()
+        probabilities, _ = self.classifier.predict(text)
+        intent = max(probabilities, key=probabilities.get)
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return intent, probabilities[intent]
+
+    async def route(self, text, answered_locally=None):
+        """Return the intent for a chat message, asking the LLM only when unsure"""
+        if not self.enabled:
+            return KNOWLEDGE
+        intent, confidence = self.classify(text)
+        source = "local"
+        unsure = confidence < self.threshold
+        if unsure and answered_locally is not None and answered_locally(text):
+            # A cached answer costs microseconds; classifying with the LLM costs a round trip
+            intent, source = KNOWLEDGE, "knowledge_cache"
+        elif unsure and self.classify_with_llm is not None:
+            try:
+                llm_intent = parse_intent(await self.classify_with_llm(text))
+            except Exception as e:
+                logger.warning(f"LLM intent fallback failed, using local guess {intent}: {e}")
+                llm_intent = None
+            if llm_intent is not None:
+                intent, source = llm_intent, "llm"
+            else:
+                source = "local_fallback"
+        with self._lock:
+            self._counts[intent] += 1
+            self._sources[source] += 1
+        return intent
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+                "routed": dict(self._counts),
+                "sources": dict(self._sources),
+                "classify_p50_us": round(latencies[len(latencies) // 2] * 1e6, 1) if latencies else 0.0,
+                "classify_p95_us": round(latencies[int(len(latencies) * 0.95)] * 1e6, 1) if latencies else 0.0,
+            }
+
+async def classify_with_llm(text):
+    """Ask the LLM for the intent of a message the local classifier is unsure about"""
+    return await groq_client.generate_response(
+        [{"role": "user", "content": text}],
+        INTENT_PROMPT,
+        agent="IntentRouter",
+        validate=lambda answer: parse_intent(answer) is not None,
+    )
+
+# Create singleton instance
+intent_router = IntentRouter(
+    INTENT_CONFIDENCE_THRESHOLD,
+    classify_with_llm if INTENT_LLM_FALLBACK else None,
+    enabled=INTENT_ROUTING,
+)
+metrics.register("intent_router", intent_router.stats)
@@ -0,0 +1,269 @@
+import asyncio
+import json
+import math
+from src.agents.base import BaseAgent
+from src.llm.client import CircuitOpenError
+from src.agents.knowledge.cache import AnswerCache, profile_fingerprint
+from src.agents.knowledge.semantic_cache import SemanticCache
+from src.agents.knowledge.degraded import DegradedResponder
+from src.agents.knowledge.fast_path import FastPathResponder
+from src.agents.knowledge.retrieval import ProfileRetriever
+from src.agents.knowledge.cv_index import CVIndex
+from src.agents.knowledge.conversation import ConversationStore, SUMMARY_PROMPT, is_follow_up
+from src.agents.knowledge.pregenerate import AnswerPregenerator
+from src.config import (
+    PROFILE_PATH, ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL, SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD,
+    KNOWLEDGE_PROMPT_TOKEN_BUDGET, KNOWLEDGE_RETRIEVAL_TOP_K, KNOWLEDGE_FAST_PATH, PROFILE_RELOAD_INTERVAL,
+    CV_INDEX_PATH, CV_RETRIEVAL_TOP_K, CONVERSATION_MAX_SESSIONS, CONVERSATION_MAX_TURNS,
+    CONVERSATION_COMPACT_TOKENS, CONVERSATION_KEEP_TURNS, CONVERSATION_SUMMARY_TOKENS,
+    ANSWER_PREGEN_QUESTIONS_PATH, ANSWER_PREGEN_TOP_N, ANSWER_PREGEN_RATE_PER_MINUTE
+)
+from src.llm.scheduler import BACKGROUND
+from src.llm.tokens import fit_profile_to_budget
+from src.utils import metrics
+from src.utils.file_watcher import FileWatcher
+
+class KnowledgeAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(
+            name="KnowledgeAgent",
+            description="Answers questions about Mohammed Noushir from profile data"
+        )
+        self.prompt_token_budget = KNOWLEDGE_PROMPT_TOKEN_BUDGET
+        self.fast_path_enabled = KNOWLEDGE_FAST_PATH
+        # CV chunks built offline by ingest_cv.py, memory-mapped rather than parsed
+        self.cv_index = CVIndex(CV_INDEX_PATH, PROFILE_RELOAD_INTERVAL)
+        self.cv_top_k = CV_RETRIEVAL_TOP_K
+        metrics.register("cv_index", self.cv_index.stats)
+        # Per-session chat history, compacted into a summary as it grows
+        self.conversations = ConversationStore(
+            CONVERSATION_MAX_SESSIONS, CONVERSATION_MAX_TURNS, CONVERSATION_COMPACT_TOKENS,
+            CONVERSATION_KEEP_TURNS, CONVERSATION_SUMMARY_TOKENS, summarize=self._summarize_turns,
+        )
+        self._compactions = set()
+        metrics.register("conversations", self.conversations.stats)
+        self.answer_cache = AnswerCache(ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL)
+        self.semantic_cache = SemanticCache(SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_THRESHOLD, ANSWER_CACHE_TTL)
+        metrics.register("answer_cache", self.answer_cache.stats)
+        metrics.register("semantic_cache", self.semantic_cache.stats)
+        # Answers to frequent questions generated ahead of time; kept until the profile changes
+        self.pregenerator = AnswerPregenerator(
+            self, ANSWER_PREGEN_QUESTIONS_PATH, ANSWER_PREGEN_TOP_N, ANSWER_PREGEN_RATE_PER_MINUTE
+        )
+        self.answer_store = AnswerCache(ANSWER_PREGEN_TOP_N * 2, math.inf)
+        # Paraphrases of the frequent questions; "Who is he?" has no terms to embed, hence both
+        self.answer_store_index = SemanticCache(ANSWER_PREGEN_TOP_N * 2, SEMANTIC_CACHE_THRESHOLD, math.inf)
+        metrics.register("answer_pregeneration", self.pregenerator.stats)
+        metrics.register("answer_store", self.answer_store.stats)
+        # Picks up edits to profile.json without a restart (None when there is no file to watch)
+        self.profile_watcher = FileWatcher(PROFILE_PATH, PROFILE_RELOAD_INTERVAL)
+        self._apply_profile(self._load_profile())
+        metrics.register("degraded_responder", lambda: self.degraded.stats())
+        metrics.register("profile_retrieval", lambda: self.retriever.stats())
+        metrics.register("fast_path", lambda: self.fast_path.stats())
+        metrics.register("profile", lambda: self.profile_watcher.stats() if self.profile_watcher else {})
+    
+    def _load_profile(self):
+        """Load user profile from JSON file"""
+        try:
+            return self.profile_watcher.load()
+        except Exception as e:
+            print(f"Error loading profile: {e}")
+            return {}
+    
+    def _apply_profile(self, profile_data):
+        """Switch to a profile, compiling everything derived from it once"""
+        self.profile_data = profile_data
+        # A new hash also invalidates answers cached for the old profile
+        self.profile_hash = profile_fingerprint([profile_data, self.cv_index.version])
+        self.system_prompt = self._compile_system_prompt()
+        # Templated answers served while the LLM circuit is open
+        self.degraded = DegradedResponder(profile_data)
+        # Templated answers for structured questions, served without the LLM
+        self.fast_path = FastPathResponder(profile_data)
+        # BM25 index over profile chunks, so questions carry only relevant context
+        self.retriever = ProfileRetriever(profile_data, KNOWLEDGE_RETRIEVAL_TOP_K)
+        # Answer the frequent questions again for the new profile
+        self.pregenerator.schedule()
+    
+    def _refresh_profile(self):
+        """Reload the profile or the CV index if either changed on disk"""
+        cv_changed = self.cv_index.refresh()
+        profile_data = self.profile_watcher.poll() if self.profile_watcher else None
+        if profile_data is not None:
+            self._apply_profile(profile_data)
+        elif cv_changed:
+            self.profile_hash = profile_fingerprint([self.profile_data, self.cv_index.version])
+            self.pregenerator.schedule()
+    
+    def _render_system_prompt(self, profile_data):
+        """Create system prompt with profile data"""
+        return f"""You are a helpful assistant representing Mohammed Noushir.
+        Answer questions based on this profile information only:
+        {json.dumps(profile_data, separators=(",", ":"), ensure_ascii=False)}
+        
+        If you don't know the answer, say so politely.
+        """
+    
+    def _compile_system_prompt(self):
+        """Render the system prompt, trimming profile sections to fit the token budget"""
+        prompt, _ = fit_profile_to_budget(self.profile_data, self.prompt_token_budget, self._render_system_prompt)
+        return prompt
+    
+    def _build_system_prompt(self, query=None):
+        """Return the system prompt, narrowed to the profile and CV chunks relevant to `query`"""
+        profile_data = self.retriever.retrieve(query) if query else None
+        excerpts = self.cv_index.search(query, self.cv_top_k) if query else []
+        if profile_data is None and not excerpts:
+            return self.system_prompt
+        profile_data = dict(self.profile_data if profile_data is None else profile_data)
+        if excerpts:
+            profile_data["cvExcerpts"] = excerpts
+        prompt, _ = fit_profile_to_budget(profile_data, self.prompt_token_budget, self._render_system_prompt)
+        return prompt
+    
+    def _follow_up(self, query, session_id):
+        """Whether the question needs the session's earlier turns to make sense"""
+        conversation = self.conversations.get(session_id)
+        return bool(conversation and conversation.turns) and is_follow_up(query)
+    
+    def _retrieval_query(self, query, session_id, follow_up):
+        """Search text for retrieval; follow-ups borrow the previous question's topic"""
+        if not follow_up:
+            return query
+        return f"{self.conversations.get(session_id).last_question()} {query}"
+    
+    def _remember(self, session_id, query, answer):
+        """Record a turn, compacting the session in the background when it grows too long"""
+        if self.conversations.record(session_id, query, answer):
+            task = asyncio.create_task(self.conversations.compact(session_id))
+            self._compactions.add(task)
+            task.add_done_callback(self._compactions.discard)
+    
+    async def _summarize_turns(self, summary, turns):
+        """Summarize earlier turns with a background-priority LLM call"""
+        transcript = [f"Earlier summary: {summary}"] if summary else []
+        transcript += [f"Visitor: {question}\nAssistant: {answer}" for question, answer in turns]
+        words = max(self.conversations.summary_tokens * 3 // 4, 20)
+        return await self.generate_llm_response(
+            [{"role": "user", "content": "\n\n".join(transcript)}],
+            SUMMARY_PROMPT.format(words=words),
+            priority=BACKGROUND,
+        )
+    
+    def _fast_answer(self, query):
+        """Answer a structured profile question from templates, or return None"""
+        return self.fast_path.answer(query) if self.fast_path_enabled else None
+    
+    def _cached_answer(self, query):
+        """Look up a pre-generated answer, an exact repeat, then a paraphrase of an answered question"""
+        cached = self.answer_store.get(query, self.profile_hash)
+        if cached is None:
+            cached = self.answer_store_index.get(query, self.profile_hash)
+        if cached is None:
+            cached = self.answer_cache.get(query, self.profile_hash)
+        if cached is None:
+            cached = self.semantic_cache.get(query, self.profile_hash)
+            if cached is not None:
+                # Promote paraphrase hits so the next repeat is an exact match
+                self.answer_cache.set(query, self.profile_hash, cached)
+        return cached
+    
+    def can_answer_locally(self, query):
+        """Whether a question has a templated or cached answer, so routing it needs no LLM call"""
+        self._refresh_profile()
+        if self.fast_path_enabled and self.fast_path.match(query) is not None:
+            return True
+        caches = (self.answer_store, self.answer_store_index, self.answer_cache, self.semantic_cache)
+        return any(cache.contains(query, self.profile_hash) for cache in caches)
+    
+    def _store_answer(self, query, answer, profile_hash):
+        """Remember a generated answer in both caches, unless the profile changed while generating it"""
+        if profile_hash != self.profile_hash:
+            return
+        self.answer_cache.set(query, profile_hash, answer)
+        self.semantic_cache.set(query, profile_hash, answer)
+    
+    async def pregenerate(self, query):
+        """Answer a frequent question ahead of time at background priority
+
+        Returns "fast_path" if no LLM call is needed, "generated" once the
+        answer is in the store, or None if the profile changed meanwhile.
+        """
+        if self.fast_path_enabled and self.fast_path.match(query) is not None:
+            return "fast_path"
+        profile_hash = self.profile_hash
+        response = await self.generate_llm_response(
+            [{"role": "user", "content": query}], self._build_system_prompt(query), priority=BACKGROUND
+        )
+        if profile_hash != self.profile_hash:
+            return None
+        self.answer_store.set(query, profile_hash, response)
+        self.answer_store_index.set(query, profile_hash, response)
+        return "generated"
+    
+    async def process(self, query, session_id=None):
+        """Process a knowledge query, continuing the session's conversation if one is given"""
+        self._refresh_profile()
+        follow_up = self._follow_up(query, session_id)
+        
+        # Self-contained questions can be answered without the conversation
+        if not follow_up:
+            # Contact, skills, education and roles questions need no LLM call
+            answer = self._fast_answer(query)
+            
+            # Serve pre-generated and repeat questions from the answer caches
+            if answer is None:
+                self.pregenerator.record(query)
+                answer = self._cached_answer(query)
+            if answer is not None:
+                self._remember(session_id, query, answer)
+                return answer
+        
+        system_prompt = self._build_system_prompt(self._retrieval_query(query, session_id, follow_up))
+        # The answer belongs to the profile it was generated from, even if it reloads meanwhile
+        profile_hash = self.profile_hash
+        
+        # Generate response
+        messages = self.conversations.history(session_id) + [{"role": "user", "content": query}]
+        try:
+            response = await self.generate_llm_response(messages, system_prompt)
+        except CircuitOpenError:
+            return self.degraded.answer(query)
+        
+        # Answers that depend on earlier turns are not reusable for other visitors
+        if not follow_up:
+            self._store_answer(query, response, profile_hash)
+        self._remember(session_id, query, response)
+        return response
+    
+    async def process_stream(self, query, session_id=None):
+        """Process a knowledge query, yielding the answer as it is generated"""
+        self._refresh_profile()
+        follow_up = self._follow_up(query, session_id)
+        cached = None if follow_up else self._fast_answer(query)
+        if cached is None and not follow_up:
+            self.pregenerator.record(query)
+            cached = self._cached_answer(query)
+        if cached is not None:
+            self._remember(session_id, query, cached)
+            yield cached
+            return
+        
+        system_prompt = self._build_system_prompt(self._retrieval_query(query, session_id, follow_up))
+        profile_hash = self.profile_hash
+        messages = self.conversations.history(session_id) + [{"role": "user", "content": query}]
+        parts = []
+        try:
+            async for token in self.stream_llm_response(messages, system_prompt):
+                parts.append(token)
+                yield token
+        except CircuitOpenError:
+            # Raised before any token is produced
+            yield self.degraded.answer(query)
+            return
+        
+        answer = "".join(parts)
+        if not follow_up:
+            self._store_answer(query, answer, profile_hash)
+        self._remember(session_id, query, answer)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+def normalize_query(query):
+    """Normalize a question so trivial variations share a cache entry"""
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+def profile_fingerprint(profile_data):
+    """Stable hash of the loaded profile, used to scope cached answers"""
+    serialized = json.dumps(profile_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class AnswerCache:
+    """Bounded LRU cache of answers with a time-to-live
+
+    Entries are keyed by the normalized query and the profile fingerprint.
+    Seeing a new fingerprint drops every entry built from the old profile.
+    """
+
+    def __init__(self, max_size=256, ttl_seconds=3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._profile_hash = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _check_profile(self, profile_hash):
+        if profile_hash != self._profile_hash:
+            self._entries.clear()
+            self._profile_hash = profile_hash
+
+    def get(self, query, profile_hash):
+        """Return the cached answer for a query, or None"""
+        key = normalize_query(query)
+        with self._lock:
+            self._check_profile(profile_hash)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            answer, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def contains(self, query, profile_hash):
+        """Whether a live answer is cached, without counting a lookup or refreshing its recency"""
+        with self._lock:
+            if profile_hash != self._profile_hash:
+                return False
+            entry = self._entries.get(normalize_query(query))
+            return entry is not None and time.monotonic() < entry[1]
+
+    def set(self, query, profile_hash, answer):
+        """Store an answer, evicting the least recently used entry if full"""
+        if self.max_size <= 0 or not answer:
+            return
+        key = normalize_query(query)
+        with self._lock:
+            self._check_profile(profile_hash)
+            self._entries[key] = (answer, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached answers"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
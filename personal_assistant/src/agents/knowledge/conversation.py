@@ -0,0 +1,167 @@
+import logging
+import re
+from collections import OrderedDict, deque
+from src.llm.tokens import estimate_message_tokens, estimate_tokens
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Words that only make sense with the earlier conversation ("what about that?")
+FOLLOW_UP_WORDS = {
+    "it", "its", "that", "this", "those", "these", "there", "then", "they", "them",
+    "more", "else", "also", "other", "another", "same", "former", "latter", "previous",
+}
+_FOLLOW_UP_OPENERS = ("and ", "what about", "how about", "tell me more")
+
+SUMMARY_PROMPT = """Summarize this conversation between a visitor and the assistant representing \
+Mohammed Noushir in at most {words} words. Keep the facts already given and what the visitor is \
+interested in. Reply with the summary only."""
+
+def is_follow_up(query):
+    """Whether a question leans on earlier turns and cannot be answered on its own"""
+    text = query.lower().strip()
+    words = set(re.findall(r"[a-z]+", text))
+    return text.startswith(_FOLLOW_UP_OPENERS) or bool(words & FOLLOW_UP_WORDS)
+
+def extractive_summary(summary, turns, max_tokens):
+    """Fold turns into the summary without an LLM: questions and first sentences of answers"""
+    parts = [summary] if summary else []
+    for question, answer in turns:
+        first_sentence = re.split(r"(?<=[.!?])\s", answer.strip(), maxsplit=1)[0]
+        parts.append(f"Visitor asked: {question.strip()} Answer: {first_sentence}")
+    # Drop the oldest parts first until the summary fits
+    while len(parts) > 1 and estimate_tokens(" ".join(parts)) > max_tokens:
+        parts.pop(0)
+    return " ".join(parts)
+
+class Conversation:
+    """One session: a running summary plus the most recent turns verbatim"""
+
+    def __init__(self, max_turns):
+        self.summary = ""
+        self.turns = deque(maxlen=max_turns)
+        self.compacting = False
+        self.compactions = 0
+
+    def history_tokens(self):
+        return sum(estimate_tokens(q) + estimate_tokens(a) for q, a in self.turns)
+
+    def messages(self):
+        """Chat messages carrying the conversation so far"""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        for question, answer in self.turns:
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def last_question(self):
+        return self.turns[-1][0] if self.turns else None
+
+class ConversationStore:
+    """Bounded, session-keyed chat history with compaction
+
+    Sessions live in an LRU of at most `max_sessions`; each keeps at most
+    `max_turns` turns. Once a session's verbatim turns pass
+    `compact_threshold` estimated tokens, all but the last `keep_turns` are
+    folded into a running summary of at most `summary_tokens`, so the
+    history sent with each question stays roughly constant in size however
+    long the conversation runs. `summarize(summary, turns)` produces the
+    new summary (typically an LLM call); if it fails, an extractive summary
+    is used instead.
+    """
+
+    def __init__(self, max_sessions=1000, max_turns=20, compact_threshold=800, keep_turns=3,
+                 summary_tokens=150, summarize=None):
+        self.max_sessions = max_sessions
+        self.max_turns = max_turns
+        self.compact_threshold = compact_threshold
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.summarize = summarize
+        self._sessions = OrderedDict()
+        self.evictions = 0
+        self.compactions = 0
+        self.summary_fallbacks = 0
+        self._history_sizes = deque(maxlen=1000)
+
+    @property
+    def enabled(self):
+        return self.max_sessions > 0 and self.max_turns > 0
+
+    def get(self, session_id):
+        """Return the session's conversation (marking it recently used), or None"""
+        if not session_id or not self.enabled:
+            return None
+        conversation = self._sessions.get(session_id)
+        if conversation is not None:
+            self._sessions.move_to_end(session_id)
+        return conversation
+
+    def history(self, session_id):
+        """Chat messages to send ahead of the session's next question"""
+        conversation = self.get(session_id)
+        if conversation is None:
+            return []
+        messages = conversation.messages()
+        self._history_sizes.append(estimate_message_tokens(messages))
+        return messages
+
+    def record(self, session_id, question, answer):
+        """Append a turn; returns True when the session is due for compaction"""
+        if not session_id or not self.enabled:
+            return False
+        conversation = self.get(session_id)
+        if conversation is None:
+            conversation = self._sessions[session_id] = Conversation(self.max_turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        conversation.turns.append((question, answer))
+        return (
+            not conversation.compacting
+            and len(conversation.turns) > self.keep_turns
+            and conversation.history_tokens() > self.compact_threshold
+        )
+
+    async def compact(self, session_id):
+        """Fold all but the most recent turns of a session into its summary"""
+        conversation = self._sessions.get(session_id)
+        if conversation is None or conversation.compacting:
+            return
+        folded = list(conversation.turns)[:-self.keep_turns] if self.keep_turns else list(conversation.turns)
+        if not folded:
+            return
+        conversation.compacting = True
+        try:
+            summary = None
+            if self.summarize is not None:
+                try:
+                    summary = await self.summarize(conversation.summary, folded)
+                except Exception as e:
+                    logger.warning(f"Conversation summary failed, using extractive summary: {e}")
+            if not summary or estimate_tokens(summary) > self.summary_tokens * 2:
+                if self.summarize is not None:
+                    self.summary_fallbacks += 1
+                summary = extractive_summary(conversation.summary, folded, self.summary_tokens)
+            conversation.summary = summary
+            # Turns added while summarizing stay; only the folded ones are dropped
+            while conversation.turns and any(conversation.turns[0] is turn for turn in folded):
+                conversation.turns.popleft()
+            conversation.compactions += 1
+            self.compactions += 1
+        finally:
+            conversation.compacting = False
+
+    def stats(self):
+        sizes = sorted(self._history_sizes)
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "evictions": self.evictions,
+            "compactions": self.compactions,
+            "summary_fallbacks": self.summary_fallbacks,
+            "history_tokens_p50": sizes[len(sizes) // 2] if sizes else None,
+            "history_tokens_max": sizes[-1] if sizes else None,
+        }
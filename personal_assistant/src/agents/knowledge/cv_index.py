@@ -0,0 +1,445 @@
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from src.agents.knowledge.semantic_cache import question_terms
+from src.llm.tokens import estimate_tokens
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CVIDX\x00\x01\x00"
+SOURCE_EXTENSIONS = (".pdf", ".txt", ".md")
+
+# One row per chunk; text and forward entries are byte/row ranges into shared arrays
+CHUNK_DTYPE = np.dtype([
+    ("digest", "S32"),
+    ("source", "<u4"),
+    ("length", "<u4"),
+    ("text_start", "<u8"),
+    ("text_end", "<u8"),
+    ("forward_start", "<u8"),
+    ("forward_end", "<u8"),
+])
+# (chunk, frequency) in postings lists and (term, frequency) in per-chunk forward lists
+ENTRY_DTYPE = np.dtype([("id", "<u4"), ("tf", "<u4")])
+
+_ALIGN = 8
+
+def extract_text(path):
+    """Return the plain text of a CV document (.pdf needs the optional `pypdf` package)"""
+    if path.lower().endswith(".pdf"):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise RuntimeError(f"Reading {path} needs the 'pypdf' package (pip install pypdf)")
+        return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+def expand_sources(sources):
+    """Resolve files and directories of CV documents into a sorted file list"""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(
+                os.path.join(source, name) for name in sorted(os.listdir(source))
+                if name.lower().endswith(SOURCE_EXTENSIONS)
+            )
+        elif os.path.isfile(source):
+            paths.append(source)
+        else:
+            logger.warning(f"CV source not found: {source}")
+    return paths
+
+# Section names that start a new chunk; any other heading must be written in capitals
+SECTION_HEADINGS = frozenset([
+    "summary", "profile", "personal profile", "professional summary", "personal statement", "about me", "objective",
+    "education", "experience", "work experience", "professional experience", "employment", "employment history",
+    "projects", "personal projects", "research", "publications", "achievements", "awards", "honours", "honors",
+    "certifications", "certificates", "courses", "training", "skills", "technical skills", "skills & interests",
+    "skills and interests", "interests", "languages", "leadership", "volunteering", "activities",
+    "extracurricular activities", "references",
+])
+
+def _is_heading(line):
+    """Whether a line is a CV section heading ("Experience", "WORK HISTORY"), not an employer or role"""
+    line = line.rstrip(":").strip()
+    if not 0 < len(line.split()) <= 4 or any(c.isdigit() or c in "•.,:@/|" for c in line):
+        return False
+    return " ".join(line.lower().split()) in SECTION_HEADINGS or line.isupper()
+
+def _entries(units):
+    """Group lines into entries: header lines (employer, role, dates) and their bullets"""
+    entries = []
+    for unit in units:
+        if unit.startswith("•") and entries:
+            entries[-1][1].append(unit)
+        elif entries and not entries[-1][1]:
+            entries[-1][0].append(unit)
+        else:
+            entries.append(([], [unit]) if unit.startswith("•") else ([unit], []))
+    return entries
+
+def chunk_text(text, chunk_tokens=120):
+    """Split CV text into chunks of roughly `chunk_tokens`, each led by its section heading
+
+    Wrapped lines are joined back into their bullet point and short entries
+    share a chunk. A long entry is split between its bullets, repeating the
+    entry's header lines in every piece, and no chunk straddles two sections.
+    """
+    # Undo end-of-line hyphenation from PDF extraction ("informa-\ntion")
+    text = re.sub(r"-\n(?=[a-z])", "", text)
+    units, heading = [], None
+    sections = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        # Skip blank lines and bare page numbers
+        if not line or line.isdigit():
+            continue
+        if _is_heading(line):
+            if units:
+                sections.append((heading, units))
+            heading, units = line, []
+        elif units and not line.startswith("•") and units[-1].startswith("•") and not units[-1].endswith("."):
+            units[-1] = f"{units[-1]} {line}"
+        else:
+            units.append(line)
+    if units:
+        sections.append((heading, units))
+
+    chunks = []
+    for heading, units in sections:
+        prefix = [heading] if heading else []
+        batch, size = [], 0
+        for header, bullets in _entries(units):
+            tokens = sum(estimate_tokens(line) for line in header + bullets)
+            if batch and size + tokens > chunk_tokens:
+                chunks.append("\n".join(prefix + batch))
+                batch, size = [], 0
+            if tokens <= chunk_tokens:
+                batch.extend(header + bullets)
+                size += tokens
+                continue
+            header_tokens = sum(estimate_tokens(line) for line in header)
+            piece, piece_size = [], header_tokens
+            for bullet in bullets:
+                bullet_tokens = estimate_tokens(bullet)
+                if piece and piece_size + bullet_tokens > chunk_tokens:
+                    chunks.append("\n".join(prefix + header + piece))
+                    piece, piece_size = [], header_tokens
+                piece.append(bullet)
+                piece_size += bullet_tokens
+            chunks.append("\n".join(prefix + header + piece))
+        if batch:
+            chunks.append("\n".join(prefix + batch))
+    return chunks
+
+def _digest(text):
+    # Hex rather than raw bytes: numpy strips trailing NULs from fixed-width byte strings
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32].encode("ascii")
+
+class CVIndex:
+    """Read-only BM25 index over CV chunks, memory-mapped from disk
+
+    The file holds a small JSON header followed by flat arrays (chunk table,
+    sorted term dictionary, postings, per-chunk forward lists and the chunk
+    text), which are viewed in place with numpy, so opening an index costs a
+    single mmap regardless of its size. A missing file gives an empty index.
+    """
+
+    def __init__(self, path=None, check_interval=2.0, k1=1.5, b=0.75):
+        self.path = path
+        self.check_interval = check_interval
+        self.k1 = k1
+        self.b = b
+        self._signature = None
+        self._next_check = 0.0
+        self._close()
+        if path:
+            self._open()
+
+    def _close(self):
+        self.sources = []
+        self.chunk_tokens = None
+        self.chunks = np.zeros(0, dtype=CHUNK_DTYPE)
+        self.term_count = 0
+        self.average_length = 0.0
+        self.version = None
+        self._mmap = None
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _open(self):
+        self._signature = self._stat()
+        if self._signature is None:
+            return
+        try:
+            with open(self.path, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map(mapped)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable CV index at {self.path}: {e}")
+            self._close()
+
+    def _map(self, mapped):
+        if mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a CV index file")
+        (header_length,) = struct.unpack_from("<I", mapped, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mapped[start:start + header_length])
+
+        def view(name, dtype):
+            offset, count = header["arrays"][name]
+            return np.frombuffer(mapped, dtype=dtype, count=count, offset=offset)
+
+        self.sources = header["sources"]
+        self.chunk_tokens = header["chunk_tokens"]
+        self.term_count = header["term_count"]
+        self.average_length = header["average_length"]
+        self.version = header["version"]
+        self.chunks = view("chunks", CHUNK_DTYPE)
+        self._term_offsets = view("term_offsets", "<u8")
+        self._posting_offsets = view("posting_offsets", "<u8")
+        self._idf = view("idf", "<f4")
+        self._postings = view("postings", ENTRY_DTYPE)
+        self._forward = view("forward", ENTRY_DTYPE)
+        self._text = view("text", np.uint8)
+        self._terms = view("terms", np.uint8)
+        self._mmap = mapped
+
+    def refresh(self):
+        """Re-map the index if the file was rebuilt; returns True when it changed"""
+        if not self.path or self.check_interval < 0:
+            return False
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        if self._stat() == self._signature:
+            return False
+        version = self.version
+        self._close()
+        self._open()
+        if self.version != version:
+            logger.info(f"CV index reloaded from {self.path} ({len(self.chunks)} chunks)")
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def term(self, term_id):
+        start, end = self._term_offsets[term_id], self._term_offsets[term_id + 1]
+        return self._terms[start:end].tobytes().decode("utf-8")
+
+    def _term_id(self, term):
+        """Binary search the sorted term dictionary"""
+        target = term.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = self._term_offsets[middle], self._term_offsets[middle + 1]
+            probe = self._terms[start:end].tobytes()
+            if probe < target:
+                low = middle + 1
+            elif probe > target:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def text(self, chunk_id):
+        row = self.chunks[chunk_id]
+        return self._text[row["text_start"]:row["text_end"]].tobytes().decode("utf-8")
+
+    def vocabulary(self):
+        """Decode the whole term dictionary at once, indexed by term id"""
+        blob = self._terms.tobytes() if self.term_count else b""
+        offsets = self._term_offsets.tolist() if self.term_count else [0]
+        return [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def forward_terms(self, chunk_id, vocabulary=None):
+        """Return {term: frequency} for a chunk, as stored at indexing time"""
+        row = self.chunks[chunk_id]
+        entries = self._forward[row["forward_start"]:row["forward_end"]].tolist()
+        if vocabulary is None:
+            return {self.term(term_id): tf for term_id, tf in entries}
+        return {vocabulary[term_id]: tf for term_id, tf in entries}
+
+    def search(self, query, k=3):
+        """Return the text of up to `k` chunks matching `query`, best first"""
+        if not len(self.chunks) or k <= 0:
+            return []
+        scores = defaultdict(float)
+        lengths = self.chunks["length"]
+        for term in set(question_terms(query)):
+            term_id = self._term_id(term)
+            if term_id is None:
+                continue
+            idf = float(self._idf[term_id])
+            start, end = self._posting_offsets[term_id], self._posting_offsets[term_id + 1]
+            for entry in self._postings[start:end]:
+                chunk_id, tf = int(entry["id"]), int(entry["tf"])
+                norm = self.k1 * (1 - self.b + self.b * lengths[chunk_id] / self.average_length)
+                scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: -item[1])[:k]
+        return [self.text(chunk_id) for chunk_id, _ in best]
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "chunks": len(self.chunks),
+            "terms": self.term_count,
+            "sources": [source["path"] for source in self.sources],
+            "version": self.version,
+        }
+
+def _write_index(path, sources, chunks, forward, chunk_tokens):
+    """Serialize chunks and their term frequencies; written atomically via a temp file"""
+    vocabulary = sorted({term for terms in forward for term in terms}, key=lambda term: term.encode("utf-8"))
+    term_ids = {term: i for i, term in enumerate(vocabulary)}
+    postings = defaultdict(list)
+    forward_entries, chunk_rows, text_parts = [], [], []
+    text_offset = 0
+    for chunk_id, ((source, text, digest), terms) in enumerate(zip(chunks, forward)):
+        encoded = text.encode("utf-8")
+        entries = sorted((term_ids[term], tf) for term, tf in terms.items())
+        for term_id, tf in entries:
+            postings[term_id].append((chunk_id, tf))
+        chunk_rows.append((
+            digest, source, sum(terms.values()), text_offset, text_offset + len(encoded),
+            len(forward_entries), len(forward_entries) + len(entries),
+        ))
+        forward_entries.extend(entries)
+        text_parts.append(encoded)
+        text_offset += len(encoded)
+
+    count = len(chunks)
+    term_bytes = [term.encode("utf-8") for term in vocabulary]
+    posting_rows = [entry for term_id in range(len(vocabulary)) for entry in postings[term_id]]
+    arrays = {
+        "chunks": np.array(chunk_rows, dtype=CHUNK_DTYPE),
+        "term_offsets": np.cumsum([0] + [len(term) for term in term_bytes], dtype="<u8"),
+        "posting_offsets": np.cumsum([0] + [len(postings[i]) for i in range(len(vocabulary))], dtype="<u8"),
+        "idf": np.array([
+            math.log(1 + (count - len(postings[i]) + 0.5) / (len(postings[i]) + 0.5)) for i in range(len(vocabulary))
+        ], dtype="<f4"),
+        "postings": np.array(posting_rows, dtype=ENTRY_DTYPE),
+        "forward": np.array(forward_entries, dtype=ENTRY_DTYPE),
+        "text": np.frombuffer(b"".join(text_parts), dtype=np.uint8),
+        "terms": np.frombuffer(b"".join(term_bytes), dtype=np.uint8),
+    }
+    version = hashlib.sha256(b"".join(digest for _, _, digest in chunks)).hexdigest()[:16]
+    header = {
+        "version": version,
+        "sources": sources,
+        "chunk_tokens": chunk_tokens,
+        "term_count": len(vocabulary),
+        "average_length": sum(row[2] for row in chunk_rows) / count if count else 0.0,
+        "arrays": {},
+    }
+
+    # Array offsets depend on the header length, which depends on the offsets' digits;
+    # reserve generous padding so one pass is enough
+    header["arrays"] = {name: [0, len(array)] for name, array in arrays.items()}
+    reserved = len(json.dumps(header)) + 32 * len(arrays) + 64
+    offset = len(MAGIC) + 4 + reserved
+    for name, array in arrays.items():
+        offset += -offset % _ALIGN
+        header["arrays"][name] = [offset, len(array)]
+        offset += array.nbytes
+    encoded_header = json.dumps(header).encode("utf-8").ljust(reserved)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(encoded_header)))
+        file.write(encoded_header)
+        for name, array in arrays.items():
+            file.write(b"\0" * (header["arrays"][name][0] - file.tell()))
+            file.write(array.tobytes())
+    os.replace(temp_path, path)
+    return version
+
+def _file_digest(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def build_index(sources, path, chunk_tokens=120):
+    """Ingest CV documents into the index at `path`, re-indexing only what changed
+
+    A document whose file hash matches the existing index keeps its chunks
+    without being extracted or chunked again. In a changed document, chunks
+    are identified by a hash of their text, and those already indexed reuse
+    their stored term frequencies. The file is left untouched when nothing
+    changed.
+
+    Returns:
+        Report dict with the number of chunks reused, indexed and removed
+    """
+    files = expand_sources(sources)
+    previous = CVIndex(path, check_interval=-1)
+    vocabulary = previous.vocabulary()
+    same_chunking = previous.chunk_tokens == chunk_tokens
+    prior_sources = {source["path"]: source for source in previous.sources} if same_chunking else {}
+    known = {row["digest"]: i for i, row in enumerate(previous.chunks)} if same_chunking else {}
+
+    chunks, forward, source_rows = [], [], []
+    reused = unchanged_documents = 0
+    for file_index, file_path in enumerate(files):
+        digest = _file_digest(file_path)
+        prior = prior_sources.get(file_path)
+        start = len(chunks)
+        if prior is not None and prior["digest"] == digest:
+            # Unchanged document: copy its chunks without extracting or chunking again
+            for chunk_id in range(prior["start"], prior["end"]):
+                chunks.append((file_index, previous.text(chunk_id), previous.chunks[chunk_id]["digest"]))
+                forward.append(previous.forward_terms(chunk_id, vocabulary))
+            reused += prior["end"] - prior["start"]
+            unchanged_documents += 1
+        else:
+            text = extract_text(file_path)
+            if not text.strip():
+                logger.warning(f"CV source is empty: {file_path}")
+            for chunk in chunk_text(text, chunk_tokens):
+                chunk_digest = _digest(chunk)
+                chunk_id = known.get(chunk_digest)
+                if chunk_id is not None:
+                    forward.append(previous.forward_terms(chunk_id, vocabulary))
+                    reused += 1
+                else:
+                    forward.append(dict(Counter(question_terms(chunk))))
+                chunks.append((file_index, chunk, chunk_digest))
+        source_rows.append({"path": file_path, "digest": digest, "start": start, "end": len(chunks)})
+
+    current = {digest for _, _, digest in chunks}
+    report = {
+        "sources": files,
+        "unchanged_documents": unchanged_documents,
+        "chunks": len(chunks),
+        "reused": reused,
+        "indexed": len(chunks) - reused,
+        "removed": sum(1 for digest in known if digest not in current),
+    }
+    if same_chunking and previous.sources == source_rows:
+        report["written"] = False
+        report["version"] = previous.version
+        return report
+    report["version"] = _write_index(path, source_rows, chunks, forward, chunk_tokens)
+    report["written"] = True
+    return report
@@ -0,0 +1,110 @@
+import re
+
+# Intent name and the words that signal it, checked in order
+INTENT_KEYWORDS = [
+    ("contact", {"contact", "email", "mail", "phone", "call", "reach", "linkedin", "github", "hire", "touch"}),
+    ("education", {"education", "study", "studied", "studying", "university", "college", "degree", "masters", "master", "bachelor", "school", "graduate", "qualification", "qualifications"}),
+    ("research", {"research", "paper", "papers", "publication", "publications", "published", "publish", "doi"}),
+    ("projects", {"project", "projects", "built", "build", "portfolio"}),
+    ("achievements", {"achievement", "achievements", "award", "awards", "won", "hackathon", "hackathons", "recognition"}),
+    ("experience", {"experience", "work", "worked", "working", "job", "jobs", "company", "companies", "employer", "career", "internship"}),
+    ("roles", {"role", "roles", "position", "positions", "title", "titles"}),
+    ("skills", {"skill", "skills", "language", "languages", "programming", "code", "coding", "tech", "stack", "tools", "frameworks", "expertise", "know"}),
+]
+
+OFFLINE_NOTE = "(My AI brain is taking a short break, so here's the quick version.)"
+
+DEFAULT_NAME = "Mohammed Noushir"
+
+def detect_intent(query):
+    """Return the profile topic a question is about, or None"""
+    words = set(re.findall(r"[a-z]+", query.lower()))
+    for intent, keywords in INTENT_KEYWORDS:
+        if words & keywords:
+            return intent
+    return None
+
+def display_names(profile):
+    """Return (full name, first name), falling back to the default for a missing or blank name"""
+    name = profile.get("name")
+    name = name.strip() if isinstance(name, str) and name.strip() else DEFAULT_NAME
+    return name, name.split()[0]
+
+def build_answers(profile):
+    """Render a templated answer for each profile topic, plus a bio fallback
+
+    Runs when the LLM is down, so partial or malformed entries are skipped
+    rather than allowed to raise.
+    """
+    name, first_name = display_names(profile)
+    answers = {}
+
+    contact = profile.get("contact") or {}
+    channels = [f"{label}: {contact[key]}" for key, label in (
+        ("email", "email"), ("linkedin", "LinkedIn"), ("github", "GitHub")
+    ) if contact.get(key)]
+    contact_line = f"You can reach {first_name} via " + ", ".join(channels) + "." if channels else ""
+    if contact_line:
+        answers["contact"] = contact_line
+
+    skills = [s for s in profile.get("skills") or [] if isinstance(s, dict) and s.get("name")]
+    technical = [s["name"] for s in skills if s.get("level") != "Soft Skill"]
+    soft = [s["name"] for s in skills if s.get("level") == "Soft Skill"]
+    if technical:
+        answer = f"{first_name}'s technical skills include {', '.join(technical)}."
+        if soft:
+            answer += f" Soft skills: {', '.join(soft)}."
+        answers["skills"] = answer
+
+    education = [item for item in profile.get("education") or [] if isinstance(item, dict)]
+    if education:
+        answers["education"] = f"{first_name} studied: " + "; ".join(
+            f"{e.get('title')} at {e.get('institution')} ({e.get('year')})" for e in education
+        ) + "."
+
+    roles = [str(item) for item in profile.get("roles") or [] if item]
+    if roles:
+        answers["roles"] = f"{first_name}'s roles include {', '.join(roles)}."
+
+    experience = [item for item in profile.get("experience") or [] if isinstance(item, dict)]
+    if experience:
+        answers["experience"] = f"{first_name}'s experience: " + "; ".join(
+            f"{e.get('role')} at {e.get('company')} ({e.get('period')})" for e in experience
+        ) + "."
+
+    research = [item for item in profile.get("research") or [] if isinstance(item, dict)]
+    if research:
+        answers["research"] = f"{first_name}'s research includes: " + "; ".join(
+            f"{r.get('title')} ({r.get('date')})" for r in research
+        ) + "."
+
+    projects = [item for item in profile.get("projects") or [] if isinstance(item, dict)]
+    if projects:
+        answers["projects"] = f"Some of {first_name}'s projects: " + "; ".join(
+            f"{p.get('title')} ({p.get('period')})" for p in projects
+        ) + "."
+
+    achievements = [str(item) for item in profile.get("achievements") or [] if item]
+    if achievements:
+        answers["achievements"] = "Highlights: " + " ".join(achievements)
+
+    bio = profile.get("bio") or f"{name} is an AI/ML researcher and builder."
+    answers["fallback"] = f"{bio} {contact_line}".strip()
+    return answers
+
+class DegradedResponder:
+    """Templated answers built from profile data, used when the LLM is unavailable"""
+
+    def __init__(self, profile_data):
+        self.answers = build_answers(profile_data or {})
+        self.served = 0
+
+    def answer(self, query):
+        """Return a templated answer for the question's topic"""
+        self.served += 1
+        intent = detect_intent(query)
+        body = self.answers.get(intent) or self.answers["fallback"]
+        return f"{body} {OFFLINE_NOTE}"
+
+    def stats(self):
+        return {"served": self.served}
@@ -0,0 +1,151 @@
+import re
+from src.agents.knowledge.degraded import build_answers, display_names
+from src.agents.knowledge.semantic_cache import STOPWORDS
+from src.llm.cascade import COMPLEX_MARKERS
+
+# Words that name each structured topic the fast path answers
+FAST_INTENTS = {
+    "contact": {"contact", "reach", "touch", "hire", "email", "mail", "phone", "number", "call", "linkedin", "github"},
+    "skills": {"skill", "skills", "language", "languages", "programming", "tech", "stack", "tools", "frameworks",
+               "technologies", "expertise", "technical", "soft"},
+    "education": {"education", "study", "studied", "university", "college", "degree", "degrees", "masters",
+                  "master", "bachelor", "bachelors", "qualification", "qualifications", "graduate", "graduated"},
+    "roles": {"role", "roles", "position", "positions", "title", "titles", "held"},
+}
+
+# Contact fields and the words that ask for exactly that field
+CONTACT_FIELDS = [
+    ("email", "email address", {"email", "mail"}),
+    ("phone", "phone number", {"phone", "number", "call"}),
+    ("linkedin", "LinkedIn", {"linkedin"}),
+    ("github", "GitHub", {"github"}),
+]
+
+# Words asking whether a specific skill is known
+SKILL_QUESTION_WORDS = {
+    "familiar", "proficient", "skilled", "experience", "experienced", "used", "using",
+    "level", "good", "work", "worked", "working",
+}
+
+# Harmless words a structured question may also contain
+FILLER_WORDS = {
+    "list", "all", "name", "names", "address", "addresses", "account", "handle", "profile", "main",
+    "key", "top", "s", "hold", "give", "show", "share", "find", "way", "best", "his", "he", "him",
+}
+
+def _words(text):
+    return re.findall(r"[a-z0-9+#]+", text.lower().replace("'s", ""))
+
+def _skill_aliases(name):
+    """Phrases a visitor may use for a skill: "AWS (S3, EC2)" -> aws, s3, ec2"""
+    main, _, extra = name.partition("(")
+    aliases = [main] + extra.rstrip(")").split(",")
+    return [tuple(_words(alias)) for alias in aliases if _words(alias)]
+
+class FastPathResponder:
+    """Answers structured profile questions without an LLM call
+
+    Contact, skills, education and roles questions are matched against
+    keyword sets and answered from templates and indexes compiled once per
+    profile. A question only takes the fast path when every content word in
+    it is accounted for (a topic keyword, a known skill name or filler), so
+    anything more specific, such as "What did he study at Queen Mary and
+    why?", falls through to the LLM.
+    """
+
+    def __init__(self, profile_data):
+        profile = profile_data or {}
+        _, first_name = display_names(profile)
+        self.answers = {
+            intent: answer for intent, answer in build_answers(profile).items() if intent in FAST_INTENTS
+        }
+
+        contact = profile.get("contact") or {}
+        self.contact_answers = {
+            field: f"{first_name}'s {label} is {contact[field]}."
+            for field, label, _ in CONTACT_FIELDS if contact.get(field)
+        }
+
+        # Skill alias (as a word tuple) -> "PyTorch (Advanced)"
+        self.skills = {}
+        for skill in profile.get("skills") or []:
+            if not isinstance(skill, dict) or not skill.get("name"):
+                continue
+            name, level = skill["name"], skill.get("level")
+            if level and level != "Soft Skill":
+                label = f"{name[:-1]}, {level})" if name.endswith(")") else f"{name} ({level})"
+            else:
+                label = name
+            for alias in _skill_aliases(skill["name"]):
+                self.skills.setdefault(alias, label)
+        self.max_alias_words = max((len(alias) for alias in self.skills), default=0)
+        self.first_name = first_name
+        self.answered = {intent: 0 for intent in FAST_INTENTS}
+        self.fell_through = 0
+
+    def _find_skills(self, words):
+        """Return the skills named in `words` and the positions they cover"""
+        found, covered = [], set()
+        for size in range(self.max_alias_words, 0, -1):
+            for start in range(len(words) - size + 1):
+                span = range(start, start + size)
+                if covered.intersection(span):
+                    continue
+                label = self.skills.get(tuple(words[start:start + size]))
+                if label is not None:
+                    if label not in found:
+                        found.append(label)
+                    covered.update(span)
+        return found, covered
+
+    def match(self, query):
+        """Return (intent, answer) for a structured question, or None"""
+        words = _words(query)
+        if not words or COMPLEX_MARKERS.intersection(words):
+            return None
+        skills, covered = self._find_skills(words)
+        remaining = [w for i, w in enumerate(words) if i not in covered and w not in STOPWORDS]
+        intents = {intent for intent, keywords in FAST_INTENTS.items() if keywords.intersection(remaining)}
+        leftover = [
+            w for w in remaining
+            if w not in FILLER_WORDS and not any(w in FAST_INTENTS[intent] for intent in intents)
+        ]
+
+        if skills and intents <= {"skills"}:
+            # "Does he know PyTorch?", "Is he familiar with Docker and Kubernetes?"
+            if any(w not in SKILL_QUESTION_WORDS for w in leftover):
+                return None
+            if len(skills) == 1:
+                return "skills", f"Yes, {skills[0]} is one of {self.first_name}'s skills."
+            listed = ", ".join(skills[:-1]) + f" and {skills[-1]}"
+            return "skills", f"Yes, {listed} are among {self.first_name}'s skills."
+
+        if len(intents) != 1 or leftover:
+            return None
+        intent = intents.pop()
+        if intent == "contact":
+            fields = [field for field, _, keywords in CONTACT_FIELDS if keywords.intersection(remaining)]
+            answers = [self.contact_answers[field] for field in fields if field in self.contact_answers]
+            if fields and len(answers) == len(fields):
+                return intent, " ".join(answers)
+        answer = self.answers.get(intent)
+        return (intent, answer) if answer else None
+
+    def answer(self, query):
+        """Return a templated answer, or None to fall through to the LLM"""
+        matched = self.match(query)
+        if matched is None:
+            self.fell_through += 1
+            return None
+        intent, answer = matched
+        self.answered[intent] += 1
+        return answer
+
+    def stats(self):
+        answered = sum(self.answered.values())
+        total = answered + self.fell_through
+        return {
+            "answered": dict(self.answered),
+            "fell_through": self.fell_through,
+            "hit_rate": round(answered / total, 3) if total else 0.0,
+        }
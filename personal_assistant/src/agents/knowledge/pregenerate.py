@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from src.agents.knowledge.cache import normalize_query
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def load_questions(path):
+    """Read frequent questions, one per line; blank lines and # comments are skipped"""
+    if not path:
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            lines = [line.strip() for line in file]
+    except OSError:
+        logger.warning(f"Frequent questions file not found: {path}")
+        return []
+    return [line for line in lines if line and not line.startswith("#")]
+
+class QuestionLog:
+    """Bounded frequency count of the questions visitors ask"""
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._counts = Counter()
+        self._text = {}
+
+    def record(self, query):
+        key = normalize_query(query)
+        if not key or self.max_size <= 0:
+            return
+        self._counts[key] += 1
+        self._text.setdefault(key, query.strip())
+        if len(self._counts) > self.max_size:
+            # Keep the more frequent half; rare questions are not worth pre-generating
+            kept = dict(self._counts.most_common(self.max_size // 2))
+            self._counts = Counter(kept)
+            self._text = {key: self._text[key] for key in kept}
+
+    def most_common(self, n):
+        return [self._text[key] for key, _ in self._counts.most_common(n)]
+
+class AnswerPregenerator:
+    """Fills the answer store with answers to the most frequent questions
+
+    Questions come from the configured file, followed by the most frequent
+    ones logged from live traffic, up to `top_n`. A run starts at startup
+    and again whenever the profile (or CV index) changes. Questions the fast
+    path answers need no LLM call. The rest are generated one at a time at
+    background priority and paced to `rate_per_minute`, so the job never
+    competes with visitors for the rate limit.
+    """
+
+    def __init__(self, agent, questions_path=None, top_n=25, rate_per_minute=20):
+        self.agent = agent
+        self.questions_path = questions_path
+        self.top_n = top_n
+        self.rate_per_minute = rate_per_minute
+        self.log = QuestionLog()
+        self._task = None
+        self._rerun = False
+        self._covered = {}
+        self._profile_hash = None
+        self.runs = 0
+        self.generated = 0
+        self.failed = 0
+        self.last_run_seconds = None
+
+    @property
+    def enabled(self):
+        return self.top_n > 0 and self.rate_per_minute > 0
+
+    def record(self, query):
+        """Count a live question toward the frequent-question list"""
+        self.log.record(query)
+
+    def questions(self):
+        """Configured questions first, then the most frequently asked, without duplicates"""
+        seen, questions = set(), []
+        for question in load_questions(self.questions_path) + self.log.most_common(self.top_n):
+            key = normalize_query(question)
+            if key and key not in seen:
+                seen.add(key)
+                questions.append(question)
+        return questions[:self.top_n]
+
+    def schedule(self):
+        """Start a run, or restart the current one after a profile change"""
+        if not self.enabled:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop yet (module import); the startup hook schedules the first run
+            return
+        if self._task is not None and not self._task.done():
+            self._rerun = True
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            self._rerun = False
+            await self._generate_all()
+            if not self._rerun:
+                return
+
+    async def _generate_all(self):
+        start = time.monotonic()
+        interval = 60.0 / self.rate_per_minute
+        if self._profile_hash != self.agent.profile_hash:
+            # Answers for the old profile were dropped from the store with it
+            self._covered = {}
+            self._profile_hash = self.agent.profile_hash
+        for question in self.questions():
+            if self._rerun:
+                return
+            key = normalize_query(question)
+            if key in self._covered:
+                continue
+            try:
+                source = await self.agent.pregenerate(question)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Could not pre-generate an answer for {question!r}: {e}")
+                await asyncio.sleep(interval)
+                continue
+            if source is None:
+                # The profile changed while generating; the next run starts over
+                continue
+            self._covered[key] = source
+            if source == "generated":
+                self.generated += 1
+                await asyncio.sleep(interval)
+        self.runs += 1
+        self.last_run_seconds = round(time.monotonic() - start, 2)
+        logger.info(f"Pre-generated answers: {self.stats()['coverage']:.0%} of frequent questions covered")
+
+    def stats(self):
+        """Return how many of the current frequent questions have an answer ready"""
+        questions = self.questions()
+        covered = [self._covered.get(normalize_query(q)) for q in questions]
+        if self._profile_hash != self.agent.profile_hash:
+            covered = [None] * len(questions)
+        ready = sum(1 for source in covered if source is not None)
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "questions": len(questions),
+            "covered": ready,
+            "by_fast_path": sum(1 for source in covered if source == "fast_path"),
+            "pregenerated": sum(1 for source in covered if source == "generated"),
+            "coverage": round(ready / len(questions), 3) if questions else 0.0,
+            "generated_total": self.generated,
+            "failed_total": self.failed,
+            "runs": self.runs,
+            "last_run_seconds": self.last_run_seconds,
+            "uncovered": [q for q, source in zip(questions, covered) if source is None][:10],
+        }
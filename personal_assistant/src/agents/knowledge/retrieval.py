@@ -0,0 +1,158 @@
+import heapq
+import json
+import logging
+import math
+from collections import Counter, defaultdict
+from src.agents.knowledge.semantic_cache import question_terms
+from src.llm.tokens import estimate_tokens
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sections sent with every question, whatever it asks
+PINNED_SECTIONS = ("name", "bio")
+
+# Topic words a section answers for, beyond its own name and content
+SECTION_TOPICS = {
+    "skills": "skill programming",
+    "roles": "role",
+    "experience": "experience role",
+    "contact": "contact email",
+    "achievements": "award achievement",
+}
+
+def _compact(value):
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def _strings(value):
+    """Yield every key and string inside a JSON value"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+    elif value is not None:
+        yield str(value)
+
+def profile_chunks(profile_data, chunk_tokens=150, pinned=PINNED_SECTIONS):
+    """Split a profile into retrievable chunks
+
+    Scalar and dict sections are one chunk each. List sections are packed
+    into chunks of consecutive items up to roughly `chunk_tokens`, so a long
+    experience entry stands alone while short skills share a chunk.
+
+    Returns:
+        List of (section, value) pairs; list sections yield lists of items
+    """
+    chunks = []
+    for section, value in profile_data.items():
+        if section in pinned:
+            continue
+        if not isinstance(value, list):
+            chunks.append((section, value))
+            continue
+        batch, size = [], 0
+        for item in value:
+            tokens = estimate_tokens(_compact(item))
+            if batch and size + tokens > chunk_tokens:
+                chunks.append((section, batch))
+                batch, size = [], 0
+            batch.append(item)
+            size += tokens
+        if batch:
+            chunks.append((section, batch))
+    return chunks
+
+class BM25Index:
+    """In-memory inverted index scored with Okapi BM25"""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        """
+        Args:
+            documents: List of term lists, one per document
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)
+        self.lengths = [len(terms) for terms in documents]
+        for doc_id, terms in enumerate(documents):
+            for term, frequency in Counter(terms).items():
+                self.postings[term].append((doc_id, frequency))
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        count = len(documents)
+        self.idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, terms, k):
+        """Return up to `k` (doc_id, score) pairs with a positive score, best first"""
+        scores = defaultdict(float)
+        for term in set(terms):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+class ProfileRetriever:
+    """Selects the profile chunks relevant to a question
+
+    The profile is split into chunks (see `profile_chunks`) and indexed with
+    BM25 over the same canonical terms the semantic cache uses, plus each
+    chunk's section name and topic words, so "Where did he study?" matches
+    education entries. A question gets the pinned sections and its `top_k` best
+    chunks, reassembled in profile order. Questions with no matching term
+    ("Tell me about him") return None so the caller sends the full profile.
+    """
+
+    def __init__(self, profile_data, top_k=6, chunk_tokens=150):
+        self.profile_data = profile_data
+        self.top_k = top_k
+        self.pinned = {key: profile_data[key] for key in PINNED_SECTIONS if key in profile_data}
+        self.chunks = profile_chunks(profile_data, chunk_tokens)
+        self.index = BM25Index([
+            question_terms(" ".join([section, SECTION_TOPICS.get(section, ""), *_strings(value)]))
+            for section, value in self.chunks
+        ])
+        self.queries = 0
+        self.fallbacks = 0
+        self.selected = 0
+
+    def retrieve(self, query):
+        """Return a profile dict holding only the chunks relevant to `query`, or None"""
+        if self.top_k <= 0 or not self.chunks:
+            return None
+        self.queries += 1
+        hits = self.index.search(question_terms(query), self.top_k)
+        if not hits:
+            self.fallbacks += 1
+            return None
+        self.selected += len(hits)
+
+        chosen = sorted(doc_id for doc_id, _ in hits)
+        profile_data = dict(self.pinned)
+        for doc_id in chosen:
+            section, value = self.chunks[doc_id]
+            if isinstance(value, list):
+                profile_data.setdefault(section, []).extend(value)
+            else:
+                profile_data[section] = value
+        # Keep the profile's own section order
+        order = {key: i for i, key in enumerate(self.profile_data)}
+        return dict(sorted(profile_data.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def stats(self):
+        return {
+            "top_k": self.top_k,
+            "chunks": len(self.chunks),
+            "terms": len(self.index.postings),
+            "queries": self.queries,
+            "full_profile_fallbacks": self.fallbacks,
+            "avg_chunks_selected": round(self.selected / (self.queries - self.fallbacks), 2)
+            if self.queries > self.fallbacks else None,
+        }
@@ -1,14 +1,49 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from src.models import ChatMessage, ChatResponse, AgentType
 from src.agents.knowledge.service import knowledge_agent
+from src.agents.calendar.service import calendar_agent
+from src.agents.feedback.service import feedback_agent
+from src.agents.intent import CALENDAR, FEEDBACK, intent_router
+from src.utils.sse import stream_chat_events
 
 router = APIRouter()
 
+async def _answer_once(answer):
+    """Stream an agent's complete answer as a single chunk"""
+    yield await answer
+
+async def _feedback_reply(content):
+    _, response_message = await feedback_agent.process(content)
+    return response_message
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(message: ChatMessage):
-    """Process chat messages and route to knowledge agent"""
+    """Process chat messages and route them to the knowledge, calendar or feedback agent"""
     try:
-        response = await knowledge_agent.process(message.content)
-        return ChatResponse(content=response, agent=AgentType.KNOWLEDGE)
+        intent = await intent_router.route(message.content, knowledge_agent.can_answer_locally)
+        if intent == CALENDAR:
+            response = await calendar_agent.process(message.content)
+        elif intent == FEEDBACK:
+            response = await _feedback_reply(message.content)
+        else:
+            response = await knowledge_agent.process(message.content, message.session_id)
+        return ChatResponse(content=response, agent=AgentType(intent), session_id=message.session_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
+
+@router.post("/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """Stream the routed agent's answer as Server-Sent Events"""
+    intent = await intent_router.route(message.content, knowledge_agent.can_answer_locally)
+    if intent == CALENDAR:
+        tokens = _answer_once(calendar_agent.process(message.content))
+    elif intent == FEEDBACK:
+        tokens = _answer_once(_feedback_reply(message.content))
+    else:
+        tokens = knowledge_agent.process_stream(message.content, message.session_id)
+    return StreamingResponse(
+        stream_chat_events(tokens, AgentType(intent)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
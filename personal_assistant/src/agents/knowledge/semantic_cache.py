@@ -0,0 +1,225 @@
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Words that carry no meaning for matching questions about the profile
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "with",
+    "by", "from", "about", "as", "is", "are", "was", "were", "be", "been", "do",
+    "does", "did", "has", "have", "had", "can", "could", "would", "will", "what",
+    "which", "who", "whom", "where", "when", "how", "why", "tell", "me", "us",
+    "please", "i", "you", "your", "he", "him", "his", "she", "her", "they",
+    "them", "their", "it", "its", "this", "that", "any", "some", "know", "knows",
+    "use", "uses", "go", "went", "get", "got", "mohammed", "noushir", "mohammad",
+}
+
+# Canonical terms for common ways visitors phrase the same topic
+SYNONYMS = {
+    "programming": "programming", "programmer": "programming",
+    "code": "programming", "coding": "programming", "program": "programming",
+    "languag": "programming", "language": "programming",
+    "study": "education", "studi": "education", "studied": "education",
+    "university": "education", "college": "education", "degree": "education",
+    "school": "education", "qualification": "education",
+    "job": "role", "position": "role", "title": "role",
+    "work": "experience", "worked": "experience", "employ": "experience",
+    "company": "experience", "career": "experience",
+    "paper": "research", "publication": "research", "publish": "research",
+    "mail": "email", "e-mail": "email", "reach": "contact",
+    "skill": "skill", "expertise": "skill", "abilities": "skill", "stack": "skill",
+    "tool": "skill", "technologies": "skill", "technology": "skill",
+}
+
+# Interrogatives, which decide what kind of answer a question wants ("which" asks what "what" does)
+QUESTION_TYPES = ("", "what", "who", "where", "when", "how", "why")
+QUESTION_WORDS = {
+    "what": "what", "which": "what", "who": "who", "whom": "who", "whose": "who",
+    "where": "where", "when": "when", "how": "how", "why": "why",
+}
+
+def question_type(text):
+    """Index into QUESTION_TYPES of the first interrogative, 0 for requests and yes/no questions"""
+    for word in re.findall(r"[a-z]+", text.lower()):
+        if word in QUESTION_WORDS:
+            return QUESTION_TYPES.index(QUESTION_WORDS[word])
+    return 0
+
+def _stem(word):
+    """Strip common English suffixes (a deliberately tiny stemmer)"""
+    for suffix in ("ies", "ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+def question_terms(text):
+    """Reduce a question to canonical content terms"""
+    terms = []
+    for word in re.findall(r"[a-z0-9+#-]+", text.lower()):
+        if word in STOPWORDS:
+            continue
+        stem = _stem(word)
+        terms.append(SYNONYMS.get(word) or SYNONYMS.get(stem) or stem)
+    return terms
+
+class HashingEmbedder:
+    """Signed feature-hashing embedding of question terms and term pairs"""
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+
+    def _bucket(self, feature):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def embed(self, text):
+        """Return an L2-normalized vector, or None if the text has no content terms"""
+        terms = question_terms(text)
+        if not terms:
+            return None
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = [(term, 1.0) for term in set(terms)]
+        features += [(f"{a}|{b}", 0.5) for a, b in zip(terms, terms[1:])]
+        for feature, weight in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign * weight
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+class SemanticCache:
+    """Paraphrase-aware answer cache backed by an in-memory vector matrix
+
+    Stores one normalized embedding per answered question. A lookup takes the
+    dot product against the whole matrix and reuses the best answer when its
+    cosine similarity reaches the threshold. Only questions of the same type
+    are compared, since "Where did he study?" and "What did he study?" share
+    every content term but not their answer. When full, the least recently
+    used row is overwritten.
+    """
+
+    def __init__(self, max_size=512, threshold=0.85, ttl_seconds=3600, dim=1024):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.embedder = HashingEmbedder(dim)
+        self._matrix = np.zeros((max(max_size, 0), dim), dtype=np.float32)
+        self._answers = [None] * max(max_size, 0)
+        self._expires_at = np.zeros(max(max_size, 0), dtype=np.float64)
+        self._last_used = np.zeros(max(max_size, 0), dtype=np.float64)
+        self._types = np.zeros(max(max_size, 0), dtype=np.int8)
+        self._size = 0
+        self._profile_hash = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._latencies = deque(maxlen=1000)
+
+    def _check_profile(self, profile_hash):
+        if profile_hash != self._profile_hash:
+            self._reset()
+            self._profile_hash = profile_hash
+
+    def _reset(self):
+        self._matrix[:] = 0
+        self._answers = [None] * len(self._answers)
+        self._expires_at[:] = 0
+        self._last_used[:] = 0
+        self._types[:] = 0
+        self._size = 0
+
+    def _best(self, vector, kind, now):
+        """Row of the most similar live question of the same kind, or None below the threshold"""
+        if vector is None or self._size == 0:
+            return None
+        scores = self._matrix[:self._size] @ vector
+        # Expired rows can never match
+        scores[self._expires_at[:self._size] <= now] = -1.0
+        # So can rows that answer a different kind of question
+        scores[self._types[:self._size] != kind] = -1.0
+        best = int(np.argmax(scores))
+        return best if scores[best] >= self.threshold else None
+
+    def get(self, query, profile_hash):
+        """Return the answer to the most similar cached question, or None"""
+        if self.max_size <= 0:
+            return None
+        start = time.perf_counter()
+        try:
+            vector = self.embedder.embed(query)
+            kind = question_type(query)
+            with self._lock:
+                self._check_profile(profile_hash)
+                now = time.monotonic()
+                best = self._best(vector, kind, now)
+                if best is None:
+                    self.misses += 1
+                    return None
+
+                self._last_used[best] = now
+                self.hits += 1
+                return self._answers[best]
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    def contains(self, query, profile_hash):
+        """Whether `get` would find an answer, without counting a lookup or refreshing its recency"""
+        if self.max_size <= 0:
+            return False
+        vector = self.embedder.embed(query)
+        with self._lock:
+            if profile_hash != self._profile_hash:
+                return False
+            return self._best(vector, question_type(query), time.monotonic()) is not None
+
+    def set(self, query, profile_hash, answer):
+        """Index a question and its answer"""
+        if self.max_size <= 0 or not answer:
+            return
+        vector = self.embedder.embed(query)
+        if vector is None:
+            return
+        with self._lock:
+            self._check_profile(profile_hash)
+            now = time.monotonic()
+            if self._size < self.max_size:
+                row = self._size
+                self._size += 1
+            else:
+                row = int(np.argmin(self._last_used))
+                self.evictions += 1
+            self._matrix[row] = vector
+            self._answers[row] = answer
+            self._expires_at[row] = now + self.ttl_seconds
+            self._last_used[row] = now
+            self._types[row] = question_type(query)
+
+    def clear(self):
+        """Drop every indexed question"""
+        with self._lock:
+            self._reset()
+
+    def stats(self):
+        """Return index size, hit rate and lookup latency"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            latencies = sorted(self._latencies)
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "lookup_p50_us": round(latencies[len(latencies) // 2] * 1e6, 1) if latencies else 0.0,
+                "lookup_p95_us": round(latencies[int(len(latencies) * 0.95)] * 1e6, 1) if latencies else 0.0,
+            }
@@ -17,6 +17,59 @@ def get_groq_api_key():
 # LLM Configuration
 GROQ_API_KEY = get_groq_api_key()
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama3-8b-8192")
+# Alternative API endpoint, e.g. the local fake server in benchmarks/ (unset uses api.groq.com)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+
+def _provider_config(name):
+    """Read one LLM provider's settings from LLM_PROVIDER_<NAME>_* variables"""
+    prefix = f"LLM_PROVIDER_{name.upper().replace('-', '_')}_"
+    is_groq = name.lower() == "groq"
+    return {
+        "name": name,
+        "kind": os.getenv(prefix + "KIND", "groq" if is_groq else "openai"),
+        "base_url": os.getenv(prefix + "BASE_URL") or (GROQ_BASE_URL if is_groq else None),
+        "api_key": os.getenv(prefix + "API_KEY") or (GROQ_API_KEY if is_groq else None),
+        "model": os.getenv(prefix + "MODEL") or None,
+    }
+
+# OpenAI-compatible LLM endpoints (comma separated names); requests go to the fastest healthy one
+LLM_PROVIDERS = [_provider_config(n.strip()) for n in os.getenv("LLM_PROVIDERS", "groq").split(",") if n.strip()]
+# Consecutive failures that take a provider out of rotation, and how long before it is probed again
+LLM_PROVIDER_FAILURE_THRESHOLD = int(os.getenv("LLM_PROVIDER_FAILURE_THRESHOLD", "3"))
+LLM_PROVIDER_RESET_SECONDS = float(os.getenv("LLM_PROVIDER_RESET_SECONDS", "15"))
+# Model cascade, smallest to largest (comma separated); defaults to GROQ_MODEL alone
+LLM_MODEL_TIERS = [m.strip() for m in os.getenv("LLM_MODEL_TIERS", GROQ_MODEL).split(",") if m.strip()]
+# Queries longer than this, or from these agents, start on the largest tier
+LLM_CASCADE_MAX_SIMPLE_CHARS = int(os.getenv("LLM_CASCADE_MAX_SIMPLE_CHARS", "280"))
+LLM_CASCADE_COMPLEX_AGENTS = [a.strip() for a in os.getenv("LLM_CASCADE_COMPLEX_AGENTS", "").split(",") if a.strip()]
+# Maximum number of LLM calls allowed in flight per process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+# Share one upstream call among identical prompts that are in flight together
+LLM_COALESCE_REQUESTS = os.getenv("LLM_COALESCE_REQUESTS", "true").lower() == "true"
+# Per-request deadline covering all retries, and retry backoff settings
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+# Race a second attempt against calls slower than the observed p95 latency
+LLM_HEDGE_REQUESTS = os.getenv("LLM_HEDGE_REQUESTS", "false").lower() == "true"
+# Open the circuit after this many consecutive provider failures; probe again after the reset window
+LLM_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5"))
+LLM_CIRCUIT_RESET_SECONDS = float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+# Provider quota enforced locally (0 = unlimited until the provider's rate-limit headers say otherwise)
+LLM_RATE_LIMIT_RPM = int(os.getenv("LLM_RATE_LIMIT_RPM", "0"))
+LLM_RATE_LIMIT_TPM = int(os.getenv("LLM_RATE_LIMIT_TPM", "0"))
+# Completion tokens reserved per call before the real usage is known
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "300"))
+# Shared keep-alive connection pool for the LLM provider
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "64"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+# HTTP/2 requires the optional `h2` package
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "false").lower() == "true"
+# Connections to open at startup before the app reports ready (0 disables)
+LLM_WARMUP_CONNECTIONS = int(os.getenv("LLM_WARMUP_CONNECTIONS", "2"))
 
 # Google Calendar API
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -33,4 +86,71 @@ FEEDBACK_EMAIL_RECIPIENT = os.getenv("FEEDBACK_EMAIL_RECIPIENT")
 
 # Application Settings
 PROFILE_PATH = os.getenv("PROFILE_PATH", "profile.json")
+# Seconds between checks of profile.json for edits (0 checks on every request, negative disables)
+PROFILE_RELOAD_INTERVAL = float(os.getenv("PROFILE_RELOAD_INTERVAL", "2"))
+# Knowledge answer cache: maximum entries and time-to-live in seconds
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", "3600"))
+# Paraphrase-aware cache: indexed questions and minimum cosine similarity for reuse
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+# Feedback classification micro-batching: wait up to this long (0 disables) or for this many items
+FEEDBACK_BATCH_WINDOW_MS = float(os.getenv("FEEDBACK_BATCH_WINDOW_MS", "200"))
+FEEDBACK_BATCH_MAX_ITEMS = int(os.getenv("FEEDBACK_BATCH_MAX_ITEMS", "16"))
+# Durable feedback notification queue: SQLite file, worker pool size and maximum waiting jobs
+FEEDBACK_QUEUE_PATH = os.getenv("FEEDBACK_QUEUE_PATH", "data/feedback_queue.db")
+FEEDBACK_QUEUE_WORKERS = int(os.getenv("FEEDBACK_QUEUE_WORKERS", "2"))
+FEEDBACK_QUEUE_MAX_SIZE = int(os.getenv("FEEDBACK_QUEUE_MAX_SIZE", "1000"))
+# Delivery attempts per notification and the retry backoff bounds in seconds
+FEEDBACK_QUEUE_MAX_ATTEMPTS = int(os.getenv("FEEDBACK_QUEUE_MAX_ATTEMPTS", "5"))
+FEEDBACK_QUEUE_RETRY_BASE_DELAY = float(os.getenv("FEEDBACK_QUEUE_RETRY_BASE_DELAY", "2"))
+FEEDBACK_QUEUE_RETRY_MAX_DELAY = float(os.getenv("FEEDBACK_QUEUE_RETRY_MAX_DELAY", "300"))
+# Feedback digest: feedback below this priority that is not negative is emailed together,
+# once FEEDBACK_DIGEST_MAX_ITEMS are waiting or the oldest has waited FEEDBACK_DIGEST_INTERVAL seconds
+FEEDBACK_DIGEST = os.getenv("FEEDBACK_DIGEST", "true").lower() == "true"
+FEEDBACK_DIGEST_MIN_URGENT_PRIORITY = int(os.getenv("FEEDBACK_DIGEST_MIN_URGENT_PRIORITY", "4"))
+FEEDBACK_DIGEST_INTERVAL = float(os.getenv("FEEDBACK_DIGEST_INTERVAL", "3600"))
+FEEDBACK_DIGEST_MAX_ITEMS = int(os.getenv("FEEDBACK_DIGEST_MAX_ITEMS", "20"))
+# Pooled SMTP sessions for notification emails: sessions kept logged in, seconds an idle
+# session is reused before reconnecting, and the socket timeout
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "2"))
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+# Weighted spam patterns for feedback (reloaded on change) and the score that marks a message as spam
+SPAM_PATTERNS_PATH = os.getenv("SPAM_PATTERNS_PATH", os.path.join(os.path.dirname(PROFILE_PATH), "spam_patterns.txt"))
+SPAM_SCORE_THRESHOLD = float(os.getenv("SPAM_SCORE_THRESHOLD", "1.0"))
+# Estimated token budget for the knowledge agent's system prompt (0 disables trimming)
+KNOWLEDGE_PROMPT_TOKEN_BUDGET = int(os.getenv("KNOWLEDGE_PROMPT_TOKEN_BUDGET", "3000"))
+# Profile chunks retrieved per knowledge question with BM25 (0 sends the whole profile)
+KNOWLEDGE_RETRIEVAL_TOP_K = int(os.getenv("KNOWLEDGE_RETRIEVAL_TOP_K", "6"))
+# Answer contact, skills, education and roles questions from templates without an LLM call
+KNOWLEDGE_FAST_PATH = os.getenv("KNOWLEDGE_FAST_PATH", "true").lower() == "true"
+# CV documents (files or directories of .pdf/.txt/.md) ingested by ingest_cv.py, by default beside profile.json
+CV_SOURCES = [p.strip() for p in os.getenv("CV_SOURCES", ",".join([
+    os.path.join(os.path.dirname(PROFILE_PATH), "noushir_cv.txt"),
+    os.path.join(os.path.dirname(PROFILE_PATH), "..", "My Details"),
+])).split(",") if p.strip()]
+# Memory-mapped CV retrieval index, kept beside profile.json
+CV_INDEX_PATH = os.getenv("CV_INDEX_PATH", os.path.join(os.path.dirname(PROFILE_PATH), "cv_index.bin"))
+# CV excerpts added to each knowledge prompt (0 disables)
+CV_RETRIEVAL_TOP_K = int(os.getenv("CV_RETRIEVAL_TOP_K", "3"))
+# Chat sessions remembered (LRU, 0 disables memory) and turns kept per session
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "1000"))
+CONVERSATION_MAX_TURNS = int(os.getenv("CONVERSATION_MAX_TURNS", "20"))
+# Estimated history tokens that trigger compaction, turns kept verbatim, and the summary's token budget
+CONVERSATION_COMPACT_TOKENS = int(os.getenv("CONVERSATION_COMPACT_TOKENS", "800"))
+CONVERSATION_KEEP_TURNS = int(os.getenv("CONVERSATION_KEEP_TURNS", "3"))
+CONVERSATION_SUMMARY_TOKENS = int(os.getenv("CONVERSATION_SUMMARY_TOKENS", "150"))
+# Frequent questions answered ahead of time (one per line), kept beside profile.json
+ANSWER_PREGEN_QUESTIONS_PATH = os.getenv(
+    "ANSWER_PREGEN_QUESTIONS_PATH", os.path.join(os.path.dirname(PROFILE_PATH), "top_questions.txt")
+)
+# Questions pre-generated per run (configured first, then most asked) and LLM calls per minute (0 disables)
+ANSWER_PREGEN_TOP_N = int(os.getenv("ANSWER_PREGEN_TOP_N", "25"))
+ANSWER_PREGEN_RATE_PER_MINUTE = float(os.getenv("ANSWER_PREGEN_RATE_PER_MINUTE", "20"))
+# Route /api/chat messages to the knowledge, calendar or feedback agent with a local classifier
+INTENT_ROUTING = os.getenv("INTENT_ROUTING", "true").lower() == "true"
+# Local confidence below which the LLM is asked to pick the intent (0 never asks)
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.7"))
+INTENT_LLM_FALLBACK = os.getenv("INTENT_LLM_FALLBACK", "true").lower() == "true"
 CALENDAR_TOKEN_PATH = os.getenv("CALENDAR_TOKEN_PATH", "data/calendar_token.json") 
\ No newline at end of file
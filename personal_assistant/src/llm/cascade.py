@@ -0,0 +1,90 @@
+import logging
+import re
+import threading
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Words that usually mean the question needs reasoning rather than a lookup
+COMPLEX_MARKERS = {
+    "why", "compare", "comparison", "difference", "explain", "analyze", "analyse",
+    "evaluate", "recommend", "should", "versus", "vs", "pros", "cons", "tradeoff", "tradeoffs",
+}
+
+class ModelCascade:
+    """Picks a model tier per request and escalates when an answer is rejected
+
+    Tiers are ordered from smallest/fastest to largest. A request starts on
+    tier 0 unless cheap signals say it is hard: a long query, several
+    questions at once, reasoning words, or an agent configured to always use
+    the larger model. If the caller's validator rejects a tier's answer, the
+    request moves up one tier until the largest model has answered.
+    """
+
+    def __init__(self, tiers, max_simple_chars=280, complex_agents=()):
+        self.tiers = list(tiers)
+        self.max_simple_chars = max_simple_chars
+        self.complex_agents = set(complex_agents)
+        self._lock = threading.Lock()
+        self._latency = {model: LatencyTracker() for model in self.tiers}
+        self._counts = {model: {"routed": 0, "escalated_to": 0, "rejected": 0} for model in self.tiers}
+        self._decisions = {}
+
+    @property
+    def enabled(self):
+        return len(self.tiers) > 1
+
+    def is_complex(self, agent, query):
+        """Cheap complexity heuristic for the latest user message"""
+        if agent in self.complex_agents:
+            return True
+        if len(query) > self.max_simple_chars or query.count("?") > 1:
+            return True
+        words = set(re.findall(r"[a-z]+", query.lower()))
+        return bool(words & COMPLEX_MARKERS)
+
+    def choose(self, agent, formatted_messages):
+        """Return the starting tier index for a request"""
+        if not self.enabled:
+            return 0
+        query = next((m["content"] for m in reversed(formatted_messages) if m["role"] == "user"), "")
+        tier = len(self.tiers) - 1 if self.is_complex(agent, query) else 0
+        with self._lock:
+            self._counts[self.tiers[tier]]["routed"] += 1
+            decisions = self._decisions.setdefault(agent or "unknown", {})
+            decisions[self.tiers[tier]] = decisions.get(self.tiers[tier], 0) + 1
+        return tier
+
+    def record_latency(self, tier, seconds):
+        with self._lock:
+            self._latency[self.tiers[tier]].record(seconds)
+
+    def escalate(self, tier, agent=None):
+        """Return the next tier after a rejected answer, or None at the top"""
+        with self._lock:
+            self._counts[self.tiers[tier]]["rejected"] += 1
+            if tier + 1 >= len(self.tiers):
+                return None
+            self._counts[self.tiers[tier + 1]]["escalated_to"] += 1
+        logger.info(f"Escalating {agent or 'request'} from {self.tiers[tier]} to {self.tiers[tier + 1]}")
+        return tier + 1
+
+    def stats(self):
+        """Return routing counts and latency percentiles per tier"""
+        with self._lock:
+            tiers = []
+            for model in self.tiers:
+                latency = self._latency[model]
+                p50, p95 = latency.percentile(0.5), latency.percentile(0.95)
+                tiers.append(dict(
+                    self._counts[model],
+                    model=model,
+                    latency_p50_ms=round(p50 * 1000, 1) if p50 is not None else None,
+                    latency_p95_ms=round(p95 * 1000, 1) if p95 is not None else None,
+                ))
+            return {
+                "enabled": self.enabled,
+                "tiers": tiers,
+                "decisions_by_agent": {agent: dict(d) for agent, d in self._decisions.items()},
+            }
@@ -0,0 +1,80 @@
+import logging
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for the LLM provider
+
+    closed:    calls flow normally; `failure_threshold` consecutive failures trip it
+    open:      calls are rejected immediately for `reset_timeout` seconds
+    half_open: a single probe call is let through; success closes the
+               circuit, failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow_request(self):
+        """Return True if a call may be attempted now"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            logger.info("LLM circuit half-open, sending probe request")
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def probe_due(self):
+        """Return True if the circuit is waiting for a probe call"""
+        if self.state == self.OPEN:
+            return time.monotonic() - self.opened_at >= self.reset_timeout
+        return self.state == self.HALF_OPEN and not self._probe_in_flight
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("LLM circuit closed, provider recovered")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+                logger.warning(f"LLM circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Finish a call that neither succeeded nor failed (e.g. cancelled)"""
+        self._probe_in_flight = False
+
+    def stats(self):
+        """Return circuit state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
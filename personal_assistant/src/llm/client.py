@@ -1,56 +1,485 @@
-import os
+import asyncio
 import logging
-from groq import Groq
-from src.config import GROQ_API_KEY, GROQ_MODEL
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import groq
+import httpx
+from src.config import (
+    GROQ_API_KEY, GROQ_MODEL, GROQ_BASE_URL, LLM_PROVIDERS,
+    LLM_PROVIDER_FAILURE_THRESHOLD, LLM_PROVIDER_RESET_SECONDS, LLM_MAX_CONCURRENCY, LLM_COALESCE_REQUESTS,
+    LLM_DEADLINE_SECONDS, LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY,
+    LLM_HEDGE_REQUESTS, LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS,
+    LLM_WARMUP_CONNECTIONS, LLM_MODEL_TIERS, LLM_CASCADE_MAX_SIMPLE_CHARS, LLM_CASCADE_COMPLEX_AGENTS,
+    LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM, LLM_EXPECTED_COMPLETION_TOKENS
+)
+from src.llm.cascade import ModelCascade
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.providers import Provider, ProviderRouter
+from src.llm.resilience import ResilientCaller
+from src.llm.scheduler import LLMScheduler, INTERACTIVE
+from src.llm.singleflight import SingleFlight, request_key
+from src.llm.tokens import TokenMeter, estimate_tokens, estimate_message_tokens
+from src.llm import transport
+from src.utils import metrics
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# We assume that app.py has already patched the Groq client
+# Upstream statuses that say the provider is unhealthy; other 4xx reject the request itself
+PROVIDER_FAILURE_STATUSES = (408, 409, 429)
+
+class LLMError(Exception):
+    """Raised when a call to the LLM provider fails
+
+    `status_code` is the status to report to our own callers; `upstream_status`
+    is the provider's HTTP status, if the provider answered at all.
+    """
+
+    def __init__(self, message, status_code=500, retryable=False, retry_after=None, upstream_status=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.upstream_status = upstream_status
+
+    @property
+    def provider_failure(self):
+        """Whether this error counts against provider health (circuit breakers)
+
+        Transport errors, timeouts, 408, 409, 429 and 5xx do. Any other 4xx
+        means the provider is up and rejected this particular request (an
+        over-long prompt, bad credentials, an unknown model), so it does not.
+        """
+        if self.upstream_status is None:
+            return self.retryable or self.status_code >= 500
+        return self.upstream_status in PROVIDER_FAILURE_STATUSES or self.upstream_status >= 500
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+    def __init__(self, message="LLM provider unavailable (circuit open)"):
+        super().__init__(message, status_code=503)
+
+def _parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _to_llm_error(error):
+    """Translate a provider SDK error into an LLMError"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        # Connection failures and timeouts never reached the provider's API
+        if isinstance(error, (groq.APITimeoutError, httpx.TimeoutException)):
+            return LLMError(f"API error: {str(error)}", status_code=504, retryable=True)
+        retryable = isinstance(error, (groq.APIConnectionError, httpx.TransportError, ConnectionError))
+        return LLMError(f"API error: {str(error)}", status_code=502 if retryable else 500, retryable=retryable)
+
+    response = getattr(error, "response", None)
+    retry_after = _parse_retry_after(response.headers.get("retry-after")) if response is not None else None
+    retryable = status in PROVIDER_FAILURE_STATUSES or status >= 500
+    return LLMError(
+        f"API error: {str(error)}",
+        status_code=429 if status == 429 else 502,
+        retryable=retryable,
+        retry_after=retry_after,
+        upstream_status=status
+    )
+
 class GroqClient:
-    def __init__(self, api_key=None, model=None):
-        api_key = api_key or GROQ_API_KEY
-        
-        # Debug logging
-        logger.info(f"Initializing GroqClient in src/llm/client.py")
-        logger.info(f"API key available: {bool(api_key)}")
-        
-        try:
-            # The Groq client should be already patched
-            self.client = Groq(api_key=api_key)
-            logger.info("Groq client initialized successfully in src/llm/client.py")
-        except Exception as e:
-            logger.error(f"Error initializing Groq client in src/llm/client.py: {e}")
-            raise e
-            
+    """Asynchronous LLM client with a per-process concurrency cap
+
+    Talks to Groq by default; with several providers configured, each
+    attempt goes to the fastest healthy one (see ProviderRouter).
+    """
+
+    def __init__(self, api_key=None, model=None, max_concurrency=None, base_url=None, providers=None):
+        self.api_key = api_key or GROQ_API_KEY
+        self.base_url = base_url or GROQ_BASE_URL
+        # Explicit Groq credentials mean a single Groq provider
+        if providers is None:
+            providers = LLM_PROVIDERS if api_key is None and base_url is None else [
+                {"name": "groq", "kind": "groq", "base_url": self.base_url, "api_key": self.api_key}
+            ]
+        self.providers = ProviderRouter([
+            Provider(
+                failure_threshold=LLM_PROVIDER_FAILURE_THRESHOLD,
+                reset_timeout=LLM_PROVIDER_RESET_SECONDS,
+                **config
+            )
+            for config in providers
+        ])
         # Use the model from config or a hardcoded default
         self.model = model or GROQ_MODEL or "llama3-8b-8192"
+        # An explicit model pins the client to that single tier
+        self.cascade = ModelCascade(
+            [model] if model else (LLM_MODEL_TIERS or [self.model]),
+            max_simple_chars=LLM_CASCADE_MAX_SIMPLE_CHARS,
+            complex_agents=LLM_CASCADE_COMPLEX_AGENTS,
+        )
+        self.max_concurrency = max_concurrency or LLM_MAX_CONCURRENCY
+
+        # Bounds the number of overlapping upstream calls; extra callers wait
+        # on the event loop instead of blocking it
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.coalesce_requests = LLM_COALESCE_REQUESTS
+        self._singleflight = SingleFlight()
+        self.resilience = ResilientCaller(
+            deadline=LLM_DEADLINE_SECONDS,
+            max_retries=LLM_MAX_RETRIES,
+            base_delay=LLM_RETRY_BASE_DELAY,
+            max_delay=LLM_RETRY_MAX_DELAY,
+            hedge=LLM_HEDGE_REQUESTS,
+        )
+        self.breaker = CircuitBreaker(LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS)
+        self.tokens = TokenMeter()
+        # Orders calls by priority class within the provider's RPM/TPM quota
+        self.scheduler = LLMScheduler(LLM_RATE_LIMIT_RPM, LLM_RATE_LIMIT_TPM)
+        transport.add_response_listener(self._observe_response)
+        metrics.register("llm", self.stats)
+        metrics.register("llm_tokens", self.tokens.stats)
+        metrics.register("llm_scheduler", self.scheduler.stats)
+
+        logger.info(f"Initializing GroqClient (max concurrency: {self.max_concurrency})")
+        logger.info(f"API key available: {bool(self.api_key)}")
+        logger.info(f"LLM providers: {', '.join(p.name for p in self.providers.providers)}")
+
+        # Only initialize at creation if a provider is configured
+        if any(p.configured for p in self.providers.providers):
+            self._initialize_client()
+
+    @property
+    def client(self):
+        """SDK client of the first configured provider"""
+        primary = self.providers.primary
+        return primary.client if primary is not None else None
+
+    @client.setter
+    def client(self, value):
+        self.providers.primary.client = value
 
-    async def generate_response(self, messages, system_prompt=None):
-        """Generate a response from the Groq API"""
+    def _initialize_client(self):
+        """Initialize an SDK client for every configured provider"""
+        initialized = False
+        for provider in self.providers.providers:
+            if provider.client is not None or not provider.configured:
+                initialized = initialized or provider.client is not None
+                continue
+            try:
+                # Use the shared pooled transport (this also stops the SDK building
+                # a client with arguments newer httpx releases no longer accept)
+                provider.initialize(transport.get_http_client())
+                logger.info(f"LLM provider '{provider.name}' initialized successfully")
+                initialized = True
+            except Exception as e:
+                logger.error(f"Failed to initialize LLM provider '{provider.name}': {e}")
+        return initialized
+
+    def _observe_response(self, response):
+        """Feed the first provider's rate-limit headers to the scheduler"""
+        primary = self.providers.primary
+        if primary is not None and primary.client is not None and response.url.host == primary.host:
+            self.scheduler.observe_headers(response.headers)
+
+    async def warm_up(self, connections=None):
+        """Open pooled connections to every provider ahead of the first request"""
+        connections = LLM_WARMUP_CONNECTIONS if connections is None else connections
+        if connections <= 0 or (not self.client and not self._initialize_client()):
+            return 0
+        opened = 0
+        for provider in self.providers.providers:
+            if provider.client is None or not provider.configured:
+                continue
+            try:
+                opened += await transport.warm_up(provider.models_url, connections, headers=provider.auth_headers)
+            except Exception as e:
+                # Warm-up is an optimisation; never let it stop the server starting
+                logger.warning(f"Could not warm up LLM provider '{provider.name}': {e}")
+        return opened
+
+    @staticmethod
+    def _format_messages(messages, system_prompt=None):
+        """Build the chat completion message list"""
         formatted_messages = []
-        
+
         # Add system prompt if provided
         if system_prompt:
             formatted_messages.append({"role": "system", "content": system_prompt})
-        
+
         # Add user messages
         for message in messages:
             formatted_messages.append({
                 "role": message.get("role", "user"),
                 "content": message.get("content", "")
             })
-        
-        # Call Groq API
+
+        return formatted_messages
+
+    async def generate_response(self, messages, system_prompt=None, agent=None, validate=None, priority=INTERACTIVE):
+        """Generate a response from the Groq API
+
+        Args:
+            messages: Chat messages as dicts with role and content
+            system_prompt: Optional system prompt placed first
+            agent: Name of the calling agent, used for routing and token accounting
+            validate: Optional callable returning False for an unusable answer,
+                which escalates the request to the next model tier
+            priority: Scheduler class; "background" work yields to "interactive"
+        """
+        # Ensure client is initialized
+        if not self.client and not self._initialize_client():
+            raise ValueError("GROQ_API_KEY is not configured or invalid")
+
+        formatted_messages = self._format_messages(messages, system_prompt)
+        tier = self.cascade.choose(agent, formatted_messages)
+
+        # Identical prompts already in flight share one upstream call
+        if self.coalesce_requests:
+            key = request_key(self.cascade.tiers[tier], formatted_messages)
+            return await self._singleflight.do(
+                key, lambda: self._complete_cascade(formatted_messages, tier, agent, validate, priority)
+            )
+        return await self._complete_cascade(formatted_messages, tier, agent, validate, priority)
+
+    async def _complete_cascade(self, formatted_messages, tier, agent=None, validate=None, priority=INTERACTIVE):
+        """Complete on the chosen tier, moving up while the answer fails validation"""
+        while True:
+            model = self.cascade.tiers[tier]
+            start = time.perf_counter()
+            content = await self._complete(formatted_messages, agent, model, priority)
+            self.cascade.record_latency(tier, time.perf_counter() - start)
+            if validate is None or validate(content):
+                return content
+            next_tier = self.cascade.escalate(tier, agent)
+            if next_tier is None:
+                # The largest model's answer is returned for the caller to handle
+                return content
+            tier = next_tier
+
+    async def _complete(self, formatted_messages, agent=None, model=None, priority=INTERACTIVE):
+        """Make one chat completion call under the concurrency cap"""
+        # Fail fast while the provider is known to be down
+        if not self.breaker.allow_request():
+            raise CircuitOpenError()
+        await self._schedule(formatted_messages, priority)
+
+        # Call Groq API without blocking the event loop
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                completion = await self.resilience.call(self._attempts(
+                    formatted_messages, priority, lambda: self._create(formatted_messages, model)
+                ))
+            except asyncio.TimeoutError as e:
+                logger.error(f"Groq API deadline exceeded: {e}")
+                self.breaker.record_failure()
+                raise LLMError(f"API error: {str(e)}", status_code=504) from e
+            except LLMError as e:
+                self._record_error(e)
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            finally:
+                self.in_flight -= 1
+
+        self.breaker.record_success()
+        content = completion.choices[0].message.content
+        self._record_tokens(agent, formatted_messages, content, getattr(completion, "usage", None))
+        return content
+
+    @staticmethod
+    def _reserved_tokens(formatted_messages):
+        """Tokens charged to the TPM budget before the real usage is known"""
+        return estimate_message_tokens(formatted_messages) + LLM_EXPECTED_COMPLETION_TOKENS
+
+    async def _schedule(self, formatted_messages, priority):
+        """Wait for a rate-limit slot, bounded by the request deadline"""
+        try:
+            await asyncio.wait_for(
+                self.scheduler.acquire(priority, self._reserved_tokens(formatted_messages)),
+                self.resilience.deadline
+            )
+        except asyncio.TimeoutError as e:
+            # Nothing was sent, so this says nothing about provider health
+            self.breaker.release()
+            raise LLMError("Timed out waiting for LLM rate limit capacity", status_code=429) from e
+        except BaseException:
+            self.breaker.release()
+            raise
+
+    def _attempts(self, formatted_messages, priority, create):
+        """Wrap `create` so every upstream attempt is charged to the rate-limit buckets
+
+        The first attempt's slot was acquired by `_schedule` before waiting
+        for the concurrency cap. Retries and hedged requests are extra
+        upstream requests, so each takes its own slot as it starts.
+        """
+        prepaid = [True]
+
+        async def attempt():
+            if prepaid:
+                prepaid.pop()
+            else:
+                await self.scheduler.acquire(priority, self._reserved_tokens(formatted_messages))
+            return await create()
+        return attempt
+
+    def _record_tokens(self, agent, formatted_messages, content, usage=None):
+        """Record token use, preferring the provider's usage report over estimates"""
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or estimate_message_tokens(formatted_messages)
+        completion_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(content)
+        self.tokens.record(agent, prompt_tokens, completion_tokens)
+        self.scheduler.settle(self._reserved_tokens(formatted_messages), prompt_tokens + completion_tokens)
+
+    def _record_error(self, error):
+        """Count provider-side failures towards opening the circuit"""
+        if error.provider_failure:
+            self.breaker.record_failure()
+        else:
+            # The provider answered; the request itself was rejected
+            self.breaker.release()
+
+    async def _create(self, formatted_messages, model=None, **kwargs):
+        """Single chat completion attempt against the fastest healthy provider"""
+        provider = self.providers.choose()
+        if provider is None:
+            raise LLMError("No healthy LLM provider available", status_code=503)
+
+        start = time.perf_counter()
+        token = provider.begin()
         try:
-            completion = self.client.chat.completions.create(
+            result = await provider.client.chat.completions.create(
                 messages=formatted_messages,
-                model=self.model,
+                model=provider.model or model or self.model,
+                **kwargs
             )
-            return completion.choices[0].message.content
         except Exception as e:
-            logger.error(f"Error calling Groq API: {e}")
-            raise e
+            provider.end(token)
+            error = self._record_provider_error(provider, e)
+            log = logger.warning if error.retryable else logger.error
+            log(f"Error calling LLM provider '{provider.name}': {e}")
+            raise error from e
+        except BaseException:
+            # Cancelled, e.g. the losing side of a hedged request
+            provider.end(token)
+            provider.breaker.release()
+            raise
+        if kwargs.get("stream"):
+            # A stream's health and latency are only known once it has been read to the end
+            return self._track_stream(result, provider, token, start)
+        provider.end(token)
+        self.providers.record_success(provider, time.perf_counter() - start)
+        return result
+
+    def _record_provider_error(self, provider, error):
+        """Update a provider's health after a failed request; returns the LLMError"""
+        error = _to_llm_error(error)
+        if error.provider_failure:
+            # The next attempt fails over to another provider
+            self.providers.record_failure(provider)
+        else:
+            # The provider answered and rejected this request; it is still healthy
+            provider.breaker.release()
+        return error
+
+    async def _track_stream(self, stream, provider, token, start):
+        """Yield a provider stream's chunks, then record its outcome and full duration"""
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            self._record_provider_error(provider, e)
+            raise
+        except BaseException:
+            # The reader stopped early or was cancelled; says nothing about the provider
+            provider.breaker.release()
+            raise
+        else:
+            self.providers.record_success(provider, time.perf_counter() - start)
+        finally:
+            provider.end(token)
+
+    async def stream_response(self, messages, system_prompt=None, agent=None, priority=INTERACTIVE):
+        """Yield response text from the Groq API as tokens arrive"""
+        # Ensure client is initialized
+        if not self.client and not self._initialize_client():
+            raise ValueError("GROQ_API_KEY is not configured or invalid")
+
+        formatted_messages = self._format_messages(messages, system_prompt)
+        tier = self.cascade.choose(agent, formatted_messages)
+
+        if not self.breaker.allow_request():
+            raise CircuitOpenError()
+        await self._schedule(formatted_messages, priority)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                # Retries cover opening the stream; tokens already sent cannot be replayed
+                start = time.perf_counter()
+                stream = await self.resilience.call(
+                    self._attempts(
+                        formatted_messages, priority,
+                        lambda: self._create(formatted_messages, self.cascade.tiers[tier], stream=True)
+                    ),
+                    hedge=False
+                )
+                parts = []
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    # The final chunk of some providers carries an empty delta
+                    delta = getattr(chunk.choices[0].delta, "content", None)
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            except asyncio.TimeoutError as e:
+                logger.error(f"Groq API deadline exceeded: {e}")
+                self.breaker.record_failure()
+                raise LLMError(f"API error: {str(e)}", status_code=504) from e
+            except LLMError as e:
+                self._record_error(e)
+                raise
+            except Exception as e:
+                logger.error(f"Error streaming from Groq API: {e}")
+                error = _to_llm_error(e)
+                self._record_error(error)
+                raise error from e
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                self.cascade.record_latency(tier, time.perf_counter() - start)
+                self._record_tokens(agent, formatted_messages, "".join(parts))
+            finally:
+                self.in_flight -= 1
+
+    def stats(self):
+        """Return concurrency, coalescing, retry, circuit breaker and transport stats"""
+        return {
+            "model": self.model,
+            "cascade": self.cascade.stats(),
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "single_flight": self._singleflight.stats(),
+            "resilience": self.resilience.stats(),
+            "circuit_breaker": self.breaker.stats(),
+            "providers": self.providers.stats(),
+            "transport": transport.stats(),
+        }
 
-# Create a singleton instance
-groq_client = GroqClient() 
\ No newline at end of file
+# Create a singleton instance shared by every agent in the process
+groq_client = GroqClient()
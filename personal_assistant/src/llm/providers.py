@@ -0,0 +1,262 @@
+import itertools
+import json
+import logging
+import random
+import time
+from types import SimpleNamespace
+import groq
+import httpx
+from src.llm.circuit_breaker import CircuitBreaker
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ProviderStatusError(Exception):
+    """HTTP error from an OpenAI-compatible endpoint, shaped like the Groq SDK's"""
+
+    def __init__(self, response):
+        super().__init__(f"Error code: {response.status_code} - {response.text[:200]}")
+        self.status_code = response.status_code
+        self.response = response
+
+def _namespace(value):
+    """Turn decoded JSON into attribute-style objects like the SDK's models"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+class _ChunkStream:
+    """Async iterator over the chunks of a server-sent event completion stream"""
+
+    def __init__(self, response):
+        self.response = response
+
+    async def __aiter__(self):
+        try:
+            async for line in self.response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                yield _namespace(json.loads(data))
+        finally:
+            await self.response.aclose()
+
+class _ChatCompletions:
+    def __init__(self, client):
+        self._client = client
+
+    async def create(self, messages, model, stream=False, **kwargs):
+        client = self._client
+        request = client.http_client.build_request(
+            "POST",
+            f"{client.base_url}/chat/completions",
+            json={"messages": messages, "model": model, "stream": stream, **kwargs},
+            headers=client.headers,
+        )
+        response = await client.http_client.send(request, stream=True)
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+            raise ProviderStatusError(response)
+        if stream:
+            return _ChunkStream(response)
+        await response.aread()
+        await response.aclose()
+        return _namespace(response.json())
+
+class OpenAICompatibleClient:
+    """Minimal async client for any OpenAI-compatible chat completions API
+
+    Exposes the same `chat.completions.create` surface as the Groq SDK, so
+    local servers (vLLM, Ollama, llama.cpp) and other hosted providers can
+    be used interchangeably. `base_url` includes the version prefix, e.g.
+    http://localhost:11434/v1.
+    """
+
+    def __init__(self, base_url, api_key=None, http_client=None):
+        self.base_url = httpx.URL(base_url.rstrip("/"))
+        self.http_client = http_client or httpx.AsyncClient()
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.chat = SimpleNamespace(completions=_ChatCompletions(self))
+
+    @property
+    def models_url(self):
+        return f"{self.base_url}/models"
+
+class Provider:
+    """One LLM endpoint with its own health and latency statistics"""
+
+    def __init__(self, name, kind="openai", base_url=None, api_key=None, model=None,
+                 failure_threshold=3, reset_timeout=15.0):
+        self.name = name
+        self.kind = kind
+        self.base_url = base_url
+        self.api_key = api_key
+        # Overrides the requested model, for endpoints that name models differently
+        self.model = model
+        self.client = None
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.ewma_latency = None
+        self.requests = 0
+        self.errors = 0
+        self._in_flight = {}
+        self._tokens = itertools.count()
+
+    def begin(self):
+        """Mark a request as sent; returns a token for `end`"""
+        token = next(self._tokens)
+        self._in_flight[token] = time.monotonic()
+        return token
+
+    def end(self, token):
+        self._in_flight.pop(token, None)
+
+    def expected_latency(self):
+        """Smoothed latency, raised by any request already outstanding for longer
+
+        A provider that has just become slow has not reported a slow answer
+        yet; the age of its oldest outstanding request shows it straight away.
+        """
+        oldest = min(self._in_flight.values(), default=None)
+        waited = time.monotonic() - oldest if oldest is not None else 0.0
+        return max(self.ewma_latency or 0.0, waited)
+
+    @property
+    def configured(self):
+        return bool(self.api_key) if self.kind == "groq" else bool(self.base_url)
+
+    def initialize(self, http_client):
+        """Create the SDK client for this endpoint"""
+        if self.kind == "groq":
+            # Retries are handled by ResilientCaller, so the SDK's own are disabled
+            self.client = groq.AsyncGroq(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
+        else:
+            self.client = OpenAICompatibleClient(self.base_url, self.api_key, http_client)
+        return self.client
+
+    @property
+    def host(self):
+        return self.client.base_url.host if self.client is not None else None
+
+    @property
+    def models_url(self):
+        if self.kind == "groq":
+            return self.client.base_url.join("openai/v1/models")
+        return self.client.models_url
+
+    @property
+    def auth_headers(self):
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def stats(self):
+        p50, p95 = self.latency.percentile(0.5), self.latency.percentile(0.95)
+        return {
+            "kind": self.kind,
+            "model": self.model,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 3) if self.requests else 0.0,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "in_flight": len(self._in_flight),
+            "circuit_breaker": self.breaker.stats(),
+        }
+
+class ProviderRouter:
+    """Routes each attempt to the fastest healthy provider
+
+    Providers are ranked by an exponentially weighted moving average of
+    their latency, raised by the age of any request still outstanding; one
+    that has not answered yet ranks first so it gets measured. A provider's
+    own circuit breaker takes it out of rotation after consecutive
+    failures, so a retry fails over to the next provider mid-incident; once
+    its reset window passes, the next attempt probes it and a success
+    brings it back into rotation. A small share of traffic explores the
+    other healthy providers to keep their latency current. Streams are
+    measured from the request to their last chunk.
+    """
+
+    def __init__(self, providers, explore_ratio=0.05, smoothing=0.2, seed=None):
+        self.providers = list(providers)
+        self.explore_ratio = explore_ratio
+        self.smoothing = smoothing
+        self._rng = random.Random(seed)
+        self.rerouted = 0
+
+    @property
+    def primary(self):
+        return self.providers[0] if self.providers else None
+
+    @staticmethod
+    def _rank(provider):
+        breaker = provider.breaker
+        if breaker.probe_due():
+            health = 0
+        elif breaker.state == CircuitBreaker.CLOSED:
+            health = 1
+        else:
+            health = 2
+        # A recent failure moves a provider behind its peers before its circuit opens
+        return health, breaker.consecutive_failures, provider.expected_latency()
+
+    def _ranked(self):
+        return sorted((p for p in self.providers if p.client is not None), key=self._rank)
+
+    @staticmethod
+    def _healthy(provider):
+        return provider.breaker.state == CircuitBreaker.CLOSED and not provider.breaker.consecutive_failures
+
+    def choose(self):
+        """Return the provider for the next attempt, or None if none is usable
+
+        `rerouted` counts attempts sent elsewhere because the provider that
+        latency alone would pick is failing, not exploration or probes.
+        """
+        ranked = self._ranked()
+        preferred = min(
+            (p for p in self.providers if p.client is not None), key=lambda p: p.expected_latency(), default=None
+        )
+        if len(ranked) > 1 and self._rng.random() < self.explore_ratio:
+            healthy = [p for p in ranked[1:] if p.breaker.state == CircuitBreaker.CLOSED]
+            if healthy:
+                ranked.insert(0, ranked.pop(ranked.index(self._rng.choice(healthy))))
+        for provider in ranked:
+            if provider.breaker.allow_request():
+                if provider is not preferred and not self._healthy(preferred):
+                    self.rerouted += 1
+                return provider
+        return None
+
+    def record_success(self, provider, seconds):
+        provider.requests += 1
+        provider.latency.record(seconds)
+        provider.ewma_latency = seconds if provider.ewma_latency is None else (
+            self.smoothing * seconds + (1 - self.smoothing) * provider.ewma_latency
+        )
+        provider.breaker.record_success()
+
+    def record_failure(self, provider):
+        provider.requests += 1
+        provider.errors += 1
+        provider.breaker.record_failure()
+        if provider.breaker.state == CircuitBreaker.OPEN:
+            logger.warning(f"LLM provider '{provider.name}' taken out of rotation")
+
+    def stats(self):
+        return {
+            "order": [p.name for p in self._ranked()],
+            "rerouted": self.rerouted,
+            "providers": {p.name: p.stats() for p in self.providers},
+        }
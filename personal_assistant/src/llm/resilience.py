@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import random
+import time
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ResilientCaller:
+    """Runs an async call under a deadline with retries and optional hedging
+
+    Failed attempts are retried with exponential backoff and full jitter while
+    the error is retryable and the deadline allows it. A `retry_after` value
+    on the error (taken from the provider's Retry-After header) replaces the
+    computed backoff. With hedging on, an attempt still running after the
+    observed p95 latency is raced against a second identical attempt; hedges
+    are capped at `max_hedge_ratio` of calls so they cannot exhaust the
+    provider's rate limit.
+    """
+
+    def __init__(
+        self,
+        deadline=30.0,
+        max_retries=2,
+        base_delay=0.5,
+        max_delay=8.0,
+        hedge=False,
+        hedge_percentile=0.95,
+        hedge_min_samples=20,
+        max_hedge_ratio=0.1,
+    ):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _hedge_delay(self):
+        """Seconds to wait before hedging, or None if hedging is not allowed now"""
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        if self.hedges >= self.max_hedge_ratio * self.calls:
+            return None
+        return self.latency.percentile(self.hedge_percentile)
+
+    async def call(self, func, hedge=True):
+        """Run `func()` until it succeeds, fails permanently or the deadline passes
+
+        Args:
+            func: Zero-argument callable returning an awaitable
+            hedge: Allow hedging for this call (disable for non-idempotent work)
+
+        Raises:
+            asyncio.TimeoutError: The deadline passed before any attempt succeeded
+            Exception: The last error from `func` when it is not retryable or
+                retries are exhausted
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + self.deadline
+
+        attempt = 0
+        while True:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                self.deadline_exceeded += 1
+                raise asyncio.TimeoutError(f"LLM deadline of {self.deadline}s exceeded")
+            try:
+                return await asyncio.wait_for(self._attempt(func, hedge), remaining)
+            except asyncio.TimeoutError:
+                self.deadline_exceeded += 1
+                raise
+            except Exception as e:
+                if not getattr(e, "retryable", False) or attempt >= self.max_retries:
+                    raise
+                retry_after = getattr(e, "retry_after", None)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if delay >= deadline_at - loop.time():
+                    raise
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"Retrying LLM call in {delay:.2f}s (attempt {attempt + 1}): {e}")
+                await asyncio.sleep(delay)
+
+    async def _timed(self, func):
+        start = time.perf_counter()
+        result = await func()
+        self.latency.record(time.perf_counter() - start)
+        return result
+
+    async def _attempt(self, func, hedge):
+        hedge_delay = self._hedge_delay() if hedge else None
+        primary = asyncio.ensure_future(self._timed(func))
+        if hedge_delay is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(self._timed(func)))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self):
+        """Return retry, hedging and latency counters"""
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
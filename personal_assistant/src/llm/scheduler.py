@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITY_CLASSES = (INTERACTIVE, BACKGROUND)
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+def parse_reset(value):
+    """Convert a rate-limit reset header ("7.66s", "2m59.56s", "120ms") to seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+class TokenBucket:
+    """Per-minute allowance refilled continuously; a limit of 0 means unlimited"""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    @property
+    def unlimited(self):
+        return self.capacity <= 0
+
+    def _refill(self, now):
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def configure(self, per_minute, now):
+        """Adopt a limit learned from the provider"""
+        self._refill(now)
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+
+    def wait_time(self, amount, now, headroom=0.0):
+        """Seconds until `amount` can be taken while leaving `headroom` (fraction of capacity)"""
+        blocked = max(self._blocked_until - now, 0.0)
+        if self.unlimited:
+            return blocked
+        self._refill(now)
+        # Requests larger than the whole bucket only wait for it to be full
+        shortfall = min(amount + headroom * self.capacity, self.capacity) - self.level
+        return max(blocked, shortfall * 60 / self.capacity if shortfall > 0 else 0.0)
+
+    def take(self, amount, now):
+        if not self.unlimited:
+            self._refill(now)
+            self.level -= amount
+
+    def refund(self, amount):
+        """Return (or, if negative, charge) the difference between reserved and actual use"""
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + amount)
+
+    def sync(self, remaining, reset_seconds, now):
+        """Adopt the provider's view of the remaining allowance"""
+        if remaining is not None and not self.unlimited:
+            self._refill(now)
+            self.level = min(self.level, float(remaining))
+        if remaining is not None and remaining <= 0 and reset_seconds:
+            self._blocked_until = max(self._blocked_until, now + reset_seconds)
+
+    def block(self, seconds, now):
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def stats(self):
+        return {
+            "limit_per_minute": self.capacity if not self.unlimited else None,
+            "available": round(self.level, 1) if not self.unlimited else None,
+        }
+
+class LLMScheduler:
+    """Orders LLM calls by priority class within RPM and TPM budgets
+
+    Every upstream attempt, retries and hedged requests included, acquires
+    one request and its estimated tokens; only the attempt that succeeds is
+    settled against the reported usage. When the buckets are empty, callers
+    queue; the queue is served strictly by priority class and first-come
+    within a class, so a burst of background feedback analysis never delays
+    an interactive chat answer by more than the call already being
+    dispatched. Background calls also leave `background_headroom` of each
+    bucket untouched so an interactive call arriving after a burst finds
+    capacity waiting. Rate-limit headers and 429 Retry-After values from the
+    provider pull the local buckets down to the provider's numbers, and an
+    unconfigured TPM limit is learned from x-ratelimit-limit-tokens, so the
+    limits self-tune.
+    """
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, background_headroom=0.2):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.background_headroom = background_headroom
+        self._queue = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._dispatcher = None
+        self._waits = {name: LatencyTracker() for name in PRIORITY_CLASSES}
+        self._counts = {name: {"granted": 0, "queued": 0, "max_wait_ms": 0.0} for name in PRIORITY_CLASSES}
+        self.header_updates = 0
+
+    def _wait_time(self, priority, tokens, now):
+        headroom = self.background_headroom if priority == BACKGROUND else 0.0
+        return max(self.requests.wait_time(1, now, headroom), self.tokens.wait_time(tokens, now, headroom))
+
+    def _grant(self, priority, tokens, waited):
+        now = time.monotonic()
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        self._waits[priority].record(waited)
+        counts = self._counts[priority]
+        counts["granted"] += 1
+        counts["max_wait_ms"] = max(counts["max_wait_ms"], round(waited * 1000, 1))
+
+    async def acquire(self, priority=INTERACTIVE, tokens=0):
+        """Wait until a call of this class and estimated size may be sent"""
+        priority = priority if priority in self._waits else INTERACTIVE
+        now = time.monotonic()
+        if not self._queue and self._wait_time(priority, tokens, now) <= 0:
+            self._grant(priority, tokens, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        rank = PRIORITY_CLASSES.index(priority)
+        heapq.heappush(self._queue, (rank, next(self._sequence), now, priority, tokens, future))
+        self._counts[priority]["queued"] += 1
+        self._ensure_dispatcher()
+        await future
+
+    def settle(self, reserved_tokens, actual_tokens):
+        """Correct the token bucket once the real usage is known"""
+        self.tokens.refund(reserved_tokens - actual_tokens)
+
+    def _ensure_dispatcher(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Release queued callers in priority order as the buckets refill"""
+        while self._queue:
+            rank, sequence, queued_at, priority, tokens, future = self._queue[0]
+            if future.done():
+                # The caller gave up (deadline or cancellation)
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            wait = self._wait_time(priority, tokens, now)
+            if wait <= 0:
+                heapq.heappop(self._queue)
+                self._grant(priority, tokens, now - queued_at)
+                future.set_result(None)
+                continue
+            # Sleep until the head can go, or until a more urgent caller arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def observe_headers(self, headers):
+        """Self-tune from the provider's x-ratelimit-* and retry-after headers"""
+        limit_tokens = headers.get("x-ratelimit-limit-tokens")
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        retry_after = headers.get("retry-after")
+        if remaining_requests is None and remaining_tokens is None and retry_after is None:
+            return
+        now = time.monotonic()
+        try:
+            # Groq reports tokens per minute (its request limit is per day)
+            if limit_tokens is not None and self.tokens.unlimited:
+                self.tokens.configure(float(limit_tokens), now)
+                logger.info(f"LLM scheduler learned a limit of {limit_tokens} tokens per minute")
+            if remaining_requests is not None:
+                self.requests.sync(
+                    float(remaining_requests), parse_reset(headers.get("x-ratelimit-reset-requests")), now
+                )
+            if remaining_tokens is not None:
+                self.tokens.sync(
+                    float(remaining_tokens), parse_reset(headers.get("x-ratelimit-reset-tokens")), now
+                )
+        except ValueError:
+            logger.debug("Ignoring malformed rate-limit headers")
+        pause = parse_reset(retry_after)
+        if pause:
+            self.pause(pause)
+        self.header_updates += 1
+
+    def pause(self, seconds):
+        """Hold every class for `seconds`, e.g. after a 429"""
+        self.requests.block(seconds, time.monotonic())
+        logger.warning(f"LLM scheduler paused for {seconds:.2f}s by provider rate limit")
+
+    def stats(self):
+        """Return bucket levels, queue depth and queueing delay per class"""
+        classes = {}
+        for name in PRIORITY_CLASSES:
+            waits = self._waits[name]
+            p50, p95 = waits.percentile(0.5), waits.percentile(0.95)
+            classes[name] = dict(
+                self._counts[name],
+                waiting=sum(1 for entry in self._queue if entry[3] == name and not entry[5].done()),
+                wait_p50_ms=round(p50 * 1000, 1) if p50 is not None else None,
+                wait_p95_ms=round(p95 * 1000, 1) if p95 is not None else None,
+            )
+        return {
+            "requests": self.requests.stats(),
+            "tokens": self.tokens.stats(),
+            "classes": classes,
+            "header_updates": self.header_updates,
+        }
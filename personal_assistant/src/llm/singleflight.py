@@ -0,0 +1,56 @@
+import asyncio
+import hashlib
+import json
+
+def request_key(model, messages):
+    """Stable key for a completion request (model plus formatted messages)"""
+    serialized = json.dumps([model, messages], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task and receive its result or exception. A
+    caller being cancelled does not cancel the shared work for the others.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Run `func()` once per key among overlapping callers
+
+        Args:
+            key: Hashable identity of the request
+            func: Zero-argument callable returning an awaitable
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        """Return call, execution and coalescing counters"""
+        return {
+            "calls": self.calls,
+            "upstream_executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight_keys": len(self._in_flight),
+        }
@@ -0,0 +1,110 @@
+import logging
+import re
+import threading
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Runs of whitespace, words, or single punctuation characters
+_PIECE_RE = re.compile(r"\s{2,}|\w+|[^\w\s]")
+
+# Approximate per-message overhead of the chat template (role markers etc.)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_tokens(text):
+    """Estimate the BPE token count of a string without a model tokenizer
+
+    Short words are one token, longer words add one token per six
+    characters, and punctuation and indentation runs are one token each.
+    This tracks Llama/GPT-style tokenizers closely enough for budgeting.
+    """
+    if not text:
+        return 0
+    count = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        if piece[0].isalnum() or piece[0] == "_":
+            count += 1 + (len(piece) - 1) // 6
+        else:
+            count += 1
+    return count
+
+def estimate_message_tokens(messages):
+    """Estimate prompt tokens for a list of chat messages"""
+    return sum(estimate_tokens(m.get("content", "")) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+# Profile sections from most to least important for answering visitors
+PROFILE_SECTION_PRIORITY = [
+    "name", "bio", "roles", "contact", "skills", "experience", "education", "cvExcerpts",
+    "research", "projects", "achievements", "socialProfiles", "sideComment", "greetings",
+]
+
+def fit_profile_to_budget(profile_data, budget, render):
+    """Drop the lowest-priority profile sections until the prompt fits
+
+    Args:
+        profile_data: Profile dictionary
+        budget: Maximum prompt tokens (0 or less disables trimming)
+        render: Callable turning a profile dict into the prompt string
+
+    Returns:
+        Tuple of (prompt, dropped_section_names)
+    """
+    prompt = render(profile_data)
+    if budget <= 0 or estimate_tokens(prompt) <= budget:
+        return prompt, []
+
+    rank = {name: i for i, name in enumerate(PROFILE_SECTION_PRIORITY)}
+    # Unknown sections are dropped before any listed one
+    droppable = sorted(
+        (key for key in profile_data if key != "name"),
+        key=lambda key: rank.get(key, len(rank)),
+        reverse=True,
+    )
+
+    trimmed = dict(profile_data)
+    dropped = []
+    for key in droppable:
+        del trimmed[key]
+        dropped.append(key)
+        prompt = render(trimmed)
+        if estimate_tokens(prompt) <= budget:
+            break
+    else:
+        logger.warning(f"Prompt still exceeds budget of {budget} tokens after dropping all optional sections")
+    return prompt, dropped
+
+class TokenMeter:
+    """Per-agent prompt and completion token counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents = {}
+
+    def record(self, agent, prompt_tokens, completion_tokens):
+        agent = agent or "unknown"
+        with self._lock:
+            totals = self._agents.setdefault(agent, {
+                "requests": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "max_prompt_tokens": 0,
+            })
+            totals["requests"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["max_prompt_tokens"] = max(totals["max_prompt_tokens"], prompt_tokens)
+        logger.info(f"LLM tokens [{agent}]: prompt={prompt_tokens} completion={completion_tokens}")
+
+    def stats(self):
+        """Return totals and per-request averages for each agent"""
+        with self._lock:
+            report = {}
+            for agent, totals in self._agents.items():
+                requests = totals["requests"]
+                report[agent] = dict(
+                    totals,
+                    avg_prompt_tokens=round(totals["prompt_tokens"] / requests, 1),
+                    avg_completion_tokens=round(totals["completion_tokens"] / requests, 1),
+                )
+            return report
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+import httpx
+from src.config import (
+    LLM_POOL_MAX_CONNECTIONS, LLM_POOL_MAX_KEEPALIVE, LLM_POOL_KEEPALIVE_EXPIRY,
+    LLM_HTTP2, LLM_CONNECT_TIMEOUT, LLM_DEADLINE_SECONDS
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_http_client = None
+_http2_enabled = False
+_warmup = {"connections": 0, "seconds": None, "error": None}
+_response_listeners = []
+
+def _http2_available():
+    """HTTP/2 needs the optional `h2` package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def add_response_listener(listener):
+    """Call `listener(response)` for every response, before its body is read"""
+    if listener not in _response_listeners:
+        _response_listeners.append(listener)
+
+async def _notify_listeners(response):
+    for listener in _response_listeners:
+        try:
+            listener(response)
+        except Exception as e:
+            logger.warning(f"LLM response listener failed: {e}")
+
+def get_http_client():
+    """Return the process-wide pooled HTTP client used for LLM calls"""
+    global _http_client, _http2_enabled
+    if _http_client is None or _http_client.is_closed:
+        http2 = LLM_HTTP2
+        if http2 and not _http2_available():
+            logger.warning("LLM_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        _http2_enabled = http2
+
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=LLM_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(LLM_DEADLINE_SECONDS, connect=LLM_CONNECT_TIMEOUT),
+            event_hooks={"response": [_notify_listeners]},
+        )
+        logger.info(
+            f"LLM transport created (HTTP/2: {http2}, max connections: {LLM_POOL_MAX_CONNECTIONS}, "
+            f"keep-alive: {LLM_POOL_MAX_KEEPALIVE} for {LLM_POOL_KEEPALIVE_EXPIRY}s)"
+        )
+    return _http_client
+
+async def warm_up(url, connections=1, headers=None):
+    """Open pooled connections to the provider before serving traffic
+
+    Issues `connections` concurrent lightweight requests so the TLS handshakes
+    happen now rather than on the first visitor's request. Any HTTP response,
+    including an auth error, means the connection is established.
+
+    Returns:
+        Number of connections successfully opened
+    """
+    client = get_http_client()
+    start = time.perf_counter()
+
+    async def probe():
+        response = await client.get(url, headers=headers)
+        await response.aclose()
+
+    results = await asyncio.gather(*(probe() for _ in range(connections)), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, Exception)]
+    opened = len(results) - len(errors)
+
+    _warmup["connections"] = opened
+    _warmup["seconds"] = round(time.perf_counter() - start, 3)
+    _warmup["error"] = str(errors[0]) if errors else None
+    if errors:
+        logger.warning(f"LLM transport warm-up opened {opened}/{connections} connections: {errors[0]}")
+    else:
+        logger.info(f"LLM transport warm-up opened {opened} connections in {_warmup['seconds']}s")
+    return opened
+
+async def close():
+    """Close the shared HTTP client"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+def stats():
+    """Return pool configuration and warm-up results"""
+    return {
+        "http2": _http2_enabled,
+        "max_connections": LLM_POOL_MAX_CONNECTIONS,
+        "max_keepalive_connections": LLM_POOL_MAX_KEEPALIVE,
+        "keepalive_expiry": LLM_POOL_KEEPALIVE_EXPIRY,
+        "warmup": dict(_warmup),
+    }
@@ -10,10 +10,13 @@ class AgentType(str, Enum):
 class ChatMessage(BaseModel):
     content: str
     role: str = "user"
+    # Client-chosen conversation id; messages sharing one get multi-turn context
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     content: str
     agent: AgentType
+    session_id: Optional[str] = None
 
 class FeedbackRequest(BaseModel):
     message: str
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    leased_until REAL NOT NULL DEFAULT 0,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (dead, available_at, id);
+"""
+
+class QueueFullError(Exception):
+    """Raised when a job cannot be enqueued because the queue stayed full"""
+
+class DurableQueue:
+    """Persistent, bounded work queue processed by a fixed pool of workers
+
+    Jobs are JSON payloads stored in SQLite (WAL mode), so they survive a
+    restart. `put` waits up to `put_timeout` seconds for room once
+    `max_size` jobs are waiting and then raises QueueFullError, pushing back
+    on the producer instead of growing without bound. Each of `workers`
+    tasks claims one job at a time under a lease and deletes it only after
+    `handler(payload)` returns a truthy value, so delivery is at-least-once:
+    a job whose worker crashed or whose process died is handed out again once
+    its lease expires (at once after a restart). Failures are retried with
+    exponential backoff and full jitter; after `max_attempts` the job is kept
+    as dead for inspection instead of being retried forever.
+    """
+
+    # Longest an idle worker sleeps before checking the table again
+    IDLE_POLL_SECONDS = 5.0
+
+    def __init__(
+        self,
+        path,
+        handler,
+        name="queue",
+        workers=2,
+        max_size=1000,
+        max_attempts=5,
+        base_delay=2.0,
+        max_delay=300.0,
+        lease_seconds=60.0,
+        put_timeout=1.0,
+    ):
+        self.path = path
+        self.handler = handler
+        self.name = name
+        self.workers = workers
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.put_timeout = put_timeout
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        self._tasks = []
+        self._ready = None
+        self._space = None
+        self.latency = LatencyTracker(1000)
+        self.enqueued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.rejected = 0
+        self.recovered = self._recover()
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync survives process crashes; only an OS crash can lose the last commits
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        return db
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _recover(self):
+        """Release the leases of a previous process so its unfinished jobs run again"""
+        with self._lock:
+            cursor = self._db.execute("UPDATE jobs SET leased_until = 0 WHERE leased_until > 0 AND dead = 0")
+            recovered = cursor.rowcount
+        if recovered:
+            logger.info(f"{self.name}: re-queued {recovered} jobs left in flight by the last run")
+        return recovered
+
+    def depth(self):
+        """Jobs waiting or in flight (dead jobs excluded)"""
+        return self._execute("SELECT COUNT(*) FROM jobs WHERE dead = 0")[0][0]
+
+    def start(self):
+        """Start the worker pool on the running event loop"""
+        if self._tasks:
+            return
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._ready.set()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; jobs in flight stay queued and run again next start"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(self._recover)
+
+    async def put(self, payload):
+        """Persist a job; waits for room while the queue is full, then raises QueueFullError"""
+        if not self._tasks:
+            self.start()
+        data = json.dumps(payload)
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.put_timeout
+        while True:
+            if await asyncio.to_thread(self._insert, data):
+                self.enqueued += 1
+                self._ready.set()
+                return
+            remaining = give_up_at - loop.time()
+            if remaining <= 0:
+                self.rejected += 1
+                raise QueueFullError(f"{self.name} is full ({self.max_size} jobs)")
+            self._space.clear()
+            try:
+                # Short waits, so a slot freed just before clear() is not missed for long
+                await asyncio.wait_for(self._space.wait(), min(remaining, 0.1))
+            except asyncio.TimeoutError:
+                pass
+
+    def _insert(self, data):
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (payload, enqueued_at, available_at) "
+                "SELECT ?, ?, ? WHERE (SELECT COUNT(*) FROM jobs WHERE dead = 0) < ?",
+                (data, now, now, self.max_size),
+            )
+            return cursor.rowcount == 1
+
+    def _claim(self):
+        """Lease the oldest ready job; returns (id, payload, attempts, enqueued_at) or the seconds until one is due"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "UPDATE jobs SET leased_until = ?, attempts = attempts + 1 WHERE id = ("
+                "SELECT id FROM jobs WHERE dead = 0 AND available_at <= ? AND leased_until <= ? "
+                "ORDER BY id LIMIT 1) RETURNING id, payload, attempts, enqueued_at",
+                (now + self.lease_seconds, now, now),
+            ).fetchone()
+            if row is not None:
+                return row
+            due = self._db.execute(
+                "SELECT MIN(MAX(available_at, leased_until)) FROM jobs WHERE dead = 0"
+            ).fetchone()[0]
+        return None if due is None else max(due - now, 0.0)
+
+    def _finish(self, job_id):
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def _fail(self, job_id, attempts, error):
+        if attempts >= self.max_attempts:
+            self._execute("UPDATE jobs SET dead = 1, leased_until = 0, last_error = ? WHERE id = ?", (error, job_id))
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempts - 1))))
+        self._execute(
+            "UPDATE jobs SET available_at = ?, leased_until = 0, last_error = ? WHERE id = ?",
+            (time.time() + delay, error, job_id),
+        )
+        return delay
+
+    async def _worker(self, number):
+        while True:
+            # Cleared before looking, so a job put while we look still wakes us
+            self._ready.clear()
+            claimed = await asyncio.to_thread(self._claim)
+            if not isinstance(claimed, tuple):
+                # Nothing ready: sleep until the next job is due or a new one arrives
+                idle = self.IDLE_POLL_SECONDS if claimed is None else min(claimed, self.IDLE_POLL_SECONDS)
+                try:
+                    await asyncio.wait_for(self._ready.wait(), idle)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, data, attempts, enqueued_at = claimed
+            try:
+                ok = await self.handler(json.loads(data))
+                error = None if ok else "handler returned a failure"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                ok, error = False, str(e) or type(e).__name__
+
+            if ok:
+                await asyncio.to_thread(self._finish, job_id)
+                self.delivered += 1
+                self.latency.record(time.time() - enqueued_at)
+                self._space.set()
+                continue
+            delay = await asyncio.to_thread(self._fail, job_id, attempts, error)
+            if delay is None:
+                self.dead_lettered += 1
+                self._space.set()
+                logger.error(f"{self.name}: job {job_id} failed {attempts} times, giving up: {error}")
+            else:
+                self.retried += 1
+                logger.warning(f"{self.name}: job {job_id} failed (attempt {attempts}), retrying in {delay:.1f}s: {error}")
+
+    def stats(self):
+        """Return queue depth, throughput counters and enqueue-to-delivery latency"""
+        pending, in_flight, dead, oldest = self._execute(
+            "SELECT "
+            "COALESCE(SUM(dead = 0 AND leased_until <= ?), 0), "
+            "COALESCE(SUM(dead = 0 AND leased_until > ?), 0), "
+            "COALESCE(SUM(dead = 1), 0), "
+            "MIN(CASE WHEN dead = 0 THEN enqueued_at END) FROM jobs",
+            (time.time(), time.time()),
+        )[0]
+        p50 = self.latency.percentile(0.5)
+        p95 = self.latency.percentile(0.95)
+        return {
+            "workers": len(self._tasks),
+            "max_size": self.max_size,
+            "pending": pending,
+            "in_flight": in_flight,
+            "dead": dead,
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "rejected": self.rejected,
+            "recovered": self.recovered,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
@@ -1,10 +1,12 @@
 import os
-import smtplib
+import html
 import logging
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from datetime import datetime
+from src.config import SMTP_POOL_SIZE, SMTP_IDLE_TIMEOUT, SMTP_TIMEOUT
+from src.utils.smtp_pool import SMTPPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,7 +21,9 @@ class EmailSender:
         smtp_port=None, 
         username=None, 
         password=None,
-        use_tls=True
+        use_tls=True,
+        pool_size=None,
+        idle_timeout=None
     ):
         """Initialize email sender with SMTP configuration
         
@@ -29,6 +33,8 @@ class EmailSender:
             username: SMTP username/email (default from env EMAIL_USERNAME)
             password: SMTP password (default from env EMAIL_PASSWORD)
             use_tls: Whether to use TLS encryption (default True)
+            pool_size: Logged-in SMTP sessions kept open (default from env SMTP_POOL_SIZE)
+            idle_timeout: Seconds an idle session is reused (default from env SMTP_IDLE_TIMEOUT)
         """
         self.smtp_server = smtp_server or os.getenv('EMAIL_SMTP_SERVER')
         self.smtp_port = smtp_port or int(os.getenv('EMAIL_SMTP_PORT', 587))
@@ -39,9 +45,21 @@ class EmailSender:
         # Validate required settings
         if not all([self.smtp_server, self.smtp_port, self.username, self.password]):
             logger.warning("Email configuration incomplete. Some settings are missing.")
+        
+        # Sessions are opened on first send and reused, instead of logging in for every email
+        self.pool = SMTPPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.username,
+            self.password,
+            use_tls=use_tls,
+            size=pool_size or SMTP_POOL_SIZE,
+            idle_timeout=idle_timeout if idle_timeout is not None else SMTP_IDLE_TIMEOUT,
+            timeout=SMTP_TIMEOUT
+        )
 
     def send_email(self, to_email, subject, body_text, body_html=None, attachments=None, cc=None, bcc=None):
-        """Send an email
+        """Send an email over a pooled SMTP session (blocking; see send_email_async)
         
         Args:
             to_email: Recipient email or list of emails
@@ -105,33 +123,27 @@ class EmailSender:
                     except Exception as e:
                         logger.error(f"Error attaching file {file_path}: {str(e)}")
             
-            # Connect to SMTP server and send
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                
-                server.login(self.username, self.password)
+            # Get all recipients
+            all_recipients = []
+            if isinstance(to_email, list):
+                all_recipients.extend(to_email)
+            else:
+                all_recipients.append(to_email)
                 
-                # Get all recipients
-                all_recipients = []
-                if isinstance(to_email, list):
-                    all_recipients.extend(to_email)
+            if cc:
+                if isinstance(cc, list):
+                    all_recipients.extend(cc)
                 else:
-                    all_recipients.append(to_email)
+                    all_recipients.append(cc)
                     
-                if cc:
-                    if isinstance(cc, list):
-                        all_recipients.extend(cc)
-                    else:
-                        all_recipients.append(cc)
-                        
-                if bcc:
-                    if isinstance(bcc, list):
-                        all_recipients.extend(bcc)
-                    else:
-                        all_recipients.append(bcc)
-                
-                server.sendmail(self.username, all_recipients, msg.as_string())
+            if bcc:
+                if isinstance(bcc, list):
+                    all_recipients.extend(bcc)
+                else:
+                    all_recipients.append(bcc)
+            
+            # Send on a pooled session, reconnecting if the server dropped it
+            self.pool.send(self.username, all_recipients, msg.as_string())
                 
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -140,6 +152,14 @@ class EmailSender:
             logger.error(f"Error sending email: {str(e)}")
             return False
     
+    async def send_email_async(self, *args, **kwargs):
+        """send_email on the SMTP pool's threads, without blocking the event loop"""
+        return await self.pool.run(self.send_email, *args, **kwargs)
+    
+    def close(self):
+        """Log out of the pooled SMTP sessions"""
+        self.pool.close()
+    
     def send_feedback_notification(self, feedback_data):
         """Send a notification email about received feedback
         
@@ -240,4 +260,128 @@ Rating: {feedback_data.get('rating', 'Not provided')}
             
         except Exception as e:
             logger.error(f"Error sending feedback notification: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+    
+    def send_feedback_digest(self, items):
+        """Send one email summarizing several feedback items, grouped by category and sentiment
+        
+        Args:
+            items: List of feedback dictionaries, each with a `received_at` timestamp
+            
+        Returns:
+            Boolean indicating success or failure
+        """
+        try:
+            feedback_recipient = os.getenv('FEEDBACK_EMAIL_RECIPIENT')
+            if not feedback_recipient:
+                logger.error("FEEDBACK_EMAIL_RECIPIENT not set in environment variables")
+                return False
+            
+            # Group by category, then sentiment; highest priority first within a group
+            groups = {}
+            for item in items:
+                category = item.get('category') or 'Not specified'
+                sentiment = item.get('sentiment') or 'neutral'
+                groups.setdefault(category, {}).setdefault(sentiment, []).append(item)
+            sentiment_order = {'negative': 0, 'neutral': 1, 'positive': 2}
+            
+            def received(item):
+                return datetime.fromtimestamp(item.get('received_at', 0)).strftime("%Y-%m-%d %H:%M")
+            
+            def priority(item):
+                try:
+                    return int(item.get('priority', 1))
+                except (TypeError, ValueError):
+                    return 1
+            
+            times = [item.get('received_at', 0) for item in items]
+            period = f"{datetime.fromtimestamp(min(times)).strftime('%Y-%m-%d %H:%M')} to {datetime.fromtimestamp(max(times)).strftime('%Y-%m-%d %H:%M')}"
+            subject = f"Portfolio Feedback Digest: {len(items)} items in {len(groups)} categories"
+            
+            text_lines = [f"Feedback Digest: {len(items)} items received {period}", ""]
+            html_sections = []
+            for category in sorted(groups):
+                count = sum(len(group) for group in groups[category].values())
+                text_lines.append(f"== {category} ({count}) ==")
+                html_sections.append(f"<h3>{html.escape(category)} ({count})</h3>")
+                for sentiment in sorted(groups[category], key=lambda s: (sentiment_order.get(s, 3), s)):
+                    group = sorted(groups[category][sentiment], key=priority, reverse=True)
+                    text_lines.append(f"  {sentiment} ({len(group)})")
+                    html_sections.append(
+                        f'<p><span class="sentiment-{html.escape(sentiment)}">{html.escape(sentiment)}</span> ({len(group)})</p>'
+                    )
+                    for item in group:
+                        message = item.get('message', 'No message content')
+                        rating = item.get('rating') or 'Not provided'
+                        text_lines.append(f"    - [{received(item)}] priority {priority(item)}/5, rating {rating}")
+                        text_lines.extend(f"      {line}" for line in message.splitlines() or [""])
+                        message_html = "<br>".join(html.escape(line) for line in message.splitlines())
+                        html_sections.append(
+                            f'<div class="message-box">'
+                            f'<p class="meta">{received(item)} &middot; '
+                            f'<span class="priority priority-{priority(item)}">{priority(item)}/5</span> &middot; '
+                            f'rating {html.escape(str(rating))}</p>'
+                            f'{message_html}</div>'
+                        )
+                text_lines.append("")
+            
+            text_body = "\n".join(text_lines)
+            
+            html_body = f"""
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .header {{ background-color: #f8f9fa; padding: 15px; border-bottom: 3px solid #6a82fb; }}
+        .content {{ padding: 20px 0; }}
+        .footer {{ font-size: 12px; color: #777; margin-top: 30px; }}
+        .meta {{ font-size: 12px; color: #777; margin: 0 0 5px; }}
+        .priority {{ display: inline-block; padding: 0 6px; border-radius: 3px; }}
+        .priority-1 {{ background-color: #e9ecef; }}
+        .priority-2 {{ background-color: #e2f0d9; }}
+        .priority-3 {{ background-color: #fff2cc; }}
+        .priority-4 {{ background-color: #fce5cd; }}
+        .priority-5 {{ background-color: #f8cecc; }}
+        .sentiment-positive {{ color: #2e7d32; }}
+        .sentiment-neutral {{ color: #757575; }}
+        .sentiment-negative {{ color: #c62828; }}
+        .message-box {{ background-color: #f1f3f4; padding: 10px 15px; border-left: 3px solid #6a82fb; margin: 10px 0; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h2>Portfolio Feedback Digest</h2>
+            <p>{len(items)} items received {period}</p>
+        </div>
+        <div class="content">
+            {"".join(html_sections)}
+        </div>
+        <div class="footer">
+            <p>High-priority and negative feedback is emailed individually as it arrives.</p>
+            <p>This is an automated digest from your Portfolio AI Assistant</p>
+        </div>
+    </div>
+</body>
+</html>
+            """
+            
+            return self.send_email(
+                to_email=feedback_recipient,
+                subject=subject,
+                body_text=text_body,
+                body_html=html_body
+            )
+            
+        except Exception as e:
+            logger.error(f"Error sending feedback digest: {str(e)}")
+            return False
+    
+    async def send_feedback_notification_async(self, feedback_data):
+        """send_feedback_notification on the SMTP pool's threads, without blocking the event loop"""
+        return await self.pool.run(self.send_feedback_notification, feedback_data)
+    
+    async def send_feedback_digest_async(self, items):
+        """send_feedback_digest on the SMTP pool's threads, without blocking the event loop"""
+        return await self.pool.run(self.send_feedback_digest, items)
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class FileWatcher:
+    """Detects edits to a file (profile.json, spam patterns) without a restart
+
+    The file is stat'ed at most once per `check_interval` seconds. A changed
+    modification time or size triggers a read, and the file only counts as
+    changed when the content hash differs, so touching the file or
+    rewriting identical content costs nothing downstream. `parse` turns the
+    raw bytes into the loaded value (JSON by default).
+    """
+
+    def __init__(self, path, check_interval=2.0, parse=json.loads):
+        self.path = path
+        self.check_interval = check_interval
+        self.parse = parse
+        self._signature = None
+        self._digest = None
+        self._next_check = 0.0
+        self.reloads = 0
+        self.errors = 0
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """Read and parse the file, remembering its signature and hash"""
+        signature = self._stat()
+        with open(self.path, "rb") as file:
+            raw = file.read()
+        data = self.parse(raw)
+        self._signature = signature
+        self._digest = hashlib.sha256(raw).hexdigest()
+        return data
+
+    def poll(self):
+        """Return the parsed file if it changed since the last load, else None"""
+        if not self.path or self.check_interval < 0:
+            return None
+        now = time.monotonic()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.check_interval
+
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        try:
+            with open(self.path, "rb") as file:
+                raw = file.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            self._signature = signature
+            if digest == self._digest:
+                return None
+            data = self.parse(raw)
+        except (OSError, ValueError) as e:
+            # Keep serving the last good version while the file is mid-edit or invalid
+            self.errors += 1
+            logger.warning(f"Ignoring unreadable update at {self.path}: {e}")
+            return None
+
+        self._digest = digest
+        self.reloads += 1
+        logger.info(f"Reloaded {self.path}")
+        return data
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "check_interval": self.check_interval,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "digest": self._digest[:12] if self._digest else None,
+        }
@@ -0,0 +1,27 @@
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Maps a component name to a zero-argument callable returning its stats dict
+_collectors = {}
+
+def register(name, collector):
+    """Register a stats collector to be included in metrics snapshots
+
+    Args:
+        name: Key the component's stats appear under
+        collector: Callable returning a JSON-serializable dict
+    """
+    _collectors[name] = collector
+
+def snapshot():
+    """Collect the current stats from every registered component"""
+    stats = {}
+    for name, collector in _collectors.items():
+        try:
+            stats[name] = collector()
+        except Exception as e:
+            logger.error(f"Error collecting metrics for {name}: {str(e)}")
+            stats[name] = {"error": str(e)}
+    return stats
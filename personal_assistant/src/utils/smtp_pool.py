@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from src.utils.latency import LatencyTracker
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _is_stale(error):
+    """Whether a send failed because the server had dropped the session"""
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException) and error.smtp_code == 421:
+        return True
+    return isinstance(error, ConnectionError)
+
+class SMTPPool:
+    """Small pool of authenticated SMTP sessions, reused across emails
+
+    Opening a session costs a TCP connect, EHLO, STARTTLS (a TLS handshake)
+    and AUTH before the first message. The pool keeps up to `size` logged-in
+    sessions and hands them out one sender at a time. A session idle longer
+    than `idle_timeout` seconds is closed rather than reused, since servers
+    drop idle clients; one the server dropped sooner is noticed on the next
+    send, which is retried once on a fresh session. `send_async` and `run`
+    execute the blocking smtplib calls on the pool's own `size` threads, so
+    the event loop never waits on the mail server.
+    """
+
+    def __init__(self, host, port, username=None, password=None, use_tls=True, size=2, idle_timeout=60.0, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
+        self._closed = False
+        self.latency = LatencyTracker(1000)
+        self.sent = 0
+        self.failed = 0
+        self.opened = 0
+        self.reused = 0
+        self.expired = 0
+        self.reconnects = 0
+
+    def _open(self):
+        session = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                session.starttls()
+            if self.username:
+                session.login(self.username, self.password)
+        except Exception:
+            self._close(session)
+            raise
+        with self._lock:
+            self.opened += 1
+        return session
+
+    @staticmethod
+    def _close(session):
+        try:
+            session.quit()
+        except Exception:
+            session.close()
+
+    def _checkout(self):
+        """Return (session, reused), preferring the most recently used idle session"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [session for session, last_used in self._idle if now - last_used > self.idle_timeout]
+            self._idle = [(session, last_used) for session, last_used in self._idle if now - last_used <= self.idle_timeout]
+            self.expired += len(expired)
+            reused = self._idle.pop()[0] if self._idle else None
+            if reused is not None:
+                self.reused += 1
+        for session in expired:
+            self._close(session)
+        if reused is not None:
+            return reused, True
+        return self._open(), False
+
+    def _checkin(self, session):
+        with self._lock:
+            if not self._closed:
+                self._idle.append((session, time.monotonic()))
+                return
+        self._close(session)
+
+    def send(self, from_addr, recipients, message):
+        """Send one message on a pooled session; blocks, and raises if it could not be sent"""
+        start = time.perf_counter()
+        with self._slots:
+            session = None
+            try:
+                session, reused = self._checkout()
+                try:
+                    session.sendmail(from_addr, recipients, message)
+                except Exception as e:
+                    if not (reused and _is_stale(e)):
+                        raise
+                    # The server dropped the idle session; retry once on a fresh one
+                    logger.info(f"SMTP session to {self.host} was closed by the server ({e}), reconnecting")
+                    self._close(session)
+                    with self._lock:
+                        self.reconnects += 1
+                    session = self._open()
+                    session.sendmail(from_addr, recipients, message)
+            except Exception:
+                if session is not None:
+                    self._close(session)
+                with self._lock:
+                    self.failed += 1
+                raise
+            self._checkin(session)
+        with self._lock:
+            self.sent += 1
+            self.latency.record(time.perf_counter() - start)
+
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking call (usually one that ends in `send`) on the pool's threads"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    async def send_async(self, from_addr, recipients, message):
+        """`send` without blocking the event loop"""
+        await self.run(self.send, from_addr, recipients, message)
+
+    def close(self):
+        """Log out of every idle session; sessions in use are closed when their send finishes"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session, _ in idle:
+            self._close(session)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """Return session reuse counters and per-email send latency"""
+        with self._lock:
+            p50 = self.latency.percentile(0.5)
+            p95 = self.latency.percentile(0.95)
+            return {
+                "size": self.size,
+                "idle_sessions": len(self._idle),
+                "sent": self.sent,
+                "failed": self.failed,
+                "sessions_opened": self.opened,
+                "sessions_reused": self.reused,
+                "idle_expired": self.expired,
+                "reconnects": self.reconnects,
+                "send_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "send_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
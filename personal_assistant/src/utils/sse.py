@@ -0,0 +1,35 @@
+import json
+
+def format_sse(data, event=None):
+    """Format a payload as a Server-Sent Events message
+
+    Args:
+        data: JSON-serializable payload
+        event: Optional event name (clients default to "message")
+
+    Returns:
+        The encoded SSE message string
+    """
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    message += f"data: {json.dumps(data)}\n\n"
+    return message
+
+async def stream_chat_events(token_stream, agent):
+    """Wrap an async token stream as chat SSE events
+
+    Emits one "token" event per chunk, an "error" event if the stream fails,
+    and always finishes with a "done" event carrying the agent type.
+
+    Args:
+        token_stream: Async iterator of response text chunks
+        agent: AgentType value that produced the response
+    """
+    agent_value = getattr(agent, "value", agent)
+    try:
+        async for token in token_stream:
+            yield format_sse({"content": token}, event="token")
+    except Exception as e:
+        yield format_sse({"content": f"Sorry, I encountered an error: {str(e)}"}, event="error")
+    yield format_sse({"agent": agent_value}, event="done")
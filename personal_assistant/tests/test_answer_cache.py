@@ -0,0 +1,34 @@
+from src.agents.knowledge.cache import AnswerCache, normalize_query, profile_fingerprint
+
+def test_trivial_variations_share_an_entry():
+    cache = AnswerCache()
+    cache.set("What is his email?", "v1", "ada@example.com")
+    assert normalize_query("  what IS his email ") == "what is his email"
+    assert cache.get("what is his EMAIL", "v1") == "ada@example.com"
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AnswerCache(max_size=2)
+    cache.set("one", "v1", "1")
+    cache.set("two", "v1", "2")
+    assert cache.get("one", "v1") == "1"
+    cache.set("three", "v1", "3")
+    assert cache.get("two", "v1") is None
+    assert cache.get("one", "v1") == "1"
+    assert cache.stats()["evictions"] == 1
+
+def test_entries_expire():
+    cache = AnswerCache(ttl_seconds=0)
+    cache.set("one", "v1", "1")
+    assert cache.get("one", "v1") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_a_new_profile_drops_every_answer():
+    cache = AnswerCache()
+    cache.set("one", "v1", "1")
+    assert cache.get("one", "v2") is None
+    assert cache.get("one", "v1") is None
+    assert cache.stats()["size"] == 0
+
+def test_profile_fingerprint_ignores_key_order():
+    assert profile_fingerprint({"a": 1, "b": [1, 2]}) == profile_fingerprint({"b": [1, 2], "a": 1})
+    assert profile_fingerprint({"a": 1}) != profile_fingerprint({"a": 2})
@@ -0,0 +1,29 @@
+from src.agents.knowledge.cv_index import _is_heading, chunk_text
+
+CV = """Jane Doe
+Experience
+Acme Ltd
+Engineer 2020 - 2023
+• Built the billing pipeline.
+Globex Corp
+Analyst 2018 - 2020
+• Automated reporting.
+EDUCATION
+Example University
+BSc Computer Science 2015 - 2018
+"""
+
+def test_employers_and_names_are_not_headings():
+    assert _is_heading("Experience")
+    assert _is_heading("Skills & Interests")
+    assert _is_heading("WORK HISTORY")
+    assert not _is_heading("Acme Ltd")
+    assert not _is_heading("Jane Doe")
+    assert not _is_heading("Senior Engineer")
+
+def test_chunks_are_led_by_their_section_heading():
+    chunks = chunk_text(CV)
+    assert chunks[0] == "Jane Doe"
+    assert chunks[1].splitlines()[0] == "Experience"
+    assert "Acme Ltd" in chunks[1] and "Globex Corp" in chunks[1]
+    assert chunks[2].splitlines()[:2] == ["EDUCATION", "Example University"]
@@ -0,0 +1,26 @@
+from src.agents.knowledge.degraded import DegradedResponder, build_answers, display_names
+
+def test_blank_or_missing_name_falls_back():
+    for profile in ({}, {"name": ""}, {"name": "   "}, {"name": None}):
+        assert display_names(profile) == ("Mohammed Noushir", "Mohammed")
+    assert display_names({"name": " Ada Lovelace "}) == ("Ada Lovelace", "Ada")
+
+def test_partial_entries_are_skipped():
+    profile = {
+        "name": "",
+        "skills": [{"name": "PyTorch", "level": "Advanced"}, {"level": "Expert"}, "Python", {"name": "Teamwork", "level": "Soft Skill"}],
+        "education": [{"title": "MSc AI", "institution": "QMUL", "year": 2023}, "BSc"],
+        "roles": ["ML Engineer", None],
+        "contact": None,
+        "bio": None,
+    }
+    answers = build_answers(profile)
+    assert answers["skills"] == "Mohammed's technical skills include PyTorch. Soft skills: Teamwork."
+    assert answers["education"] == "Mohammed studied: MSc AI at QMUL (2023)."
+    assert answers["roles"] == "Mohammed's roles include ML Engineer."
+    assert "contact" not in answers
+    assert answers["fallback"].startswith("Mohammed Noushir is")
+
+def test_responder_answers_from_an_empty_profile():
+    responder = DegradedResponder(None)
+    assert responder.answer("What are his skills?").startswith("Mohammed Noushir is")
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from src.utils.durable_queue import DurableQueue, QueueFullError
+
+async def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+class Handler:
+    """Fails the first `failures` calls for each payload, then succeeds"""
+
+    def __init__(self, failures=0, error=None):
+        self.failures = failures
+        self.error = error
+        self.calls = []
+        self.delivered = []
+
+    async def __call__(self, payload):
+        self.calls.append(payload)
+        if self.calls.count(payload) <= self.failures:
+            if self.error:
+                raise self.error
+            return False
+        self.delivered.append(payload)
+        return True
+
+def test_jobs_are_delivered_and_removed(tmp_path):
+    handler = Handler()
+
+    async def main():
+        queue = DurableQueue(str(tmp_path / "queue.db"), handler)
+        for i in range(5):
+            await queue.put({"id": i})
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(main())
+    assert sorted(item["id"] for item in handler.delivered) == list(range(5))
+    assert stats["delivered"] == 5 and stats["pending"] == 0
+
+def test_failed_jobs_are_retried(tmp_path):
+    handler = Handler(failures=2)
+
+    async def main():
+        queue = DurableQueue(str(tmp_path / "queue.db"), handler, base_delay=0.01, max_delay=0.01)
+        await queue.put({"id": 1})
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(main())
+    assert handler.delivered == [{"id": 1}]
+    assert stats["retried"] == 2 and stats["dead"] == 0
+
+def test_jobs_that_keep_failing_are_dead_lettered(tmp_path):
+    handler = Handler(failures=10, error=RuntimeError("smtp down"))
+
+    async def main():
+        queue = DurableQueue(str(tmp_path / "queue.db"), handler, max_attempts=3, base_delay=0.01, max_delay=0.01)
+        await queue.put({"id": 1})
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(main())
+    assert len(handler.calls) == 3 and not handler.delivered
+    assert queue.stats()["dead"] == 1 and queue.dead_lettered == 1
+    assert queue._execute("SELECT attempts, last_error FROM jobs WHERE dead = 1") == [(3, "smtp down")]
+
+def test_leased_jobs_run_again_after_a_restart(tmp_path):
+    path = str(tmp_path / "queue.db")
+    crashed = DurableQueue(path, Handler())
+    crashed._insert('{"id": 1}')
+    # A worker claimed the job and then the process died
+    assert crashed._claim()[1] == '{"id": 1}'
+    crashed._db.close()
+
+    handler = Handler()
+
+    async def main():
+        queue = DurableQueue(path, handler, lease_seconds=3600)
+        queue.start()
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(main())
+    assert queue.recovered == 1
+    assert handler.delivered == [{"id": 1}]
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    queue = DurableQueue(str(tmp_path / "queue.db"), Handler(), lease_seconds=0.05)
+    queue._insert('{"id": 1}')
+    job_id = queue._claim()[0]
+    assert not isinstance(queue._claim(), tuple)
+    time.sleep(0.06)
+    assert queue._claim()[:3] == (job_id, '{"id": 1}', 2)
+
+def test_put_pushes_back_when_full(tmp_path):
+    async def main():
+        blocked = asyncio.Event()
+
+        async def handler(payload):
+            await blocked.wait()
+            return True
+
+        queue = DurableQueue(str(tmp_path / "queue.db"), handler, workers=1, max_size=1, put_timeout=0.05)
+        await queue.put({"id": 1})
+        with pytest.raises(QueueFullError):
+            await queue.put({"id": 2})
+        blocked.set()
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.put({"id": 3})
+        await wait_until(lambda: queue.depth() == 0)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(main())
+    assert stats["rejected"] == 1 and stats["delivered"] == 2
@@ -0,0 +1,21 @@
+from src.agents.knowledge.fast_path import FastPathResponder
+
+PROFILE = {
+    "name": "Ada Lovelace",
+    "contact": {"email": "ada@example.com"},
+    "skills": [{"name": "PyTorch", "level": "Advanced"}, {"name": "Docker"}],
+}
+
+def test_structured_questions_are_answered():
+    responder = FastPathResponder(PROFILE)
+    assert responder.match("What's his email?") == ("contact", "Ada's email address is ada@example.com.")
+    assert responder.match("Does he know PyTorch?") == ("skills", "Yes, PyTorch (Advanced) is one of Ada's skills.")
+
+def test_specific_questions_fall_through():
+    responder = FastPathResponder(PROFILE)
+    assert responder.match("Why did he choose PyTorch over JAX for his thesis?") is None
+
+def test_blank_name_and_partial_entries_do_not_raise():
+    responder = FastPathResponder({"name": " ", "contact": None, "skills": [{"level": "Expert"}, "Python"]})
+    assert responder.first_name == "Mohammed"
+    assert responder.match("What's his email?") is None
@@ -0,0 +1,40 @@
+import asyncio
+import json
+from src.agents.feedback.batcher import FeedbackBatcher
+
+class StubLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_response(self, messages, system_prompt=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        items = json.loads(messages[0]["content"])
+        return json.dumps([
+            {"id": item["id"], "sentiment": "positive", "priority": 2, "category": item["message"]}
+            for item in items
+        ])
+
+def test_concurrent_feedback_shares_one_call():
+    llm = StubLLM()
+    batcher = FeedbackBatcher(llm, window_seconds=0.05, max_items=16)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.classify(f"item {i}") for i in range(5)))
+        return results, len(batcher._batches)
+
+    results, running = asyncio.run(run())
+    assert llm.calls == 1
+    assert [r["category"] for r in results] == [f"item {i}" for i in range(5)]
+    # Finished batches are no longer referenced
+    assert running == 0
+
+def test_full_batch_flushes_without_waiting_for_the_window():
+    llm = StubLLM()
+    batcher = FeedbackBatcher(llm, window_seconds=60, max_items=3)
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.classify(f"m{i}") for i in range(3))), 1)
+
+    assert len(asyncio.run(run())) == 3
+    assert llm.calls == 1
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from src.agents.feedback.digest import FeedbackDigest, is_urgent
+
+async def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+class Outbox:
+    """Collects digest payloads; the first `failures` enqueues raise"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.digests = []
+
+    async def __call__(self, payload):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("queue full")
+        self.digests.append([item["message"] for item in payload["digest"]])
+
+def test_urgent_feedback_is_never_digested():
+    assert is_urgent({"sentiment": "Negative", "priority": 1})
+    assert is_urgent({"sentiment": "positive", "priority": "5"})
+    assert is_urgent({"sentiment": "positive", "priority": "high"})
+    assert not is_urgent({"sentiment": "neutral", "priority": 3})
+
+def test_full_digest_is_sent_at_once(tmp_path):
+    outbox = Outbox()
+
+    async def main():
+        digest = FeedbackDigest(str(tmp_path / "queue.db"), outbox, interval=3600, max_items=3)
+        for i in range(7):
+            await digest.add({"message": f"m{i}"})
+        await wait_until(lambda: len(outbox.digests) == 2)
+        await digest.stop()
+        return digest.stats()
+
+    stats = asyncio.run(main())
+    assert outbox.digests == [["m0", "m1", "m2"], ["m3", "m4", "m5"]]
+    assert stats["waiting"] == 1 and stats["emails_saved"] == 4
+
+def test_partial_digest_is_sent_after_the_interval(tmp_path):
+    outbox = Outbox()
+
+    async def main():
+        digest = FeedbackDigest(str(tmp_path / "queue.db"), outbox, interval=0.1, max_items=20)
+        await digest.add({"message": "m0"})
+        await digest.add({"message": "m1"})
+        assert outbox.digests == []
+        await wait_until(lambda: outbox.digests)
+        await digest.stop()
+
+    asyncio.run(main())
+    assert outbox.digests == [["m0", "m1"]]
+
+def test_items_are_kept_until_the_digest_is_queued(tmp_path):
+    outbox = Outbox(failures=1)
+
+    async def main():
+        digest = FeedbackDigest(str(tmp_path / "queue.db"), outbox, interval=0, max_items=20, retry_delay=0.05)
+        await digest.add({"message": "m0"})
+        await wait_until(lambda: outbox.digests)
+        await digest.stop()
+        return digest.stats()
+
+    stats = asyncio.run(main())
+    assert outbox.digests == [["m0"]]
+    assert stats["errors"] == 1 and stats["waiting"] == 0
+
+def test_waiting_items_survive_a_restart(tmp_path):
+    path = str(tmp_path / "queue.db")
+    outbox = Outbox()
+
+    async def first_run():
+        digest = FeedbackDigest(path, outbox, interval=3600, max_items=20)
+        await digest.add({"message": "m0"})
+        await digest.stop()
+
+    async def second_run():
+        digest = FeedbackDigest(path, outbox, interval=3600, max_items=20)
+        assert await digest.flush() == 1
+
+    asyncio.run(first_run())
+    asyncio.run(second_run())
+    assert outbox.digests == [["m0"]]
@@ -0,0 +1,55 @@
+import json
+import os
+
+from src.agents.knowledge.cache import AnswerCache, profile_fingerprint
+from src.utils.file_watcher import FileWatcher
+
+def _write(path, profile, mtime_ns):
+    path.write_text(json.dumps(profile))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_only_changed_content_reloads(tmp_path):
+    path = tmp_path / "profile.json"
+    _write(path, {"name": "Ada"}, 1_000_000_000)
+    watcher = FileWatcher(str(path), check_interval=0)
+    assert watcher.load() == {"name": "Ada"}
+    assert watcher.poll() is None
+
+    # Touched but identical: read once, not reported as a change
+    _write(path, {"name": "Ada"}, 2_000_000_000)
+    assert watcher.poll() is None
+
+    _write(path, {"name": "Grace"}, 3_000_000_000)
+    assert watcher.poll() == {"name": "Grace"}
+    assert watcher.stats()["reloads"] == 1
+
+def test_invalid_edit_keeps_the_last_profile(tmp_path):
+    path = tmp_path / "profile.json"
+    _write(path, {"name": "Ada"}, 1_000_000_000)
+    watcher = FileWatcher(str(path), check_interval=0)
+    watcher.load()
+    path.write_text('{"name": ')
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert watcher.poll() is None
+    assert watcher.stats()["errors"] == 1
+
+def test_check_interval_limits_stat_calls(tmp_path):
+    path = tmp_path / "profile.json"
+    _write(path, {"name": "Ada"}, 1_000_000_000)
+    watcher = FileWatcher(str(path), check_interval=3600)
+    watcher.load()
+    watcher.poll()
+    _write(path, {"name": "Grace"}, 2_000_000_000)
+    assert watcher.poll() is None
+
+def test_reloaded_profile_invalidates_cached_answers(tmp_path):
+    path = tmp_path / "profile.json"
+    _write(path, {"name": "Ada"}, 1_000_000_000)
+    watcher = FileWatcher(str(path), check_interval=0)
+    cache = AnswerCache()
+    profile_hash = profile_fingerprint(watcher.load())
+    cache.set("Who is he?", profile_hash, "Ada")
+
+    _write(path, {"name": "Grace"}, 2_000_000_000)
+    profile_hash = profile_fingerprint(watcher.poll())
+    assert cache.get("Who is he?", profile_hash) is None
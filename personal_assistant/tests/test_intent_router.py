@@ -0,0 +1,47 @@
+import asyncio
+
+from src.agents.intent import CALENDAR, KNOWLEDGE, IntentRouter
+from src.agents.knowledge.cache import AnswerCache
+from src.agents.knowledge.semantic_cache import SemanticCache
+
+UNSURE = "Is his code available on GitHub?"
+
+class FakeLLM:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    async def __call__(self, text):
+        self.calls += 1
+        return self.answer
+
+def test_cached_knowledge_questions_skip_the_llm():
+    llm = FakeLLM("calendar")
+    router = IntentRouter(threshold=0.7, classify_with_llm=llm)
+    assert router.classify(UNSURE)[1] < 0.7
+    assert asyncio.run(router.route(UNSURE, lambda text: True)) == KNOWLEDGE
+    assert llm.calls == 0
+    assert router.stats()["sources"] == {"knowledge_cache": 1}
+
+def test_uncached_unsure_messages_ask_the_llm():
+    llm = FakeLLM("calendar")
+    router = IntentRouter(threshold=0.7, classify_with_llm=llm)
+    assert asyncio.run(router.route(UNSURE, lambda text: False)) == CALENDAR
+    assert llm.calls == 1
+
+def test_confident_messages_need_no_lookup():
+    looked_up = []
+    router = IntentRouter(threshold=0.7, classify_with_llm=FakeLLM("knowledge"))
+    intent = asyncio.run(router.route("Can I book a meeting with him on Tuesday?", looked_up.append))
+    assert intent == CALENDAR and looked_up == []
+
+def test_cache_lookups_for_routing_are_not_counted():
+    exact, semantic = AnswerCache(), SemanticCache(max_size=4)
+    for cache in (exact, semantic):
+        cache.set("What programming languages does he know?", "v1", "Python")
+    assert exact.contains("what programming languages does he know", "v1")
+    assert semantic.contains("Which programming languages does Mohammed know?", "v1")
+    assert not semantic.contains("Where did he study?", "v1")
+    assert not exact.contains("What programming languages does he know?", "v2")
+    assert exact.stats()["hits"] + exact.stats()["misses"] == 0
+    assert semantic.stats()["hits"] + semantic.stats()["misses"] == 0
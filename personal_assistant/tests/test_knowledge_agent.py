@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+from src.agents.knowledge.agent import KnowledgeAgent
+from src.utils.file_watcher import FileWatcher
+
+QUESTION = "Why did he pick PyTorch over JAX?"
+
+@pytest.fixture
+def agent(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"name": "Ada Lovelace"}))
+    agent = KnowledgeAgent()
+    agent.pregenerator.schedule = lambda: None
+    agent.profile_watcher = FileWatcher(str(path), check_interval=0)
+    agent._apply_profile(agent.profile_watcher.load())
+    agent.edit_profile = lambda: path.write_text(json.dumps({"name": "Grace Hopper", "bio": "Compilers"}))
+    return agent
+
+def slow_llm(agent, reload):
+    """Fake LLM call during which another request may pick up a profile edit"""
+    async def generate(messages, system_prompt=None, **kwargs):
+        await asyncio.sleep(0.01)
+        if reload:
+            agent.edit_profile()
+            agent._refresh_profile()
+        return "Answer from the old profile"
+    return generate
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_answer_is_cached_only_for_the_profile_it_came_from(agent, reload):
+    agent.generate_llm_response = slow_llm(agent, reload)
+    assert asyncio.run(agent.process(QUESTION)) == "Answer from the old profile"
+    cached = agent._cached_answer(QUESTION)
+    assert cached == (None if reload else "Answer from the old profile")
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_streamed_answer_is_cached_only_for_the_profile_it_came_from(agent, reload):
+    generate = slow_llm(agent, reload)
+
+    async def stream(messages, system_prompt=None):
+        yield await generate(messages, system_prompt)
+
+    async def read():
+        return "".join([token async for token in agent.process_stream(QUESTION)])
+
+    agent.stream_llm_response = stream
+    assert asyncio.run(read()) == "Answer from the old profile"
+    cached = agent._cached_answer(QUESTION)
+    assert cached == (None if reload else "Answer from the old profile")
+
+def test_cached_questions_are_answerable_locally(agent):
+    agent.generate_llm_response = slow_llm(agent, reload=False)
+    assert not agent.can_answer_locally(QUESTION)
+    asyncio.run(agent.process(QUESTION))
+    assert agent.can_answer_locally(QUESTION)
+    assert agent.answer_cache.stats()["hits"] == 0
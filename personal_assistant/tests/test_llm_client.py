@@ -0,0 +1,143 @@
+import asyncio
+from types import SimpleNamespace
+import httpx
+import pytest
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.client import GroqClient, LLMError
+
+class UpstreamError(Exception):
+    """Provider HTTP error, shaped like the SDK's"""
+
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = None
+
+class StubCompletions:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    async def create(self, messages, model, **kwargs):
+        self.calls += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status != 200:
+            raise UpstreamError(status)
+        message = SimpleNamespace(content="ok")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+def make_client(statuses):
+    client = GroqClient(providers=[{"name": "stub", "kind": "openai", "base_url": "http://stub.invalid/v1"}])
+    client.coalesce_requests = False
+    client.resilience.max_retries = 0
+    completions = StubCompletions(statuses)
+    client.providers.primary.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client, completions
+
+async def call_many(client, count):
+    errors = []
+    for _ in range(count):
+        try:
+            await client.generate_response([{"role": "user", "content": "hi"}])
+        except LLMError as e:
+            errors.append(e)
+    return errors
+
+@pytest.mark.parametrize("status", [400, 401, 404, 413, 422])
+def test_rejected_requests_do_not_trip_breakers(status):
+    client, completions = make_client([status] * 10)
+    errors = asyncio.run(call_many(client, 10))
+
+    assert completions.calls == 10
+    assert [e.upstream_status for e in errors] == [status] * 10
+    assert not any(e.provider_failure for e in errors)
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert client.breaker.consecutive_failures == 0
+    provider = client.providers.primary
+    assert provider.breaker.state == CircuitBreaker.CLOSED
+    assert provider.breaker.consecutive_failures == 0
+    # The breakers are not left waiting on a probe either
+    assert client.providers.choose() is provider
+
+@pytest.mark.parametrize("status", [408, 409, 429, 500, 503])
+def test_provider_failures_trip_the_provider_breaker(status):
+    client, completions = make_client([status] * 10)
+    errors = asyncio.run(call_many(client, 3))
+
+    assert all(e.provider_failure for e in errors)
+    assert client.providers.primary.breaker.state == CircuitBreaker.OPEN
+    assert client.breaker.consecutive_failures == 3
+
+def test_global_circuit_opens_on_provider_failures_only():
+    client, completions = make_client([400, 503, 400, 503, 503, 503, 503])
+    # Keep the single provider in rotation so every failure reaches the global breaker
+    client.providers.primary.breaker.failure_threshold = 100
+    asyncio.run(call_many(client, 4))
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(call_many(client, 3))
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+def granted(client):
+    return sum(counts["granted"] for counts in client.scheduler.stats()["classes"].values())
+
+def test_retries_are_charged_to_the_rate_limits():
+    client, completions = make_client([503, 503, 200])
+    client.resilience.max_retries = 2
+    client.resilience.base_delay = 0.001
+    client.providers.primary.breaker.failure_threshold = 100
+
+    assert asyncio.run(client.generate_response([{"role": "user", "content": "hi"}])) == "ok"
+    assert completions.calls == 3
+    assert granted(client) == 3
+
+def test_one_attempt_takes_one_slot():
+    client, completions = make_client([200, 200])
+    asyncio.run(call_many(client, 2))
+    assert granted(client) == 2
+
+class StubStream:
+    """Streaming completions: `chunks` deltas `delay` seconds apart, then optionally an error"""
+
+    def __init__(self, chunks, delay=0.0, error=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.error = error
+
+    async def create(self, messages, model, stream=False, **kwargs):
+        return self._chunks()
+
+    async def _chunks(self):
+        for text in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+        if self.error is not None:
+            raise self.error
+
+def make_streaming_client(stream):
+    client, _ = make_client([])
+    client.providers.primary.client = SimpleNamespace(chat=SimpleNamespace(completions=stream))
+    return client
+
+async def read_stream(client):
+    return [part async for part in client.stream_response([{"role": "user", "content": "hi"}])]
+
+def test_stream_latency_covers_the_whole_stream():
+    client = make_streaming_client(StubStream(["a", "b", "c"], delay=0.03))
+    assert asyncio.run(read_stream(client)) == ["a", "b", "c"]
+
+    provider = client.providers.primary
+    assert provider.requests == 1
+    assert provider.latency.percentile(0.5) >= 0.09
+    assert provider.stats()["in_flight"] == 0
+
+def test_mid_stream_failure_counts_against_the_provider():
+    client = make_streaming_client(StubStream(["a"], error=httpx.ReadError("connection reset")))
+    with pytest.raises(LLMError):
+        asyncio.run(read_stream(client))
+
+    provider = client.providers.primary
+    assert provider.errors == 1
+    assert provider.breaker.consecutive_failures == 1
+    assert client.breaker.consecutive_failures == 1
+    assert provider.stats()["in_flight"] == 0
@@ -0,0 +1,45 @@
+import asyncio
+from src.llm.scheduler import BACKGROUND, INTERACTIVE, LLMScheduler, TokenBucket, parse_reset
+
+def test_parse_reset():
+    assert parse_reset("7.66s") == 7.66
+    assert parse_reset("2m59.5s") == 179.5
+    assert parse_reset("120ms") == 0.12
+    assert parse_reset("3") == 3.0
+    assert parse_reset("soon") is None
+    assert parse_reset(None) is None
+
+def test_bucket_refills_and_settles():
+    bucket = TokenBucket(60)
+    bucket.take(60, now=bucket._updated)
+    assert bucket.wait_time(1, now=bucket._updated) == 1.0
+    # Reserved 10, used 4
+    bucket.refund(6)
+    assert bucket.wait_time(6, now=bucket._updated) == 0.0
+
+def test_interactive_calls_jump_queued_background_calls():
+    async def run():
+        scheduler = LLMScheduler(requests_per_minute=600, background_headroom=0)
+        # Empty the request bucket: the next slot frees up in 0.1s
+        scheduler.requests.take(600, scheduler.requests._updated)
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        background = [asyncio.create_task(call(f"background {i}", BACKGROUND)) for i in range(2)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("interactive", INTERACTIVE))
+        await asyncio.gather(interactive, *background)
+        return order, scheduler.stats()
+
+    order, stats = asyncio.run(run())
+    assert order[0] == "interactive"
+    assert stats["classes"][BACKGROUND]["granted"] == 2
+    assert stats["classes"][INTERACTIVE]["granted"] == 1
+
+def test_retry_after_pauses_every_class():
+    scheduler = LLMScheduler()
+    scheduler.observe_headers({"retry-after": "2"})
+    assert scheduler._wait_time(INTERACTIVE, 0, scheduler.requests._updated) > 1.5
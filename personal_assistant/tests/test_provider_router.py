@@ -0,0 +1,28 @@
+from src.llm.providers import Provider, ProviderRouter
+
+def make_router(explore_ratio=0.0):
+    primary, backup = Provider("primary", failure_threshold=2), Provider("backup", failure_threshold=2)
+    for provider, latency in ((primary, 0.2), (backup, 0.4)):
+        provider.client = object()
+        provider.ewma_latency = latency
+    return ProviderRouter([primary, backup], explore_ratio=explore_ratio, seed=1), primary, backup
+
+def test_fastest_healthy_provider_is_not_a_reroute():
+    router, primary, backup = make_router()
+    router.record_failure(backup)
+    router.record_failure(backup)
+    assert [router.choose() for _ in range(5)] == [primary] * 5
+    assert router.rerouted == 0
+
+def test_failing_primary_is_routed_around():
+    router, primary, backup = make_router()
+    router.record_failure(primary)
+    assert router.choose() is backup
+    router.record_failure(primary)
+    assert router.choose() is backup
+    assert router.rerouted == 2
+
+def test_exploration_is_not_a_reroute():
+    router, primary, backup = make_router(explore_ratio=1.0)
+    assert router.choose() is backup
+    assert router.rerouted == 0
@@ -0,0 +1,45 @@
+from src.agents.knowledge.semantic_cache import SemanticCache
+
+QUESTION = "What programming languages does he know?"
+
+def test_paraphrases_reuse_an_answer():
+    cache = SemanticCache(max_size=4)
+    cache.set(QUESTION, "v1", "Python")
+    assert cache.get("Which programming languages does Mohammed know?", "v1") == "Python"
+    assert cache.get("Where did he study?", "v1") is None
+
+def test_a_new_profile_drops_every_answer():
+    cache = SemanticCache(max_size=4)
+    cache.set(QUESTION, "v1", "Python")
+    assert cache.get(QUESTION, "v2") is None
+    assert cache.get(QUESTION, "v1") is None
+    assert cache.stats()["size"] == 0
+
+def test_expired_rows_never_match():
+    cache = SemanticCache(max_size=4, ttl_seconds=0)
+    cache.set(QUESTION, "v1", "Python")
+    assert cache.get(QUESTION, "v1") is None
+
+def test_least_recently_used_row_is_overwritten():
+    cache = SemanticCache(max_size=2)
+    cache.set(QUESTION, "v1", "Python")
+    cache.set("Where did he study?", "v1", "Queen Mary")
+    assert cache.get(QUESTION, "v1") == "Python"
+    cache.set("What is his email address?", "v1", "ada@example.com")
+    assert cache.get("Where did he study?", "v1") is None
+    assert cache.get(QUESTION, "v1") == "Python"
+    assert cache.stats()["evictions"] == 1
+
+def test_different_kinds_of_question_never_match():
+    pairs = [
+        ("Where did he study?", "When did he study?"),
+        ("Where did he study?", "What did he study?"),
+        ("When did he study?", "What did he study?"),
+        ("Where does he work?", "Who does he work with?"),
+        ("What is his email?", "Can you email him for me?"),
+    ]
+    for cached, asked in pairs:
+        cache = SemanticCache(max_size=4)
+        cache.set(cached, "v1", "answer")
+        assert cache.get(asked, "v1") is None, (cached, asked)
+        assert cache.get(cached, "v1") == "answer"
@@ -0,0 +1,31 @@
+from src.agents.feedback.spam_filter import SpamFilter, parse_patterns
+
+def test_weights_follow_the_last_colon():
+    assert parse_patterns(b"# comment\n\nspam\nclick here: 0.5\n") == [("spam", 1.0), ("click here", 0.5)]
+
+def test_colons_inside_a_phrase_are_kept():
+    raw = b"http://bit.ly\nre: winner\nre: winner: 0.4\nratio 3:1\nscore: nan\n"
+    assert parse_patterns(raw) == [
+        ("http://bit.ly", 1.0),
+        ("re: winner", 1.0),
+        ("re: winner", 0.4),
+        ("ratio 3", 1.0),
+        ("score: nan", 1.0),
+    ]
+
+def test_scores_whole_words_and_prefixes(tmp_path):
+    path = tmp_path / "spam_patterns.txt"
+    path.write_bytes(b"hack\ncasino*\nclick here: 0.5\nhttp://bit.ly: 0.5\n")
+    spam_filter = SpamFilter(str(path), threshold=1.0, check_interval=-1)
+    assert not spam_filter.is_spam("Great hackathon project")
+    assert spam_filter.is_spam("Best casinos online")
+    assert spam_filter.score("click here") == (0.5, {"click here": 0.5})
+    assert spam_filter.is_spam("Click here: http://bit.ly/abc")
+
+def test_unreadable_edit_keeps_the_last_patterns(tmp_path):
+    path = tmp_path / "spam_patterns.txt"
+    path.write_bytes(b"lottery\n")
+    spam_filter = SpamFilter(str(path), check_interval=0)
+    path.write_bytes(b"\xff\xfe not utf-8\n")
+    assert spam_filter.is_spam("You won the lottery")
+    assert spam_filter.stats()["reload_errors"] == 1